@@ -6,17 +6,18 @@ Ishlatish:
     python app.py --video input.mp4          # Video faylni qayta ishlash
     python app.py --camera                   # Real-time kamera
     python app.py --video input.mp4 --save   # Natija videoni saqlash
+    python app.py --video input.mp4 --cache --no-display  # Detection keshi bilan qayta tahlil
+    python app.py --videos clips/ --workers 8  # Ko'p videoni parallel qayta ishlash
+    python app.py --sources 0 rtsp://cam2/stream  # Bir nechta oqim, bitta model
 """
 
 import argparse
 import sys
 from pathlib import Path
-import cv2
 
-# O'z modullarimiz
+# O'z modullarimiz (og'ir kutubxonalar - torch, ultralytics, cv2 - faqat
+# kerakli rejimda import qilinadi, shuning uchun --help bir zumda ishlaydi)
 import config
-from counter import ObjectCounter
-from utils import save_statistics_to_csv
 
 
 def parse_arguments():
@@ -35,6 +36,16 @@ def parse_arguments():
         type=str,
         help='Video fayl yo\'li'
     )
+    source_group.add_argument(
+        '--videos',
+        type=str,
+        help='Videolar papkasi yoki glob pattern (batch rejimi)'
+    )
+    source_group.add_argument(
+        '--sources',
+        nargs='+',
+        help='Bir nechta manba: kamera ID, RTSP URL, video fayl yoki "synthetic"'
+    )
     source_group.add_argument(
         '--camera', '-c',
         action='store_true',
@@ -52,10 +63,22 @@ def parse_arguments():
         action='store_true',
         help='Natija videoni saqlash'
     )
+    parser.add_argument(
+        '--writer',
+        choices=['opencv', 'ffmpeg'],
+        default=config.VIDEO_WRITER_BACKEND,
+        help=f'Natija videosi kodlovchisi (default: {config.VIDEO_WRITER_BACKEND})'
+    )
+    parser.add_argument(
+        '--crf',
+        type=int,
+        default=config.VIDEO_CRF,
+        help=f'ffmpeg sifati, CRF (default: {config.VIDEO_CRF})'
+    )
     parser.add_argument(
         '--no-display',
         action='store_true',
-        help='Ekranda ko\'rsatmaslik (faqat saqlash)'
+        help='Ekranda ko\'rsatmaslik (--save siz: headless, faqat sanash)'
     )
     parser.add_argument(
         '--model', '-m',
@@ -63,6 +86,18 @@ def parse_arguments():
         default=config.YOLO_MODEL,
         help=f'YOLO model fayli (default: {config.YOLO_MODEL})'
     )
+    parser.add_argument(
+        '--backend',
+        choices=['torch', 'onnx', 'onnx-int8'],
+        default=config.INFERENCE_BACKEND,
+        help=f'Inference backend (onnx: bir marta eksport qilinib models/ da saqlanadi, '
+             f'default: {config.INFERENCE_BACKEND})'
+    )
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Modelni yuklab olmaslik: faqat models/ papkasidagi fayllar'
+    )
     parser.add_argument(
         '--camera-id',
         type=int,
@@ -75,47 +110,113 @@ def parse_arguments():
         default=config.CONFIDENCE_THRESHOLD,
         help=f'Ishonch darajasi threshold (default: {config.CONFIDENCE_THRESHOLD})'
     )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Ko\'p oqimli pipeline rejimi (decode/detect/chizish/yozish parallel)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Detection keshi: birinchi ishda yozish, keyingilarida YOLO\'siz qayta o\'ynatish'
+    )
+    parser.add_argument(
+        '--events',
+        action='store_true',
+        help=f'Har bir o\'tishni (vaqt, ID, klass, yo\'nalish) bazaga yozish: {config.EVENT_DB.name}'
+    )
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help=f'Bosqichlar kechikishini o\'lchash va eksport qilish: '
+             f'{config.METRICS_JSON.name}, {config.METRICS_PROM.name}'
+    )
+    parser.add_argument(
+        '--batch-size', '-b',
+        type=int,
+        default=config.BATCH_SIZE,
+        help=f'Bitta forward pass\'dagi framelar soni (default: {config.BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--assignment',
+        choices=['greedy', 'hungarian'],
+        default=config.TRACKER_ASSIGNMENT,
+        help=f'Tracker moslashtirish usuli (default: {config.TRACKER_ASSIGNMENT})'
+    )
+    parser.add_argument(
+        '--skip-frames',
+        type=int,
+        default=config.SKIP_FRAMES,
+        help=f'Har qayta ishlangan framedan keyin o\'tkaziladigan framelar (default: {config.SKIP_FRAMES})'
+    )
+    parser.add_argument(
+        '--seek-stride',
+        type=int,
+        default=config.SEEK_STRIDE,
+        help='Qadam shundan katta bo\'lsa, oraliq framelarni o\'qimasdan seek qilish (0 - o\'chirilgan)'
+    )
+    parser.add_argument(
+        '--predictive',
+        action='store_true',
+        help='Kalman bashoratli tracking (katta --skip-frames qiymatlarida ham ID saqlanadi)'
+    )
+    parser.add_argument(
+        '--tracker-backend',
+        choices=['dict', 'array'],
+        default=config.TRACKER_BACKEND,
+        help=f'Tracker holatini saqlash usuli (default: {config.TRACKER_BACKEND})'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=config.BATCH_WORKERS,
+        help=f'Batch rejimida jarayonlar soni (default: {config.BATCH_WORKERS})'
+    )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Adaptive frame skipping (latency budjeti bo\'yicha)'
+    )
+    parser.add_argument(
+        '--target-fps',
+        type=float,
+        default=config.TARGET_FPS,
+        help=f'Adaptive rejimda ushlab turiladigan FPS (default: {config.TARGET_FPS})'
+    )
+    parser.add_argument(
+        '--motion-gate',
+        action='store_true',
+        help='Harakatsiz framelarda YOLO\'ni o\'tkazib yuborish'
+    )
+    parser.add_argument(
+        '--roi-band',
+        type=float,
+        help='Faqat sanash chizig\'i atrofidagi polosada detection (balandlik ulushi, masalan 0.3)'
+    )
     
     return parser.parse_args()
 
 
 def download_yolo_model(model_name):
     """
-    YOLO modelini avtomatik yuklab olish
+    YOLO modelini topish (registry indeksi orqali) yoki avtomatik yuklab olish
     
     Args:
-        model_name: Model nomi (masalan, 'yolov8n.pt')
+        model_name: Model nomi (masalan, 'yolov8n.pt') yoki fayl yo'li
+    
+    Returns:
+        Path: Model fayli yo'li
     """
-    from ultralytics import YOLO
+    from model_registry import ModelRegistry
     
-    model_path = config.MODELS_DIR / model_name
+    try:
+        model_path = ModelRegistry().ensure(model_name)
+    except Exception as e:
+        print(f"❌ Model yuklab olishda xato: {e}")
+        sys.exit(1)
     
-    if not model_path.exists():
-        print(f"📥 Model topilmadi. Yuklab olinmoqda: {model_name}")
-        print("⏳ Bu biroz vaqt olishi mumkin...")
-        
-        try:
-            # Model yuklab olish (ultralytics avtomatik download qiladi)
-            model = YOLO(model_name)
-            
-            # Modelni to'g'ri joyga ko'chirish
-            import shutil
-            from pathlib import Path
-            
-            # Ultralytics cache papkasidan topish
-            cache_dir = Path.home() / '.cache' / 'ultralytics'
-            
-            # Model faylini qidirish
-            for file in cache_dir.rglob(model_name):
-                shutil.copy(file, model_path)
-                print(f"✅ Model saqlandi: {model_path}")
-                break
-            
-        except Exception as e:
-            print(f"❌ Model yuklab olishda xato: {e}")
-            sys.exit(1)
-    else:
-        print(f"✅ Model topildi: {model_path}")
+    print(f"✅ Model topildi: {model_path}")
+    return model_path
 
 
 def main():
@@ -129,20 +230,59 @@ def main():
     # Argumentlarni o'qish
     args = parse_arguments()
     
-    # Modelni yuklab olish
-    download_yolo_model(args.model)
+    config.ensure_directories()
+    
+    # Modelni topish yoki yuklab olish
+    config.MODEL_OFFLINE = config.MODEL_OFFLINE or args.offline
+    config.INFERENCE_BACKEND = args.backend
+    model_path = str(download_yolo_model(args.model))
     
     # Konfiguratsiyani yangilash
     config.CONFIDENCE_THRESHOLD = args.confidence
     config.DISPLAY_OUTPUT = not args.no_display
+    config.PIPELINE_MODE = args.pipeline
+    config.BATCH_SIZE = args.batch_size
+    config.DETECTION_CACHE = args.cache
+    config.EVENT_LOG = args.events
+    config.METRICS_ENABLED = args.metrics
+    config.TRACKER_ASSIGNMENT = args.assignment
+    config.TRACKER_BACKEND = args.tracker_backend
+    config.TRACKER_PREDICTIVE = args.predictive
+    config.SKIP_FRAMES = args.skip_frames
+    config.SEEK_STRIDE = args.seek_stride
+    config.VIDEO_WRITER_BACKEND = args.writer
+    config.VIDEO_CRF = args.crf
+    config.ADAPTIVE_SKIP = args.adaptive
+    config.TARGET_FPS = args.target_fps
+    config.MOTION_GATING = args.motion_gate
+    if args.roi_band:
+        config.ROI = {"mode": "band", "height": args.roi_band}
     
-    # Counter yaratish
-    model_path = str(config.MODELS_DIR / args.model)
-    counter = ObjectCounter(model_path=model_path)
+    # Counter yaratish (batch va ko'p oqimli rejimlar o'zi yaratadi)
+    counter = None
+    if not args.videos and not args.sources:
+        from counter import ObjectCounter
+        counter = ObjectCounter(model_path=model_path)
     
     try:
+        # Batch rejimi
+        if args.videos:
+            from batch_runner import run_batch
+            run_batch(
+                source=args.videos,
+                model_path=model_path,
+                workers=args.workers,
+                save_video=args.save
+            )
+        
+        # Ko'p oqimli rejim
+        elif args.sources:
+            from multi_stream import MultiStreamCounter
+            multi_counter = MultiStreamCounter(args.sources, model_path=model_path)
+            multi_counter.run(display=config.DISPLAY_OUTPUT)
+        
         # Video rejimi
-        if args.video:
+        elif args.video:
             video_path = args.video
             
             # Video mavjudligini tekshirish
@@ -170,11 +310,13 @@ def main():
             
             # Statistikani saqlash
             if config.SAVE_STATISTICS:
+                from utils import save_statistics_to_csv
                 save_statistics_to_csv(stats, config.STATS_FILENAME)
         
         # Kamera rejimi
         elif args.camera:
-            counter.process_camera(camera_id=args.camera_id)
+            counter.process_camera(camera_id=args.camera_id,
+                                   display=config.DISPLAY_OUTPUT)
     
     except KeyboardInterrupt:
         print("\n\n⏹️  Dastur to'xtatildi (Ctrl+C)")
@@ -186,7 +328,11 @@ def main():
         sys.exit(1)
     
     finally:
-        cv2.destroyAllWindows()
+        if counter is not None:
+            counter.close()
+        if config.DISPLAY_OUTPUT:
+            import cv2
+            cv2.destroyAllWindows()
     
     print("\n" + "=" * 60)
     print("✅ Dastur muvaffaqiyatli yakunlandi!")
@@ -0,0 +1,217 @@
+"""
+Object Counting System - Batch Rejimi
+Ko'p video fayllarni process pool yordamida parallel qayta ishlash.
+Har bir worker modelni bir marta yuklaydi va barcha fayllar uchun qayta ishlatadi.
+"""
+
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import cv2
+import config
+
+
+# Qo'llab-quvvatlanadigan video formatlari
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.m4v', '.wmv'}
+
+# Worker jarayonidagi counter (har bir jarayonda bittadan)
+_worker_counter = None
+
+
+def find_videos(source):
+    """
+    Papkadagi (yoki glob bo'yicha) video fayllarni topish
+    
+    Args:
+        source: Papka yo'li yoki glob pattern (masalan, 'clips/*.mp4')
+    
+    Returns:
+        list: Saralangan video fayl yo'llari
+    """
+    path = Path(source)
+    
+    if path.is_dir():
+        files = path.iterdir()
+    else:
+        files = (Path(file) for file in glob.glob(source))
+    
+    return sorted(
+        str(file) for file in files
+        if file.is_file() and file.suffix.lower() in VIDEO_EXTENSIONS
+    )
+
+
+def _worker_path(path):
+    """Worker uchun alohida fayl yo'li (metrics.json -> metrics.worker1234.json)"""
+    return path.with_name(f"{path.stem}.worker{os.getpid()}{path.suffix}")
+
+
+def _init_worker(model_path, config_values, num_threads):
+    """
+    Worker jarayonini tayyorlash: sozlamalarni tiklash va modelni bir marta yuklash
+    """
+    global _worker_counter
+    
+    # Asosiy jarayondagi sozlamalarni qo'llash (spawn'da config qayta import qilinadi)
+    for name, value in config_values.items():
+        setattr(config, name, value)
+    
+    # Yadrolarni workerlar o'rtasida bo'lish (oversubscription bo'lmasligi uchun)
+    import torch
+    torch.set_num_threads(num_threads)
+    cv2.setNumThreads(num_threads)
+    
+    from counter import ObjectCounter
+    from metrics import StageMetrics
+    _worker_counter = ObjectCounter(model_path=model_path)
+    
+    if _worker_counter.metrics is not None:
+        # Har bir worker o'z fayllariga: metrics.worker1234.json, metrics.worker1234.prom
+        _worker_counter.metrics = StageMetrics(
+            json_path=_worker_path(config.METRICS_JSON),
+            prom_path=_worker_path(config.METRICS_PROM),
+        )
+
+
+def _process_one(video_path, output_dir, save_video):
+    """
+    Bitta videoni worker ichida qayta ishlash
+    
+    Returns:
+        dict: Fayl bo'yicha natija (video, status, frames, seconds, fps, klasslar soni)
+    """
+    counter = _worker_counter
+    counter.reset_counter()
+    
+    output_path = None
+    if save_video:
+        output_path = str(Path(output_dir) / f"{Path(video_path).stem}_counted.mp4")
+    
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    
+    row = {'video': video_path, 'worker': os.getpid(), 'frames': total_frames}
+    start = time.perf_counter()
+    
+    try:
+        stats = counter.process_video(video_path, output_path=output_path, display=False)
+        row['status'] = 'ok'
+        row['error'] = ''
+    except Exception as e:
+        stats = {name: 0 for name in counter.count_classes.values()}
+        row['status'] = 'error'
+        row['error'] = str(e)
+    
+    elapsed = time.perf_counter() - start
+    row['seconds'] = round(elapsed, 3)
+    row['fps'] = round(total_frames / elapsed, 2) if elapsed > 0 else 0.0
+    row.update(stats)
+    
+    return row
+
+
+def run_batch(source, model_path, workers=None, save_video=False, summary_filename=None):
+    """
+    Ko'p videoni process pool'da qayta ishlash va umumiy CSV yozish
+    
+    Args:
+        source: Videolar papkasi yoki glob pattern
+        model_path: YOLO model fayl yo'li (backend varianti shu yerda tayyorlanadi)
+        workers: Jarayonlar soni (default: config.BATCH_WORKERS)
+        save_video: Natija videolarni saqlash
+        summary_filename: Umumiy CSV nomi (default: config.BATCH_SUMMARY_FILENAME)
+    
+    Returns:
+        list: Har bir fayl bo'yicha natijalar
+    """
+    videos = find_videos(source)
+    
+    if not videos:
+        raise ValueError(f"❌ Video topilmadi: {source}")
+    
+    config.ensure_directories()
+    workers = min(workers or config.BATCH_WORKERS, len(videos))
+    num_threads = max(1, (os.cpu_count() or 1) // workers)
+    summary_filename = summary_filename or config.BATCH_SUMMARY_FILENAME
+    
+    print(f"\n📦 Batch rejimi: {len(videos)} ta video, {workers} ta worker "
+          f"({num_threads} thread/worker)")
+    
+    # Backend varianti asosiy jarayonda bir marta tayyorlanadi - workerlar bir
+    # faylga bir vaqtda eksport qilmasin, tayyor fayl yo'lini oladi
+    from model_registry import ModelRegistry
+    model_path = str(ModelRegistry().ensure_variant(model_path, config.INFERENCE_BACKEND))
+    
+    config_values = {
+        name: value for name, value in vars(config).items() if name.isupper()
+    }
+    
+    rows = []
+    start = time.perf_counter()
+    
+    # spawn: CUDA va ko'p oqimli kutubxonalar fork bilan xavfsiz emas
+    context = multiprocessing.get_context('spawn')
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(model_path, config_values, num_threads)) as executor:
+        futures = {
+            executor.submit(_process_one, video, str(config.OUTPUT_DIR), save_video): video
+            for video in videos
+        }
+        
+        for i, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            rows.append(row)
+            
+            status = "✅" if row['status'] == 'ok' else "❌"
+            print(f"{status} [{i}/{len(videos)}] {Path(row['video']).name}: "
+                  f"{row['seconds']:.1f}s, {row['fps']:.1f} FPS")
+    
+    elapsed = time.perf_counter() - start
+    
+    # Kirish tartibida saralash
+    order = {video: i for i, video in enumerate(videos)}
+    rows.sort(key=lambda row: order[row['video']])
+    
+    save_batch_summary(rows, summary_filename)
+    
+    total_frames = sum(row['frames'] for row in rows)
+    print(f"\n⏱️  Umumiy vaqt: {elapsed:.1f}s, {total_frames / elapsed:.1f} FPS (jami)")
+    
+    return rows
+
+
+def save_batch_summary(rows, filename):
+    """
+    Fayllar bo'yicha natijalarni va jami qatorni CSV ga yozish
+    
+    Args:
+        rows: run_batch() natijalari
+        filename: Fayl nomi (config.OUTPUT_DIR ichida)
+    """
+    import pandas as pd
+    
+    df = pd.DataFrame(rows)
+    
+    # Jami qator
+    class_columns = list(config.COUNT_CLASSES.values())
+    total = {column: df[column].sum() for column in class_columns if column in df}
+    total.update({
+        'video': 'TOTAL',
+        'status': f"{(df['status'] == 'ok').sum()}/{len(df)} ok",
+        'frames': df['frames'].sum(),
+        'seconds': round(df['seconds'].sum(), 3),
+    })
+    df = pd.concat([df, pd.DataFrame([total])], ignore_index=True)
+    
+    config.ensure_directories()
+    filepath = config.OUTPUT_DIR / filename
+    df.to_csv(filepath, index=False)
+    
+    print(f"✅ Batch statistikasi saqlandi: {filepath}")
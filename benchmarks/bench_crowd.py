@@ -0,0 +1,315 @@
+"""
+Object Counting System - Crowd-Scale Tracker/Counter Benchmark
+Zich sahnalar (stadion chiqishi: 300+ odam) uchun tracker.update() va
+sanash logikasi (chiziqdan o'tish, ishonchni topish) narxi: 10 dan 2000
+gacha obyekt/frame. Har bir zichlik uchun frame vaqti (o'rtacha, p95) va
+xotira ajratish (tracemalloc bo'yicha frame ichidagi eng yuqori ajratma,
+frame'dan keyin qolgan bloklar).
+
+Budjet buzilsa (300 obyektda frame vaqti yoki zichlik bo'yicha o'sish
+darajasi), skript 1 kod bilan chiqadi - CI da regressiyani ushlash uchun.
+Default tracker - ishlab chiqarishdagi (config.TRACKER_BACKEND /
+TRACKER_PREDICTIVE); --tracker all barcha trackerlarni tekshiradi.
+
+Model yuklanmaydi: detectionlar SyntheticVideoSource dan (rasmsiz) olinadi.
+
+Ishlatish:
+    python benchmarks/bench_crowd.py
+    python benchmarks/bench_crowd.py --tracker all
+    python benchmarks/bench_crowd.py --tracker dict --objects 10 100 300 1000
+    python benchmarks/bench_crowd.py --budget-ms 3 --max-exponent 1.2 --json crowd.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from counter import ObjectCounter
+from synthetic import SyntheticVideoSource
+
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4K': (3840, 2160),
+}
+
+# O'sish darajasi shu zichlikdan boshlab baholanadi (kichiklarida doimiy xarajat ustun)
+EXPONENT_MIN_OBJECTS = 100
+
+TRACKERS = ('dict', 'array', 'kalman')
+
+
+def make_frames(num_objects, num_frames, resolution):
+    """
+    Sintetik detection ketma-ketligi (framelar chizilmaydi)
+    
+    Returns:
+        list: Har bir frame uchun [(x1, y1, x2, y2, class_id, confidence), ...]
+    """
+    width, height = RESOLUTIONS[resolution]
+    source = SyntheticVideoSource(width=width, height=height, num_objects=num_objects,
+                                  num_frames=num_frames,
+                                  class_ids=tuple(config.COUNT_CLASSES)[:2])
+    
+    frames = []
+    while source.grab():
+        frames.append(source.last_detections)
+    
+    return frames
+
+
+def make_counter(tracker):
+    """Tanlangan tracker bilan counter (modelsiz)"""
+    config.TRACKER_PREDICTIVE = tracker == 'kalman'
+    config.TRACKER_BACKEND = 'array' if tracker == 'array' else 'dict'
+    # Chegara o'chiriladi: 1000+ zichlikda ID lar almashmasin (o'lchov zichlikni aks ettirsin)
+    config.MAX_TRACKED_OBJECTS = None
+    return ObjectCounter(model=object())
+
+
+def measure_time(tracker, frames, height, warmup):
+    """
+    Har bir frame uchun tracker.update() va sanash vaqti
+    
+    Returns:
+        tuple: (update vaqtlari, sanash vaqtlari, faol tracklar) - isitish framelarisiz
+    """
+    counter = make_counter(tracker)
+    update = counter.tracker.update
+    last = [0.0]
+    
+    def timed_update(*args, **kwargs):
+        start = time.perf_counter()
+        result = update(*args, **kwargs)
+        last[0] = time.perf_counter() - start
+        return result
+    
+    counter.tracker.update = timed_update
+    
+    track_times, count_times, tracks = [], [], []
+    for frame_index, detections in enumerate(frames, start=1):
+        start = time.perf_counter()
+        counter.analyze_detections(detections, height, frame_index)
+        total = time.perf_counter() - start
+        
+        if frame_index > warmup:
+            track_times.append(last[0])
+            count_times.append(total - last[0])
+            tracks.append(len(counter.tracker.objects))
+    
+    return np.array(track_times), np.array(count_times), np.array(tracks)
+
+
+def measure_allocations(tracker, frames, height, warmup):
+    """
+    Har bir frame uchun xotira ajratish (tracemalloc)
+    
+    Returns:
+        dict: update va sanash uchun o'rtacha eng yuqori ajratma (KiB/frame),
+            frame'dan keyin qolgan bloklar (o'rtacha, isitishdan keyin)
+    """
+    counter = make_counter(tracker)
+    update = counter.tracker.update
+    peaks = {'track': [], 'count': []}
+    
+    def traced_update(*args, **kwargs):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = update(*args, **kwargs)
+        current, peak = tracemalloc.get_traced_memory()
+        peaks['track'].append(peak - before)
+        # Sanash qismi shu nuqtadan boshlab o'lchanadi
+        tracemalloc.reset_peak()
+        traced_update.after = current
+        return result
+    
+    traced_update.after = 0
+    counter.tracker.update = traced_update
+    
+    tracemalloc.start()
+    try:
+        blocks_before = sys.getallocatedblocks()
+        for frame_index, detections in enumerate(frames, start=1):
+            counter.analyze_detections(detections, height, frame_index)
+            peaks['count'].append(tracemalloc.get_traced_memory()[1] - traced_update.after)
+            
+            if frame_index == warmup:
+                blocks_before = sys.getallocatedblocks()
+        
+        measured = len(frames) - warmup
+        retained = (sys.getallocatedblocks() - blocks_before) / measured if measured > 0 else 0.0
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'track_peak_kib': round(float(np.mean(peaks['track'][warmup:])) / 1024, 2),
+        'count_peak_kib': round(float(np.mean(peaks['count'][warmup:])) / 1024, 2),
+        'retained_blocks': round(retained, 2),
+    }
+
+
+def scaling_exponent(runs):
+    """
+    Frame vaqtining zichlik bo'yicha o'sish darajasi (log-log regressiya)
+    
+    1.0 - chiziqli, 2.0 - kvadratik (masalan, tracks x detections sikli)
+    
+    Returns:
+        float yoki None: Baholash uchun zichliklar yetarli bo'lmasa None
+    """
+    points = [(run['objects'], run['total_ms']) for run in runs
+              if run['objects'] >= EXPONENT_MIN_OBJECTS and run['total_ms'] > 0]
+    if len(points) < 2:
+        return None
+    
+    objects, times = np.log(np.array(points, dtype=np.float64)).T
+    return float(np.polyfit(objects, times, 1)[0])
+
+
+def budget_run(runs, budget_objects):
+    """Budjet tekshiriladigan zichlik (aniq bo'lmasa, undan kattasi)"""
+    candidates = [run for run in runs if run['objects'] >= budget_objects]
+    return min(candidates, key=lambda run: run['objects']) if candidates else None
+
+
+def production_tracker():
+    """Ishlab chiqarishda ishlatiladigan tracker (counter._create_tracker() bilan bir xil)"""
+    return 'kalman' if config.TRACKER_PREDICTIVE else config.TRACKER_BACKEND
+
+
+def run_tracker(tracker, args, height, production):
+    """
+    Bitta tracker uchun barcha zichliklarni o'lchash, jadval va budjetlar
+    
+    Returns:
+        dict: tracker, exponent, failures, runs
+    """
+    runs = []
+    for num_objects in args.objects:
+        frames = make_frames(num_objects, args.frames + args.warmup, args.resolution)
+        
+        track, count, tracks = measure_time(tracker, frames, height, args.warmup)
+        total = track + count
+        allocations = measure_allocations(tracker, frames, height, args.warmup)
+        
+        runs.append({
+            'objects': num_objects,
+            'detections': round(sum(len(d) for d in frames) / len(frames), 1),
+            'tracks': round(float(tracks.mean()), 1),
+            'track_ms': round(float(track.mean()) * 1000, 4),
+            'track_p95_ms': round(float(np.percentile(track, 95)) * 1000, 4),
+            'count_ms': round(float(count.mean()) * 1000, 4),
+            'count_p95_ms': round(float(np.percentile(count, 95)) * 1000, 4),
+            'total_ms': round(float(total.mean()) * 1000, 4),
+            **allocations,
+        })
+    
+    default = " - ishlab chiqarishdagi" if tracker == production else ""
+    print(f"\nTracker: {tracker}{default} ({args.assignment}), {args.resolution}, "
+          f"{args.frames} frame\n")
+    print(f"{'obyekt':>7} | {'det/frame':>9} | {'tracklar':>8} | {'update ms':>9} | {'p95':>7} | "
+          f"{'sanash ms':>9} | {'p95':>7} | {'update KiB':>10} | {'sanash KiB':>10} | "
+          f"{'qolgan blok':>11}")
+    print("-" * 115)
+    for run in runs:
+        print(f"{run['objects']:>7} | {run['detections']:>9.1f} | {run['tracks']:>8.1f} | "
+              f"{run['track_ms']:>9.3f} | "
+              f"{run['track_p95_ms']:>7.3f} | {run['count_ms']:>9.3f} | "
+              f"{run['count_p95_ms']:>7.3f} | {run['track_peak_kib']:>10.1f} | "
+              f"{run['count_peak_kib']:>10.1f} | {run['retained_blocks']:>11.2f}")
+    
+    # Budjetlar
+    failures = []
+    
+    exponent = scaling_exponent(runs)
+    if exponent is None:
+        print(f"\n⚠️  O'sish darajasi uchun >= {EXPONENT_MIN_OBJECTS} obyektli "
+              f"kamida 2 ta zichlik kerak")
+    else:
+        print(f"\n📈 O'sish darajasi: {exponent:.2f} (chegara {args.max_exponent})")
+        if exponent > args.max_exponent:
+            failures.append(f"{tracker}: o'sish darajasi {exponent:.2f} > {args.max_exponent}")
+    
+    run = budget_run(runs, args.budget_objects)
+    if run is None:
+        print(f"⚠️  {args.budget_objects} obyektli zichlik o'lchanmadi - vaqt budjeti tekshirilmadi")
+    else:
+        print(f"⏱️  {run['objects']} obyektda: {run['total_ms']:.3f} ms/frame "
+              f"(budjet {args.budget_ms} ms)")
+        if run['total_ms'] > args.budget_ms:
+            failures.append(f"{tracker}: {run['objects']} obyektda {run['total_ms']:.3f} ms > "
+                            f"{args.budget_ms} ms")
+    
+    return {
+        'tracker': tracker,
+        'exponent': None if exponent is None else round(exponent, 3),
+        'passed': not failures,
+        'failures': failures,
+        'runs': runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crowd-scale tracker/counter benchmark')
+    parser.add_argument('--objects', type=int, nargs='+',
+                        default=[10, 50, 100, 300, 1000, 2000],
+                        help='Framedagi obyektlar soni (zichlik)')
+    parser.add_argument('--frames', type=int, default=200, help='Framelar soni')
+    parser.add_argument('--warmup', type=int, default=20,
+                        help='Isitish framelari (tracker to\'lishi)')
+    parser.add_argument('--resolution', choices=list(RESOLUTIONS), default='1080p')
+    parser.add_argument('--tracker', choices=TRACKERS + ('all',), default=production_tracker(),
+                        help='Tracker (default: ishlab chiqarishdagi; all - barchasi)')
+    parser.add_argument('--assignment', choices=['greedy', 'hungarian'],
+                        default=config.TRACKER_ASSIGNMENT)
+    parser.add_argument('--budget-objects', type=int, default=300,
+                        help='Budjet tekshiriladigan zichlik')
+    parser.add_argument('--budget-ms', type=float, default=5.0,
+                        help='Shu zichlikda update + sanash uchun o\'rtacha frame vaqti (ms)')
+    parser.add_argument('--max-exponent', type=float, default=1.3,
+                        help='Ruxsat etilgan o\'sish darajasi (1.0 - chiziqli)')
+    parser.add_argument('--json', help='Natijalarni JSON faylga yozish')
+    args = parser.parse_args()
+    
+    trackers = TRACKERS if args.tracker == 'all' else (args.tracker,)
+    # make_counter() config ni o'zgartiradi - ishlab chiqarishdagi tracker oldindan olinadi
+    production = production_tracker()
+    
+    config.TRACKER_ASSIGNMENT = args.assignment
+    config.SAVE_STATISTICS = False
+    height = RESOLUTIONS[args.resolution][1]
+    
+    results = [run_tracker(tracker, args, height, production) for tracker in trackers]
+    failures = [failure for result in results for failure in result.pop('failures')]
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'assignment': args.assignment,
+                'resolution': args.resolution,
+                'frames': args.frames,
+                'budget': {'objects': args.budget_objects, 'ms': args.budget_ms,
+                           'max_exponent': args.max_exponent},
+                'passed': not failures,
+                'results': results,
+            }, f, indent=2)
+        print(f"\n💾 Natija saqlandi: {args.json}")
+    
+    if failures:
+        print("\n❌ Budjet buzildi: " + "; ".join(failures))
+        sys.exit(1)
+    
+    print("\n✅ Budjet doirasida")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Object Counting System - Decode Benchmark
+SKIP_FRAMES dagi o'tkazib yuboriladigan framelar narxi: har bir frameni
+cap.read() bilan to'liq o'qish (eski yo'l), FrameReader (skip qilinadigan
+framelar uchun faqat grab()) va siyrak seek rejimi (oraliq framelar umuman
+o'qilmaydi) - turli qadamlarda.
+
+Test video sun'iy manbadan yaratiladi (default: 4K, H.264 - kodek bo'lmasa mp4v).
+
+Ishlatish:
+    python benchmarks/bench_decode.py
+    python benchmarks/bench_decode.py --resolution 1080p --strides 1 3 10 60 --frames 600
+    python benchmarks/bench_decode.py --video input_videos/test.mp4 --json decode.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from capture import FrameReader
+from scheduler import FrameScheduler
+from synthetic import write_synthetic_video
+
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4K': (3840, 2160),
+}
+
+MODES = ('read', 'grab', 'seek')
+
+
+def make_video(path, resolution, num_frames, codec):
+    """Test video (kodek bo'lmasa mp4v ga qaytiladi)"""
+    width, height = RESOLUTIONS[resolution]
+    
+    for fourcc in dict.fromkeys([codec, 'mp4v']):
+        try:
+            return write_synthetic_video(path, num_frames=num_frames, num_objects=30,
+                                         width=width, height=height, fourcc=fourcc), fourcc
+        except ValueError:
+            print(f"⚠️  Kodek mavjud emas: {fourcc}")
+    
+    raise ValueError("❌ Test video yozilmadi")
+
+
+def read_all(cap, scheduler):
+    """Eski yo'l: har bir frame cap.read() bilan, keyin scheduler filtri"""
+    frame_indices = []
+    frame_count = 0
+    
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        
+        frame_count += 1
+        if scheduler.should_process(frame_count):
+            frame_indices.append(frame_count)
+    
+    return frame_indices
+
+
+def read_with_reader(cap, scheduler, seek_stride):
+    """FrameReader orqali faqat tanlangan framelarni o'qish"""
+    reader = FrameReader(cap, scheduler, seek_stride=seek_stride)
+    frame_indices = []
+    
+    while True:
+        ret, frame_index, frame = reader.read()
+        if not ret:
+            break
+        frame_indices.append(frame_index)
+    
+    return frame_indices
+
+
+def measure(video, mode, stride, seek_stride):
+    """
+    Bitta rejim va qadam bo'yicha butun videoni o'qish
+    
+    Returns:
+        tuple: (sekund, qayta ishlangan frame raqamlari)
+    """
+    cap = cv2.VideoCapture(video)
+    scheduler = FrameScheduler(base_stride=stride, adaptive=False)
+    
+    start = time.perf_counter()
+    try:
+        if mode == 'read':
+            frame_indices = read_all(cap, scheduler)
+        else:
+            frame_indices = read_with_reader(cap, scheduler,
+                                             seek_stride if mode == 'seek' else 0)
+    finally:
+        cap.release()
+    
+    return time.perf_counter() - start, frame_indices
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode benchmark')
+    parser.add_argument('--video', help='Mavjud video (default: sun\'iy test video)')
+    parser.add_argument('--resolution', choices=list(RESOLUTIONS), default='4K')
+    parser.add_argument('--frames', type=int, default=300, help='Test video uzunligi')
+    parser.add_argument('--codec', default='avc1', help='Test video kodeki (fourcc)')
+    parser.add_argument('--strides', type=int, nargs='+', default=[1, 3, 5, 10, 30, 60],
+                        help='Qadamlar (SKIP_FRAMES + 1)')
+    parser.add_argument('--seek-stride', type=int, default=1,
+                        help='seek rejimida shundan katta oraliqlar seek qilinadi')
+    parser.add_argument('--json', help='Natijalarni JSON faylga yozish')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.video:
+            video, codec = args.video, None
+        else:
+            print(f"🎬 Test video yaratilmoqda: {args.resolution}, {args.frames} frame...")
+            video, codec = make_video(Path(tmp) / "decode_test.mp4", args.resolution,
+                                      args.frames, args.codec)
+        
+        results = []
+        for stride in args.strides:
+            timings = {}
+            indices = {}
+            for mode in MODES:
+                timings[mode], indices[mode] = measure(video, mode, stride, args.seek_stride)
+            
+            # grab/retrieve eski yo'l bilan aynan bir xil framelarni berishi shart
+            if indices['grab'] != indices['read']:
+                raise AssertionError(f"❌ stride {stride}: grab() rejimi boshqa framelarni berdi")
+            
+            results.append({
+                'stride': stride,
+                'processed': len(indices['read']),
+                'seconds': {mode: round(timings[mode], 4) for mode in MODES},
+                'speedup': {mode: round(timings['read'] / timings[mode], 2) for mode in MODES},
+                # Seek keyframe'ga yaqinlashtirishi mumkin - farqlanadigan framelar soni
+                'seek_mismatched': len(set(indices['seek']) ^ set(indices['read'])),
+            })
+    
+    source = args.video or f"sun'iy {args.resolution} ({codec})"
+    print(f"\nVideo: {source}\n")
+    print(f"{'stride':>6} | {'framelar':>8} | {'read s':>8} | {'grab s':>8} | {'seek s':>8} | "
+          f"{'grab x':>6} | {'seek x':>6} | {'seek farq':>9}")
+    print("-" * 82)
+    for r in results:
+        s, x = r['seconds'], r['speedup']
+        print(f"{r['stride']:>6} | {r['processed']:>8} | {s['read']:>8.3f} | {s['grab']:>8.3f} | "
+              f"{s['seek']:>8.3f} | {x['grab']:>5.2f}x | {x['seek']:>5.2f}x | "
+              f"{r['seek_mismatched']:>9}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'video': source, 'seek_stride': args.seek_stride, 'results': results},
+                      f, indent=2)
+        print(f"\n💾 Natija saqlandi: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
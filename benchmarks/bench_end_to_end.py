@@ -0,0 +1,204 @@
+"""
+Object Counting System - End-to-End Benchmark
+Sun'iy video (harakatlanuvchi to'rtburchaklar, berilgan zichlikda) ustida
+ObjectCounter ning to'liq tezligi va bosqichlar narxi: decode, detect,
+track, count, draw, encode. Natija JSON ko'rinishida - commitlar orasida
+taqqoslash uchun.
+
+Detector: StubDetector (model og'irliklari va tarmoqsiz, har doim) va
+haqiqiy YOLO modeli (models/ da bo'lsa).
+
+Ishlatish:
+    python benchmarks/bench_end_to_end.py
+    python benchmarks/bench_end_to_end.py --objects 10 100 500 --frames 300 --json e2e.json
+    python benchmarks/bench_end_to_end.py --resolution 1080p --detectors stub
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import config
+from counter import ObjectCounter
+from synthetic import StubDetector, write_synthetic_video
+
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4K': (3840, 2160),
+}
+
+STAGES = ('decode', 'detect', 'track', 'count', 'draw', 'encode')
+
+
+def make_counter(detector, model_path):
+    """Stub yoki haqiqiy model bilan counter"""
+    if detector == 'stub':
+        return ObjectCounter(model=StubDetector(class_ids=tuple(config.COUNT_CLASSES)[:2]))
+    return ObjectCounter(model_path=model_path)
+
+
+def measure_stages(counter, video_path, output_path):
+    """
+    Har bir frame uchun bosqichlarni alohida o'lchash
+    
+    Returns:
+        tuple: ({bosqich: o'rtacha ms/frame}, framelar soni)
+    """
+    totals = dict.fromkeys(STAGES, 0.0)
+    
+    # Tracking vaqti analyze_detections() ichidan ajratib olinadi
+    tracker_update = counter.tracker.update
+    
+    def timed_update(*args, **kwargs):
+        start = time.perf_counter()
+        result = tracker_update(*args, **kwargs)
+        totals['track'] += time.perf_counter() - start
+        return result
+    
+    counter.tracker.update = timed_update
+    
+    cap = cv2.VideoCapture(video_path)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    
+    frames = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            decoded = time.perf_counter()
+            if not ret:
+                break
+            frames += 1
+            
+            detections = counter.detect_objects(frame)
+            detected = time.perf_counter()
+            
+            track_before = totals['track']
+            tracks = counter.analyze_detections(detections, height, frames)
+            analyzed = time.perf_counter()
+            
+            rendered = counter.render_frame(frame, tracks)
+            drawn = time.perf_counter()
+            
+            writer.write(rendered)
+            encoded = time.perf_counter()
+            
+            track_time = totals['track'] - track_before
+            totals['decode'] += decoded - start
+            totals['detect'] += detected - decoded
+            totals['count'] += analyzed - detected - track_time
+            totals['draw'] += drawn - analyzed
+            totals['encode'] += encoded - drawn
+    finally:
+        cap.release()
+        writer.release()
+        counter.tracker.update = tracker_update
+    
+    return {stage: round(totals[stage] / max(frames, 1) * 1000, 3) for stage in STAGES}, frames
+
+
+def measure_process_video(counter, video_path, output_path, frames):
+    """Haqiqiy process_video() yo'li (SKIP_FRAMES = 0) bo'yicha FPS"""
+    start = time.perf_counter()
+    counter.process_video(video_path, output_path=output_path, display=False, pipelined=False)
+    elapsed = time.perf_counter() - start
+    return round(frames / elapsed, 2) if elapsed else 0.0
+
+
+def git_commit():
+    """Joriy commit (git bo'lmasa None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end benchmark')
+    parser.add_argument('--objects', type=int, nargs='+', default=[10, 50, 200],
+                        help='Framedagi obyektlar soni (zichlik)')
+    parser.add_argument('--frames', type=int, default=300, help='Video uzunligi (frame)')
+    parser.add_argument('--resolution', choices=list(RESOLUTIONS), default='720p')
+    parser.add_argument('--detectors', nargs='+', choices=['stub', 'model'],
+                        default=['stub', 'model'])
+    parser.add_argument('--model', default=str(config.MODELS_DIR / config.YOLO_MODEL),
+                        help='Haqiqiy model (bo\'lmasa o\'tkazib yuboriladi)')
+    parser.add_argument('--json', help='Natijalarni JSON faylga yozish')
+    args = parser.parse_args()
+    
+    # Har bir frame qayta ishlanadi, statistika CSV ga yozilmaydi
+    config.SKIP_FRAMES = 0
+    config.SAVE_STATISTICS = False
+    
+    detectors = list(args.detectors)
+    if 'model' in detectors and not Path(args.model).exists():
+        print(f"⚠️  Model topilmadi ({args.model}): faqat stub detector\n")
+        detectors.remove('model')
+    
+    width, height = RESOLUTIONS[args.resolution]
+    runs = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_objects in args.objects:
+            video_path = write_synthetic_video(Path(tmp) / f"synthetic_{num_objects}.mp4",
+                                               num_frames=args.frames, num_objects=num_objects,
+                                               width=width, height=height)
+            output_path = str(Path(tmp) / "output.mp4")
+            
+            for detector in detectors:
+                counter = make_counter(detector, args.model)
+                stages, frames = measure_stages(counter, video_path, output_path)
+                stage_fps = round(1000 / sum(stages.values()), 2) if frames else 0.0
+                
+                counter.reset_counter()
+                e2e_fps = measure_process_video(counter, video_path, output_path, frames)
+                
+                runs.append({
+                    'detector': detector,
+                    'objects': num_objects,
+                    'frames': frames,
+                    'fps': e2e_fps,
+                    'stage_fps': stage_fps,
+                    'stages_ms': stages,
+                    'counted': sum(counter.stats.values()),
+                })
+    
+    print(f"\n{args.resolution}, {args.frames} frame\n")
+    header = " | ".join(f"{stage:>7}" for stage in STAGES)
+    print(f"{'detector':>8} | {'obyekt':>6} | {'FPS':>7} | {header}  (ms/frame)")
+    print("-" * (38 + 10 * len(STAGES)))
+    for run in runs:
+        stages = " | ".join(f"{run['stages_ms'][stage]:>7.2f}" for stage in STAGES)
+        print(f"{run['detector']:>8} | {run['objects']:>6} | {run['fps']:>7.1f} | {stages}")
+    
+    if args.json:
+        report = {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'opencv': cv2.__version__,
+            'resolution': args.resolution,
+            'runs': runs,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Natija saqlandi: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Object Counting System - Event Log Benchmark
+O'tish hodisalarini yozish tezligi: frame siklidagi log() narxi, fon
+oqimining bazaga yozish tezligi (hodisa/s) va vaqt oynalari bo'yicha so'rov
+
+Ishlatish:
+    python benchmarks/bench_events.py
+    python benchmarks/bench_events.py --events 1000000 --batch-size 2000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from events import EventWriter, EventStore
+
+
+def make_events(num_events, rate, seed=0):
+    """
+    Sintetik o'tishlar: o'rtacha `rate` hodisa/s, tasodifiy klass va yo'nalish
+    
+    Returns:
+        list: [(timestamp, frame_index, object_id, class_name, direction, source), ...]
+    """
+    rng = np.random.default_rng(seed)
+    class_names = list(config.COUNT_CLASSES.values())
+    
+    timestamps = np.cumsum(rng.exponential(1.0 / rate, size=num_events))
+    classes = rng.integers(0, len(class_names), size=num_events)
+    directions = rng.integers(0, 2, size=num_events)
+    
+    return [
+        (t, int(t * config.FPS), i, class_names[c], ("down", "up")[d], "camera0")
+        for i, (t, c, d) in enumerate(zip(timestamps.tolist(), classes.tolist(),
+                                          directions.tolist()))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Event log benchmark')
+    parser.add_argument('--events', type=int, default=200000, help='Hodisalar soni')
+    parser.add_argument('--rate', type=float, default=5.0,
+                        help='Sintetik oqimdagi o\'rtacha hodisa/s (vaqt oynalari uchun)')
+    parser.add_argument('--batch-size', type=int, default=config.EVENT_BATCH_SIZE)
+    parser.add_argument('--window', type=float, default=900, help='So\'rov oynasi (sekund)')
+    args = parser.parse_args()
+    
+    events = make_events(args.events, args.rate)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "crossings.db"
+        writer = EventWriter(path, batch_size=args.batch_size,
+                             queue_size=args.events + 1)
+        
+        # Frame sikli narxi: faqat navbatga qo'shish
+        start = time.perf_counter()
+        for event in events:
+            writer.log(*event)
+        enqueue_time = time.perf_counter() - start
+        
+        # Bazaga yozilguncha
+        writer.flush()
+        total_time = time.perf_counter() - start
+        writer.close()
+        
+        store = EventStore(path)
+        
+        start = time.perf_counter()
+        windows = store.counts(window=args.window)
+        query_ms = (time.perf_counter() - start) * 1000
+        
+        # Indeks bilan tor oraliq (oxirgi 1 soat)
+        end = events[-1][0]
+        start = time.perf_counter()
+        store.totals(start=end - 3600, end=end + 1, source="camera0")
+        range_ms = (time.perf_counter() - start) * 1000
+        store.close()
+        
+        size_mb = path.stat().st_size / 1e6
+    
+    print(f"Hodisalar: {args.events}, batch: {args.batch_size}\n")
+    print(f"log() (frame sikli):  {enqueue_time / args.events * 1e6:8.2f} us/hodisa")
+    print(f"Bazaga yozish:        {args.events / total_time:8.0f} hodisa/s")
+    print(f"Baza hajmi:           {size_mb:8.2f} MB")
+    print(f"counts({args.window:g}s):        {query_ms:8.2f} ms ({len(windows)} oyna)")
+    print(f"totals(oxirgi 1 soat): {range_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Object Counting System - Detection Extraction Microbenchmark
+Per-box tensor -> numpy sikli va vektorlashtirilgan extract_detections()
+ni box soniga qarab taqqoslash
+
+Ishlatish:
+    python benchmarks/bench_extraction.py
+    python benchmarks/bench_extraction.py --device cuda --repeats 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Boxes
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from counter import extract_detections
+
+
+def legacy_extract(boxes, count_classes):
+    """Eski usul: har bir box uchun alohida ko'chirish va filtr"""
+    detections = []
+    
+    for box in boxes:
+        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+        confidence = float(box.conf[0])
+        class_id = int(box.cls[0])
+        
+        if class_id in count_classes:
+            detections.append((x1, y1, x2, y2, class_id, confidence))
+    
+    return detections
+
+
+def make_boxes(n, device, seed=0):
+    """n ta tasodifiy box yaratish (COCO klasslari 0-79)"""
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, 1200, size=(n, 2))
+    wh = rng.uniform(10, 80, size=(n, 2))
+    conf = rng.uniform(0.5, 1.0, size=(n, 1))
+    cls = rng.integers(0, 80, size=(n, 1))
+    
+    data = np.hstack([xy, xy + wh, conf, cls]).astype(np.float32)
+    return Boxes(torch.from_numpy(data).to(device), orig_shape=(720, 1280))
+
+
+def time_call(fn, repeats):
+    """O'rtacha chaqiruv vaqti (ms)"""
+    fn()  # isitish
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Detection extraction microbenchmark')
+    parser.add_argument('--device', default='cpu', help='cpu yoki cuda')
+    parser.add_argument('--repeats', type=int, default=200, help='Takrorlashlar soni')
+    parser.add_argument('--counts', type=int, nargs='+',
+                        default=[0, 10, 50, 100, 200, 500],
+                        help='Frame boshiga box soni')
+    args = parser.parse_args()
+    
+    count_classes = config.COUNT_CLASSES
+    class_ids = list(count_classes)
+    
+    print(f"📱 Qurilma: {args.device.upper()}, takrorlash: {args.repeats}")
+    print(f"{'boxes':>6} | {'legacy ms':>10} | {'vector ms':>10} | {'tezlanish':>9}")
+    print("-" * 45)
+    
+    for n in args.counts:
+        boxes = make_boxes(n, args.device)
+        
+        # Natijalar bir xilligini tekshirish
+        legacy = legacy_extract(boxes, count_classes)
+        vector = extract_detections(boxes, class_ids)
+        assert len(legacy) == len(vector)
+        for a, b in zip(legacy, vector):
+            assert np.allclose(a[:4], b[:4]) and a[4] == b[4] and abs(a[5] - b[5]) < 1e-6
+        
+        legacy_ms = time_call(lambda: legacy_extract(boxes, count_classes), args.repeats)
+        vector_ms = time_call(lambda: extract_detections(boxes, class_ids), args.repeats)
+        speedup = legacy_ms / vector_ms if vector_ms else float('inf')
+        
+        print(f"{n:>6} | {legacy_ms:>10.3f} | {vector_ms:>10.3f} | {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Object Counting System - Startup Benchmark
+Qisqa umrli jarayonlar (batch workerlar) uchun ishga tushish narxi:
+`app.py --help`, `import counter`, model yuklash va birinchi sanalgan
+framegacha vaqt. Har bir bosqich yangi Python jarayonida o'lchanadi.
+
+Model fayli bo'lmasa, model yuklash bosqichi o'tkazib yuboriladi, birinchi
+sanalgan frame esa sun'iy manbaning haqiqiy boxlari bilan o'lchanadi.
+
+Ishlatish:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeats 5 --json startup.json
+    python benchmarks/bench_startup.py --video input_videos/test.mp4
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import config
+
+
+# Birinchi sanalgan frameni kutish chegarasi
+MAX_FRAMES = 3000
+
+
+def _child_model(model_path):
+    """Bola jarayon: modelni yuklash"""
+    from counter import ObjectCounter
+    ObjectCounter(model_path=model_path)
+
+
+def _child_first_count(model_path, video):
+    """Bola jarayon: birinchi o'tish sanalguncha framelarni qayta ishlash"""
+    import cv2
+    from counter import ObjectCounter
+    from synthetic import SyntheticVideoSource
+    
+    has_model = model_path is not None and Path(model_path).exists()
+    counter = ObjectCounter(model_path=model_path) if has_model else ObjectCounter(model=object())
+    
+    if video:
+        cap = cv2.VideoCapture(video)
+    else:
+        cap = SyntheticVideoSource(num_objects=20, num_frames=MAX_FRAMES, speed=(6.0, 12.0))
+    
+    for frame_index in range(1, MAX_FRAMES + 1):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        
+        if video and has_model:
+            tracks = counter.analyze_frame(frame, frame_index=frame_index)
+        else:
+            # Sun'iy manba: haqiqiy boxlar (model bo'lsa, birinchi frameda isitiladi)
+            if has_model and frame_index == 1:
+                counter.detect_objects(frame)
+            tracks = counter.analyze_frame(frame, cap.last_detections, frame_index)
+        
+        if sum(counter.stats.values()) > 0:
+            print(f"first_count_frame={frame_index} tracks={len(tracks)}")
+            return
+    
+    raise SystemExit("❌ Sanalgan o'tish topilmadi")
+
+
+def run_stage(command, repeats):
+    """
+    Buyruqni yangi jarayonlarda bir necha marta ishga tushirish
+    
+    Returns:
+        float: Median vaqt (sekund)
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup benchmark')
+    parser.add_argument('--repeats', type=int, default=3, help='Har bir bosqich necha marta')
+    parser.add_argument('--model', default=str(config.MODELS_DIR / config.YOLO_MODEL),
+                        help='Model fayli')
+    parser.add_argument('--video', help='Birinchi sanalgan frame uchun video (default: sun\'iy)')
+    parser.add_argument('--json', help='Natijalarni JSON faylga yozish')
+    parser.add_argument('--child', choices=['model', 'first-count'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child == 'model':
+        _child_model(args.model)
+        return
+    if args.child == 'first-count':
+        _child_first_count(args.model, args.video)
+        return
+    
+    this = [sys.executable, str(Path(__file__).resolve())]
+    has_model = Path(args.model).exists()
+    
+    stages = {
+        'python': [sys.executable, '-c', 'pass'],
+        'app --help': [sys.executable, 'app.py', '--help'],
+        'import counter': [sys.executable, '-c', 'import counter'],
+    }
+    if has_model:
+        stages['model load'] = this + ['--child', 'model', '--model', args.model]
+    
+    first_count = this + ['--child', 'first-count', '--model', args.model]
+    if args.video:
+        first_count += ['--video', args.video]
+    stages['first counted frame'] = first_count
+    
+    if not has_model:
+        print(f"⚠️  Model topilmadi ({args.model}): model yuklash o'tkazib yuboriladi\n")
+    
+    results = {}
+    print(f"{'bosqich':>20} | {'median s':>9}")
+    print("-" * 32)
+    for name, command in stages.items():
+        results[name] = round(run_stage(command, args.repeats), 4)
+        print(f"{name:>20} | {results[name]:>9.3f}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'repeats': args.repeats, 'model': Path(args.model).name if has_model else None,
+                       'video': args.video, 'seconds': results}, f, indent=2)
+        print(f"\n💾 Natija saqlandi: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Object Counting System - Tracker Benchmark
+dict asosidagi ObjectTracker va NumPy massivli ArrayObjectTracker ning
+update() vaqtini 10, 100 va 1000 obyektda taqqoslash
+
+Ishlatish:
+    python benchmarks/bench_tracker.py
+    python benchmarks/bench_tracker.py --objects 10 100 1000 5000 --assignment hungarian
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from utils import ObjectTracker, ArrayObjectTracker
+
+
+SPACING = 3 * config.MAX_DISTANCE  # Obyektlar orasidagi masofa (aralashmasligi uchun)
+MISS_RATE = 0.1  # Har frameda detection yo'qolish ehtimoli
+
+
+def make_frames(num_objects, num_frames, seed=0):
+    """
+    Sintetik detection ketma-ketligi: to'r bo'ylab joylashgan, sekin
+    siljiydigan obyektlar, ba'zi framelarda detection yo'qoladi
+    
+    Returns:
+        list: Har bir frame uchun [(x1, y1, x2, y2, class_id, confidence), ...]
+    """
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(num_objects)))
+    grid = np.stack(np.meshgrid(np.arange(side), np.arange(side)), axis=-1).reshape(-1, 2)
+    positions = grid[:num_objects].astype(np.float64) * SPACING
+    
+    frames = []
+    for _ in range(num_frames):
+        positions += rng.uniform(-3, 3, size=positions.shape)
+        visible = rng.random(num_objects) >= MISS_RATE
+        
+        frames.append([
+            (x, y, x + 40, y + 60, 2, 0.9)
+            for x, y in positions[visible].tolist()
+        ])
+    
+    return frames
+
+
+def time_tracker(tracker_class, frames, assignment):
+    """Bitta frame uchun o'rtacha update() vaqti (ms)"""
+    tracker = tracker_class(max_disappeared=config.MAX_DISAPPEARED,
+                            max_distance=config.MAX_DISTANCE, assignment=assignment)
+    tracker.update(frames[0])  # isitish: barcha obyektlarni ro'yxatga olish
+    
+    start = time.perf_counter()
+    for detections in frames[1:]:
+        tracker.update(detections)
+    return (time.perf_counter() - start) / (len(frames) - 1) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tracker benchmark')
+    parser.add_argument('--objects', type=int, nargs='+', default=[10, 100, 1000],
+                        help='Obyektlar soni')
+    parser.add_argument('--frames', type=int, default=200, help='Framelar soni')
+    parser.add_argument('--assignment', choices=['greedy', 'hungarian'],
+                        default=config.TRACKER_ASSIGNMENT)
+    args = parser.parse_args()
+    
+    print(f"Moslashtirish: {args.assignment}\n")
+    print(f"{'obyektlar':>10} | {'dict ms':>9} | {'array ms':>9} | {'tezlanish':>9}")
+    print("-" * 47)
+    
+    for num_objects in args.objects:
+        frames = make_frames(num_objects, args.frames)
+        
+        dict_ms = time_tracker(ObjectTracker, frames, args.assignment)
+        array_ms = time_tracker(ArrayObjectTracker, frames, args.assignment)
+        
+        print(f"{num_objects:>10} | {dict_ms:>9.3f} | {array_ms:>9.3f} | "
+              f"{dict_ms / array_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Object Counting System - Inference Backend Comparison
+PyTorch, ONNX Runtime va int8 kvantlangan ONNX backendlarini bir xil
+framelarda taqqoslash: tezlik (FPS, ms/frame) va aniqlik (torch natijasiga
+nisbatan IoU >= 0.5 va bir xil klass bo'yicha moslashgan detectionlar).
+
+Framelar: --video dan yoki ultralytics bilan keladigan namuna rasmlar
+(tarmoqsiz). Eksportlar models/ da keshlanadi (model registry orqali).
+
+Ishlatish:
+    python benchmarks/compare_backends.py --model yolo11n.pt
+    python benchmarks/compare_backends.py --video input_videos/test.mp4 --frames 200 --json backends.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from counter import ObjectCounter
+
+
+MATCH_IOU = 0.5
+
+
+def load_frames(video, num_frames):
+    """
+    Taqqoslash uchun framelar
+    
+    Returns:
+        list: BGR framelar
+    """
+    frames = []
+    
+    if video:
+        cap = cv2.VideoCapture(video)
+        while len(frames) < num_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+    else:
+        from ultralytics.utils import ASSETS
+        images = [cv2.imread(str(path)) for path in sorted(ASSETS.glob('*.jpg'))]
+        frames = [images[i % len(images)] for i in range(num_frames)]
+    
+    if not frames:
+        raise ValueError("❌ Taqqoslash uchun frame topilmadi")
+    
+    return frames
+
+
+def iou_matrix(a, b):
+    """Ikki detectionlar to'plami orasidagi IoU matritsasi"""
+    a = np.asarray(a, dtype=np.float64)[:, :4]
+    b = np.asarray(b, dtype=np.float64)[:, :4]
+    
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return intersection / (area_a[:, None] + area_b[None, :] - intersection + 1e-9)
+
+
+def match_counts(reference, candidate):
+    """
+    Frame bo'yicha greedy moslashtirish (IoU kamayish tartibida)
+    
+    Returns:
+        tuple: (moslashganlar soni, ishonch farqlari ro'yxati)
+    """
+    if not reference or not candidate:
+        return 0, []
+    
+    ious = iou_matrix(reference, candidate)
+    same_class = (np.array([d[4] for d in reference])[:, None]
+                  == np.array([d[4] for d in candidate])[None, :])
+    ious = np.where(same_class, ious, 0.0)
+    
+    matched, conf_diffs = 0, []
+    used_rows, used_cols = set(), set()
+    for flat in np.argsort(ious, axis=None)[::-1]:
+        row, col = divmod(int(flat), ious.shape[1])
+        if ious[row, col] < MATCH_IOU:
+            break
+        if row in used_rows or col in used_cols:
+            continue
+        used_rows.add(row)
+        used_cols.add(col)
+        matched += 1
+        conf_diffs.append(abs(reference[row][5] - candidate[col][5]))
+    
+    return matched, conf_diffs
+
+
+def run_backend(backend, model, frames, warmup):
+    """
+    Bitta backend bilan barcha framelarda detection
+    
+    Returns:
+        tuple: (har bir frame detectionlari, o'rtacha ms/frame)
+    """
+    config.INFERENCE_BACKEND = backend
+    counter = ObjectCounter(model_path=model)
+    
+    for frame in frames[:warmup]:
+        counter.detect_objects(frame)
+    
+    detections = []
+    start = time.perf_counter()
+    for frame in frames:
+        detections.append(counter.detect_objects(frame))
+    ms = (time.perf_counter() - start) / len(frames) * 1000
+    
+    return detections, ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inference backend comparison')
+    parser.add_argument('--model', default=config.YOLO_MODEL, help='Asosiy .pt model')
+    parser.add_argument('--video', help='Framelar manbasi (default: ultralytics namuna rasmlari)')
+    parser.add_argument('--frames', type=int, default=50, help='Framelar soni')
+    parser.add_argument('--warmup', type=int, default=3, help='Isitish framelari')
+    parser.add_argument('--backends', nargs='+', default=['torch', 'onnx', 'onnx-int8'],
+                        choices=['torch', 'onnx', 'onnx-int8'])
+    parser.add_argument('--json', help='Natijalarni JSON faylga yozish')
+    args = parser.parse_args()
+    
+    # Adolatli taqqoslash: hammasi CPU da
+    config.USE_GPU = False
+    
+    frames = load_frames(args.video, args.frames)
+    backends = list(dict.fromkeys(['torch'] + args.backends))
+    
+    outputs = {}
+    for backend in backends:
+        outputs[backend] = run_backend(backend, args.model, frames, args.warmup)
+    
+    reference = outputs['torch'][0]
+    reference_total = sum(len(d) for d in reference)
+    
+    print(f"\nModel: {args.model}, framelar: {len(frames)}, CPU\n")
+    print(f"{'backend':>10} | {'ms/frame':>9} | {'FPS':>7} | {'recall':>7} | "
+          f"{'precision':>9} | {'conf diff':>9}")
+    print("-" * 66)
+    
+    results = {}
+    for backend in backends:
+        detections, ms = outputs[backend]
+        matched, conf_diffs = 0, []
+        for ref, cand in zip(reference, detections):
+            frame_matched, frame_diffs = match_counts(ref, cand)
+            matched += frame_matched
+            conf_diffs.extend(frame_diffs)
+        
+        total = sum(len(d) for d in detections)
+        results[backend] = {
+            'ms_per_frame': round(ms, 3),
+            'fps': round(1000 / ms, 2),
+            'detections': total,
+            'recall': round(matched / reference_total, 4) if reference_total else 1.0,
+            'precision': round(matched / total, 4) if total else 1.0,
+            'mean_conf_diff': round(float(np.mean(conf_diffs)), 4) if conf_diffs else 0.0,
+        }
+        
+        r = results[backend]
+        print(f"{backend:>10} | {r['ms_per_frame']:>9.2f} | {r['fps']:>7.1f} | "
+              f"{r['recall']:>7.3f} | {r['precision']:>9.3f} | {r['mean_conf_diff']:>9.4f}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'model': args.model, 'frames': len(frames), 'results': results},
+                      f, indent=2)
+        print(f"\n💾 Natija saqlandi: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Object Counting System - Stride Evaluation
+Sun'iy traektoriyalarda har N-inchi frameni qayta ishlaganda sanash aniqligi:
+oddiy (centroid) va bashoratli (Kalman) tracker taqqoslanadi, eng arzon
+(eng katta) qadamni tanlash uchun
+
+Model yuklanmaydi: sun'iy manbaning haqiqiy boxlari detection sifatida beriladi.
+
+Ishlatish:
+    python benchmarks/eval_stride.py
+    python benchmarks/eval_stride.py --strides 1 2 4 6 8 --speed 5 25 --arrival-rate 0.1
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from counter import ObjectCounter
+
+
+# Nomi: (TRACKER_PREDICTIVE, TRACKER_ASSIGNMENT)
+TRACKERS = {
+    'centroid': (False, 'greedy'),
+    'kalman': (True, 'greedy'),
+    'kalman+hung': (True, 'hungarian'),
+}
+
+
+def generate_sequence(seed, num_frames, speed, arrival_rate=0.3, miss_rate=0.05,
+                      width=1280, height=720):
+    """
+    Sun'iy traektoriyalar: obyektlar tasodifiy paytda yuqori yoki pastki
+    chetdan (ikki tomonlama yo'l kabi) kirib, biroz og'ish va tezlik
+    o'zgarishi bilan kadrni bir marta kesib o'tadi. Detectionlar kichik
+    shovqin bilan, ba'zan tushib qoladi.
+    
+    Args:
+        seed: Tasodifiy generator urug'i
+        num_frames: Framelar soni
+        speed: Vertikal tezlik oralig'i (pixel/frame)
+        arrival_rate: Har frameda yangi obyekt paydo bo'lishi (o'rtacha soni)
+        miss_rate: Detection tushib qolish ehtimoli
+    
+    Returns:
+        tuple: (har bir frame detectionlari, haqiqiy sanoq, frame shakli)
+    """
+    rng = np.random.default_rng(seed)
+    class_ids = list(config.COUNT_CLASSES)
+    line_y = height * config.COUNTING_LINE_POSITION
+    
+    objects = []  # [x, y, vx, vy, w, h, class_id]
+    frames = []
+    crossings = 0
+    
+    for _ in range(num_frames):
+        for _ in range(rng.poisson(arrival_rate)):
+            w, h = rng.uniform(30, 90, size=2)
+            
+            # Ikki tomonlama yo'l: chap yarmida pastga, o'ng yarmida yuqoriga
+            direction = rng.choice([-1.0, 1.0])
+            x = rng.uniform(0, width / 2 - w) + (0 if direction > 0 else width / 2)
+            y = -h if direction > 0 else height
+            objects.append([x, y, rng.normal(0, 0.5),
+                            direction * rng.uniform(*speed), w, h, rng.choice(class_ids)])
+        
+        detections = []
+        alive = []
+        
+        for obj in objects:
+            x, y, vx, vy, w, h, class_id = obj
+            previous_cy = y + h / 2
+            
+            obj[2] = vx + rng.normal(0, 0.2)
+            obj[3] = vy * rng.uniform(0.98, 1.02)
+            obj[0] = x + obj[2]
+            obj[1] = y + obj[3]
+            
+            cy = obj[1] + h / 2
+            if (previous_cy < line_y <= cy) or (previous_cy > line_y >= cy):
+                crossings += 1
+            
+            if obj[1] + h < 0 or obj[1] > height:
+                continue
+            alive.append(obj)
+            
+            if rng.random() < miss_rate:
+                continue
+            
+            jx, jy = rng.normal(0, 1.5, size=2)
+            x1 = max(obj[0] + jx, 0.0)
+            y1 = max(obj[1] + jy, 0.0)
+            x2 = min(obj[0] + w + jx, width)
+            y2 = min(obj[1] + h + jy, height)
+            detections.append((x1, y1, x2, y2, int(class_id), 0.9))
+        
+        objects = alive
+        frames.append(detections)
+    
+    return frames, crossings, (height, width, 3)
+
+
+def count_with_stride(frames, frame_shape, stride, predictive, assignment):
+    """Har stride-inchi frameni tahlil qilib, jami sanoqni qaytarish"""
+    config.TRACKER_PREDICTIVE = predictive
+    config.TRACKER_ASSIGNMENT = assignment
+    counter = ObjectCounter(model=object())
+    
+    # Faqat shape ishlatiladi
+    frame = np.broadcast_to(np.zeros(1, dtype=np.uint8), frame_shape)
+    
+    for frame_index, detections in enumerate(frames, start=1):
+        if frame_index % stride == 0:
+            counter.analyze_frame(frame, detections, frame_index)
+    
+    return sum(counter.stats.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sanash aniqligi va qadam (stride)')
+    parser.add_argument('--strides', type=int, nargs='+', default=[1, 2, 3, 4, 5, 6, 8])
+    parser.add_argument('--speed', type=float, nargs=2, default=[5.0, 15.0],
+                        help='Obyekt tezligi oralig\'i (pixel/frame)')
+    parser.add_argument('--arrival-rate', type=float, default=0.3,
+                        help='Har frameda paydo bo\'ladigan obyektlar (o\'rtacha)')
+    parser.add_argument('--miss-rate', type=float, default=0.05,
+                        help='Detection tushib qolish ehtimoli')
+    parser.add_argument('--frames', type=int, default=3000, help='Har bir ketma-ketlik uzunligi')
+    parser.add_argument('--seeds', type=int, default=3, help='Ketma-ketliklar soni')
+    parser.add_argument('--tolerance', type=float, default=2.0,
+                        help='Ruxsat etilgan sanoq xatosi (%%)')
+    args = parser.parse_args()
+    
+    sequences = [
+        generate_sequence(seed, args.frames, tuple(args.speed),
+                          args.arrival_rate, args.miss_rate)
+        for seed in range(args.seeds)
+    ]
+    truth = sum(crossings for _, crossings, _ in sequences)
+    
+    print(f"Haqiqiy sanoq: {truth} ({args.seeds} ta ketma-ketlik, "
+          f"tezlik {args.speed[0]:g}-{args.speed[1]:g} px/frame)\n")
+    
+    header = f"{'stride':>6} | {'frame %':>7}"
+    for name in TRACKERS:
+        header += f" | {name:>11} | {'xato %':>6}"
+    print(header)
+    print("-" * len(header))
+    
+    cheapest = {}
+    
+    for stride in args.strides:
+        row = f"{stride:>6} | {100.0 / stride:>6.1f}%"
+        
+        for name, (predictive, assignment) in TRACKERS.items():
+            counted = sum(
+                count_with_stride(frames, shape, stride, predictive, assignment)
+                for frames, _, shape in sequences
+            )
+            error = abs(counted - truth) / max(truth, 1) * 100
+            row += f" | {counted:>11} | {error:>6.1f}"
+            
+            if error <= args.tolerance:
+                cheapest[name] = stride
+        
+        print(row)
+    
+    print()
+    for name in TRACKERS:
+        if name in cheapest:
+            print(f"💡 {name}: xato {args.tolerance}% dan oshmaydigan eng katta qadam - "
+                  f"{cheapest[name]} (SKIP_FRAMES = {cheapest[name] - 1})")
+        else:
+            print(f"⚠️  {name}: hech bir qadam {args.tolerance}% aniqlikka yetmadi")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Object Counting System - Soak Test (xotira barqarorligi)
+Sintetik detection oqimi bilan millionlab obyektni sanash chizig'idan
+o'tkazib, tracker va sanagich holati (xotira) o'smasligini tekshirish
+
+Ikkinchi ssenariy - chegaradan ortiq sahna: har frameda MAX_TRACKED_OBJECTS
+dan ko'p harakatsiz obyekt. Kuzatilayotgan obyektlar ID si o'zgarmasligi
+(ortiqcha detectionlar tashlanadi) va holat chegaradan oshmasligi tekshiriladi.
+
+Model yuklanmaydi: detectionlar to'g'ridan-to'g'ri analyze_frame() ga beriladi.
+
+Ishlatish:
+    python benchmarks/soak_state.py
+    python benchmarks/soak_state.py --objects 5000000 --lanes 100 --tolerance-mb 2
+    python benchmarks/soak_state.py --objects 100000 --over-cap-frames 200 --cap 500
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from counter import ObjectCounter
+
+
+FRAME_HEIGHT = 720
+SLOT_WIDTH = 60  # MAX_DISTANCE dan katta - qo'shni ustunlar aralashmaydi
+BOX_SIZE = 40
+
+
+def lane_slots(speed):
+    """
+    Polosadagi ustunlar soni
+    
+    Chiqib ketgan obyekt tracker'da yana MAX_DISAPPEARED frame turadi;
+    keyingi obyekt boshqa ustunda yursa, eski ID bilan moslashmaydi.
+    """
+    travel_frames = FRAME_HEIGHT / speed
+    return int(np.ceil((config.MAX_DISAPPEARED + 1) / travel_frames)) + 1
+
+
+def detection_stream(lanes, speed, num_objects):
+    """
+    Sintetik detection oqimi
+    
+    Har bir polosada bitta obyekt yuqoridan pastga harakatlanadi; frame'dan
+    chiqqach, o'rniga yuqorida (polosaning keyingi ustunida) yangisi paydo
+    bo'ladi va yangi ID oladi.
+    
+    Yields:
+        list: [(x1, y1, x2, y2, class_id, confidence), ...] har bir frame uchun
+    """
+    class_ids = list(config.COUNT_CLASSES)
+    rng = np.random.default_rng(0)
+    slots = lane_slots(speed)
+    
+    # Polosalar fazasi turlicha - obyektlar bir vaqtda chiqmasin
+    y = rng.uniform(0, FRAME_HEIGHT, size=lanes)
+    slot = np.zeros(lanes, dtype=np.int64)
+    classes = rng.choice(class_ids, size=lanes)
+    spawned = lanes
+    
+    while spawned < num_objects:
+        x = (np.arange(lanes) * slots + slot) * SLOT_WIDTH
+        
+        yield [
+            (x1, y1, x1 + BOX_SIZE, y1 + BOX_SIZE, class_id, 0.9)
+            for x1, y1, class_id in zip(x.tolist(), y.tolist(), classes.tolist())
+        ]
+        
+        y += speed
+        exited = y >= FRAME_HEIGHT
+        if exited.any():
+            count = int(exited.sum())
+            y[exited] = 0.0
+            slot[exited] = (slot[exited] + 1) % slots
+            classes[exited] = rng.choice(class_ids, size=count)
+            spawned += count
+
+
+def memory_mb():
+    """
+    Jarayon xotirasi (MB)
+    
+    Unix'da eng yuqori RSS (tracemalloc kabi sekinlashtirmaydi), aks holda
+    tracemalloc bo'yicha Python ajratgan xotira.
+    """
+    if resource is None:
+        return tracemalloc.get_traced_memory()[0] / 1e6
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'da KB, macOS'da bayt
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def over_cap_check(backend, cap, num_frames):
+    """
+    Chegaradan 1.5 barobar ko'p harakatsiz obyekt bilan sahna
+    
+    Returns:
+        tuple: (holat, xatolar ro'yxati)
+    """
+    config.TRACKER_BACKEND = backend
+    config.MAX_TRACKED_OBJECTS = cap
+    counter = ObjectCounter(model=object())
+    
+    num_boxes = cap * 3 // 2
+    columns = int(np.ceil(np.sqrt(num_boxes)))
+    detections = [
+        (float(i % columns * SLOT_WIDTH), float(i // columns * SLOT_WIDTH),
+         float(i % columns * SLOT_WIDTH + BOX_SIZE), float(i // columns * SLOT_WIDTH + BOX_SIZE),
+         2, 0.9)
+        for i in range(num_boxes)
+    ]
+    height = columns * SLOT_WIDTH
+    frame = np.broadcast_to(np.zeros(1, dtype=np.uint8), (height, height, 3))
+    
+    for frame_index in range(1, num_frames + 1):
+        counter.analyze_frame(frame, detections, frame_index)
+    
+    state = counter.state_size()
+    errors = []
+    if state['next_object_id'] != cap:
+        errors.append(f"ID lar almashib turibdi (berilgan: {state['next_object_id']}, chegara {cap})")
+    if max(state['tracked_objects'], state['previous_positions']) > cap:
+        errors.append(f"holat chegaradan oshdi: {state}")
+    
+    return state, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tracker/counter xotira soak testi')
+    parser.add_argument('--objects', type=int, default=1_000_000,
+                        help="Chiziqdan o'tadigan obyektlar soni")
+    parser.add_argument('--lanes', type=int, default=50, help='Bir vaqtdagi obyektlar soni')
+    parser.add_argument('--speed', type=float, default=40.0,
+                        help='Tezlik (pixel/frame, MAX_DISTANCE dan kichik)')
+    parser.add_argument('--checkpoints', type=int, default=10, help="O'lchovlar soni")
+    parser.add_argument('--tolerance-mb', type=float, default=5.0,
+                        help="Isitishdan keyin ruxsat etilgan xotira o'sishi (MB)")
+    parser.add_argument('--over-cap-frames', type=int, default=50,
+                        help="Chegaradan ortiq sahna framelari (0 - o'tkazib yuborish)")
+    parser.add_argument('--cap', type=int, default=config.MAX_TRACKED_OBJECTS or 1000,
+                        help='Chegaradan ortiq sahna uchun MAX_TRACKED_OBJECTS')
+    args = parser.parse_args()
+    
+    cap = args.cap
+    
+    counter = ObjectCounter(model=object())
+    
+    # Faqat shape ishlatiladi - haqiqiy piksellar kerak emas
+    width = args.lanes * lane_slots(args.speed) * SLOT_WIDTH
+    frame = np.broadcast_to(np.zeros(1, dtype=np.uint8), (FRAME_HEIGHT, width, 3))
+    
+    total_frames = int(args.objects / args.lanes * FRAME_HEIGHT / args.speed)
+    frames_per_checkpoint = max(1, total_frames // args.checkpoints)
+    
+    if resource is None:
+        tracemalloc.start()
+    
+    print(f"{'frame':>10} | {'obyektlar':>10} | {'sanalgan':>10} | {'faol':>6} | "
+          f"{'pozitsiya':>9} | {'xotira MB':>9}")
+    print("-" * 70)
+    
+    samples = []
+    start = time.perf_counter()
+    
+    for frame_index, detections in enumerate(
+            detection_stream(args.lanes, args.speed, args.objects), start=1):
+        counter.analyze_frame(frame, detections)
+        
+        if frame_index % frames_per_checkpoint == 0:
+            memory = memory_mb()
+            state = counter.state_size()
+            samples.append((memory, state))
+            
+            print(f"{frame_index:>10} | {state['next_object_id']:>10} | "
+                  f"{sum(counter.stats.values()):>10} | {state['tracked_objects']:>6} | "
+                  f"{state['previous_positions']:>9} | {memory:>9.3f}")
+    
+    elapsed = time.perf_counter() - start
+    
+    # Birinchi o'lchov - isitish (tracker to'lishi, keshlar)
+    baseline_mb = samples[0][0]
+    growth_mb = max(memory for memory, _ in samples) - baseline_mb
+    max_state = max(max(state['tracked_objects'], state['previous_positions'],
+                        state['counted_ids']) for _, state in samples)
+    
+    print(f"\n⏱️  {elapsed:.1f} s, {frame_index / elapsed:.0f} frame/s")
+    print(f"🧠 Xotira o'sishi: {growth_mb:.3f} MB (chegara {args.tolerance_mb} MB), "
+          f"eng katta holat: {max_state} ta yozuv")
+    
+    if growth_mb > args.tolerance_mb:
+        print("❌ Xotira o'smoqda!")
+        sys.exit(1)
+    
+    print("✅ Xotira barqaror")
+    
+    if not args.over_cap_frames:
+        return
+    
+    print(f"\n🧱 Chegaradan ortiq sahna: {cap * 3 // 2} ta obyekt, chegara {cap}, "
+          f"{args.over_cap_frames} frame")
+    failed = False
+    for backend in ('dict', 'array'):
+        state, errors = over_cap_check(backend, cap, args.over_cap_frames)
+        print(f"   {backend:>5}: {state['tracked_objects']} ta faol, "
+              f"{state['previous_positions']} ta pozitsiya, ID berilgan: {state['next_object_id']}")
+        for error in errors:
+            print(f"   ❌ {backend}: {error}")
+        failed = failed or bool(errors)
+    
+    if failed:
+        sys.exit(1)
+    
+    print("✅ Chegara ushlab turildi, ID lar barqaror")
+
+
+if __name__ == "__main__":
+    main()
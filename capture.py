@@ -0,0 +1,243 @@
+"""
+Object Counting System - Video Manbalari
+Kamera uchun "eng yangi frame yutadi" fon o'quvchisi va video fayl uchun
+faqat qayta ishlanadigan framelarni decode qiluvchi o'quvchi
+"""
+
+import threading
+import time
+
+import cv2
+import config
+
+
+class LatestFrameGrabber:
+    """
+    Kamerani fon oqimida doimiy o'qib, faqat eng yangi frameni saqlash
+    
+    Qayta ishlash sekin bo'lsa ham OpenCV ichki buferi to'lmaydi: eski
+    framelar tashlab yuboriladi (`frames_dropped`), shuning uchun kameradan
+    natijagacha kechikish inference tezligidan qat'i nazar chegaralangan.
+    Interfeysi cv2.VideoCapture.read() bilan bir xil.
+    """
+    
+    def __init__(self, cap):
+        """
+        Args:
+            cap: Ochilgan cv2.VideoCapture (yoki read()/release() li obyekt)
+        """
+        self.cap = cap
+        
+        # Ba'zi backendlarda ichki buferni kichraytirish mumkin
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        
+        self._condition = threading.Condition()
+        self._frame = None
+        self._sequence = 0
+        self._read_sequence = 0
+        self._ended = False
+        self._stop = False
+        
+        # Fon oqimi cap.read() dan chiqdimi; chiqmagan bo'lsa, kamerani o'zi yopadi
+        self._exited = False
+        self._release_on_exit = False
+        
+        # Oxirgi read() qaytargan frame olingan vaqt (time.perf_counter)
+        self.frame_timestamp = None
+        
+        # Oxirgi read() qaytargan frame tartib raqami (tashlanganlar ham sanaladi)
+        self.frame_number = 0
+        
+        # Statistika
+        self.frames_grabbed = 0
+        self.frames_dropped = 0
+        
+        self._thread = threading.Thread(target=self._run, name='latest-frame-grabber',
+                                        daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        """Fon oqimi: framelarni to'xtovsiz o'qish"""
+        try:
+            while not self._stop:
+                ret, frame = self.cap.read()
+                timestamp = time.perf_counter()
+                
+                with self._condition:
+                    if not ret:
+                        self._ended = True
+                        self._condition.notify_all()
+                        return
+                    
+                    # Oldingi frame hali o'qilmagan bo'lsa - u tashlab yuboriladi
+                    if self._sequence > self._read_sequence:
+                        self.frames_dropped += 1
+                    
+                    self._frame = (frame, timestamp)
+                    self._sequence += 1
+                    self.frames_grabbed += 1
+                    self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._exited = True
+                release = self._release_on_exit
+            if release:
+                self.cap.release()
+    
+    def isOpened(self):
+        return not self._ended and self.cap.isOpened()
+    
+    def read(self, timeout=5.0):
+        """
+        Eng yangi (hali o'qilmagan) frameni olish
+        
+        Args:
+            timeout: Yangi frame kutish vaqti (sekund)
+        
+        Returns:
+            tuple: (ret, frame)
+        """
+        with self._condition:
+            ready = self._condition.wait_for(
+                lambda: self._sequence > self._read_sequence or self._ended,
+                timeout=timeout
+            )
+            
+            if not ready or self._sequence == self._read_sequence:
+                return False, None
+            
+            frame, self.frame_timestamp = self._frame
+            self._read_sequence = self._sequence
+            self.frame_number = self._sequence
+            
+            return True, frame
+    
+    def get(self, prop):
+        return self.cap.get(prop)
+    
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+    
+    def release(self):
+        """
+        Fon oqimini to'xtatish va kamerani yopish
+        
+        cap.read() davomida kamerani yopish ba'zi backendlarda crash yoki
+        osilib qolishga olib keladi. Oqim kutish vaqtida chiqmasa (sekin
+        RTSP), kamera read() qaytgach fon oqimining o'zida yopiladi.
+        """
+        self._stop = True
+        self._thread.join(timeout=2.0)
+        
+        with self._condition:
+            if not self._exited:
+                self._release_on_exit = True
+                print("⚠️  Kamera o'qish oqimi hali read() ichida - "
+                      "kamera o'qish tugagach yopiladi")
+                return
+        
+        self.cap.release()
+
+
+class FrameReader:
+    """
+    Video fayldan faqat qayta ishlanadigan framelarni to'liq o'qish
+    
+    cap.read() = grab() + retrieve(): o'tkazib yuboriladigan framelar uchun
+    faqat grab() chaqiriladi (BGR ga o'girish va nusxalash yo'q), retrieve()
+    esa scheduler tanlagan framelar uchungina. Keyingi tanlangan framegacha
+    masofa `seek_stride` dan katta bo'lsa, oraliq framelar umuman o'qilmaydi -
+    shu frame vaqtiga seek qilinadi (CAP_PROP_POS_MSEC).
+    
+    Frame raqamlari (1 dan) manbadagi haqiqiy pozitsiya bo'yicha, shuning
+    uchun tracker frame_gap ni to'g'ri oladi.
+    """
+    
+    def __init__(self, cap, scheduler, seek_stride=None):
+        """
+        Args:
+            cap: Ochilgan cv2.VideoCapture (grab()/retrieve() li obyekt)
+            scheduler: Qaysi framelar qayta ishlanishini hal qiluvchi FrameScheduler
+            seek_stride: Shundan katta oraliqlar seek bilan o'tkaziladi
+                (default: config.SEEK_STRIDE, 0 - seek qilinmaydi)
+        """
+        self.cap = cap
+        self.scheduler = scheduler
+        self.seek_stride = config.SEEK_STRIDE if seek_stride is None else seek_stride
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        
+        # Oxirgi grab() qilingan va oxirgi qaytarilgan frame raqamlari
+        self.frame_index = 0
+        self._last_returned = 0
+        self._last_seek = None
+        
+        # Statistika
+        self.frames_grabbed = 0
+        self.frames_retrieved = 0
+        self.seeks = 0
+    
+    def _seek(self, target):
+        """target-inchi frame oldiga vaqt bo'yicha o'tish"""
+        if not self.cap.set(cv2.CAP_PROP_POS_MSEC, (target - 1) * 1000.0 / self.fps):
+            # Manba seek qilolmaydi - grab() bilan davom etiladi
+            self.seek_stride = 0
+            return
+        
+        self.seeks += 1
+        
+        # Backend boshqa pozitsiyaga (masalan, oldingi keyframe'ga) o'tgan bo'lishi
+        # mumkin - frame raqamlari haqiqiy pozitsiyadan davom etadi
+        self.frame_index = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+    
+    def read(self):
+        """
+        Keyingi qayta ishlanadigan frameni o'qish
+        
+        Returns:
+            tuple: (ret, frame_index, frame) - video tugasa ret False
+        """
+        while True:
+            if self.seek_stride and self.fps > 0:
+                target = self.scheduler.next_frame_index(self.frame_index)
+                # Bitta nishonga bir marta: keyframe'ga tushsa, qolgani grab() bilan
+                if target - self.frame_index > self.seek_stride and target != self._last_seek:
+                    self._last_seek = target
+                    self._seek(target)
+            
+            if not self.cap.grab():
+                return False, self.frame_index, None
+            
+            self.frame_index += 1
+            self.frames_grabbed += 1
+            
+            # Seek orqaga tushgan bo'lsa, allaqachon qaytarilgan framelar qayta berilmaydi
+            if self.frame_index <= self._last_returned:
+                continue
+            
+            if self.scheduler.should_process(self.frame_index):
+                ret, frame = self.cap.retrieve()
+                if not ret:
+                    return False, self.frame_index, None
+                
+                self.frames_retrieved += 1
+                self._last_returned = self.frame_index
+                return True, self.frame_index, frame
+    
+    def report(self):
+        """
+        O'qish statistikasi
+        
+        Returns:
+            dict: frames_grabbed, frames_retrieved, seeks
+        """
+        return {
+            'frames_grabbed': self.frames_grabbed,
+            'frames_retrieved': self.frames_retrieved,
+            'seeks': self.seeks,
+        }
+    
+    def get(self, prop):
+        return self.cap.get(prop)
+    
+    def release(self):
+        self.cap.release()
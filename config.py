@@ -3,7 +3,6 @@ Object Counting System - Konfiguratsiya Fayli
 Bu yerda tizimning barcha sozlamalari saqlanadi
 """
 
-import os
 from pathlib import Path
 
 # Asosiy papkalar
@@ -12,15 +11,14 @@ MODELS_DIR = BASE_DIR / "models"
 INPUT_DIR = BASE_DIR / "input_videos"
 OUTPUT_DIR = BASE_DIR / "output_videos"
 
-# Papkalarni yaratish
-MODELS_DIR.mkdir(exist_ok=True)
-INPUT_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
-
 # YOLO Model sozlamalari
 YOLO_MODEL = "yolo11m.pt"  # n=nano (tez), s=small, m=medium, l=large, x=xlarge
 CONFIDENCE_THRESHOLD = 0.5  # Ishonch darajasi (0.0 - 1.0)
 IOU_THRESHOLD = 0.45       # Intersection Over Union threshold
+FILTER_CLASSES_IN_MODEL = True  # COUNT_CLASSES dan boshqa klasslarni NMS'dan oldin tashlash
+MODEL_REGISTRY = MODELS_DIR / "registry.json"  # Modellar indeksi (nomi, yo'li, checksum, variantlari)
+MODEL_OFFLINE = False  # True bo'lsa, model yuklab olinmaydi - faqat MODELS_DIR dagi fayllar
+INFERENCE_BACKEND = "torch"  # "torch", "onnx" (ONNX Runtime, CPU) yoki "onnx-int8" (kvantlangan)
 
 # Sanash uchun obyekt klasslari (COCO dataset klasslari)
 # 0: person, 2: car, 3: motorcycle, 5: bus, 7: truck
@@ -36,6 +34,16 @@ COUNT_CLASSES = {
 # Tracking sozlamalari
 MAX_DISAPPEARED = 50        # Obyekt yo'qolgandan keyin necha frame kutish
 MAX_DISTANCE = 50           # Tracking uchun maksimal masofa (pixel)
+TRACKER_ASSIGNMENT = "greedy"  # "greedy" (tez) yoki "hungarian" (global optimal, zich sahnalar uchun)
+TRACKER_BACKEND = "array"  # "array" (NumPy massivlari, zich sahnalarda chiziqli) yoki "dict" (ObjectTracker)
+MAX_TRACKED_OBJECTS = None  # Bir vaqtda kuzatiladigan obyektlar chegarasi (None - cheksiz; masalan 1000)
+
+# Harakatni bashorat qiluvchi (Kalman) tracking - katta SKIP_FRAMES uchun
+TRACKER_PREDICTIVE = False     # True bo'lsa, moslashtirishdan oldin pozitsiya bashorat qilinadi
+KALMAN_VELOCITY_STD = 10.0     # Yangi obyekt tezligi noaniqligi (pixel/frame)
+KALMAN_PROCESS_NOISE = 1.0     # Tezlanish shovqini (pixel/frame^2)
+KALMAN_MEASUREMENT_NOISE = 4.0  # Detection markazi xatosi (pixel)
+KALMAN_GATE_SIGMA = 3.0        # Noaniq (yangi) obyektlar uchun oraliq, sigma'larda
 
 # Video sozlamalari
 FRAME_WIDTH = 1280
@@ -54,10 +62,75 @@ FONT_SCALE = 0.6
 # Y koordinatasi (0.0 - 1.0, ekranning yuqorisidan necha foizda)
 COUNTING_LINE_POSITION = 0.5  # Ekranning o'rtasida
 
+# ROI (detection faqat sanash chizig'i atrofida)
+# None - butun frame
+# {"mode": "band", "height": 0.3} - chiziq atrofidagi polosa (frame balandligiga nisbatan)
+# {"mode": "polygon", "points": [(0.1, 0.4), (0.9, 0.4), (0.9, 0.7), (0.1, 0.7)]}
+ROI = None
+# Manba bo'yicha ROI (video yo'li, kamera ID yoki URL -> ROI sozlamasi)
+SOURCE_ROI = {}
+ROI_COLOR = (128, 128, 128)  # Kulrang
+
 # Real-time processing sozlamalari
 SKIP_FRAMES = 2  # Har nechinchi frameni qayta ishlash (tezlik uchun)
+SEEK_STRIDE = 0  # Qadam shundan katta bo'lsa, oraliq framelar o'qilmaydi - vaqt bo'yicha seek (0 - o'chirilgan)
 DISPLAY_OUTPUT = True  # Ekranda ko'rsatish
 
+# Adaptive frame skipping (SKIP_FRAMES o'rniga latency budjeti bo'yicha)
+ADAPTIVE_SKIP = False     # True bo'lsa, qadam o'lchangan vaqtga qarab o'zgaradi
+TARGET_FPS = 30           # Ushlab turiladigan kirish FPS (budjet: 1/TARGET_FPS s/frame)
+MIN_STRIDE = 1            # Eng kichik qadam (har bir frame)
+MAX_STRIDE = 10           # Eng katta qadam (bo'sh sahnada)
+NEAR_LINE_MARGIN = 0.15   # Chiziqqa "yaqin" masofa (frame balandligiga nisbatan)
+ADAPTIVE_SMOOTHING = 0.2  # Frame vaqti uchun eksponensial o'rtacha koeffitsienti
+
+# Harakat filtri (statik framelarda YOLO'ni o'tkazib yuborish)
+MOTION_GATING = False         # True bo'lsa, harakatsiz framelarda detection bajarilmaydi
+MOTION_METHOD = "diff"        # "diff" (frame farqi) yoki "mog2" (fon ayirish)
+MOTION_DOWNSCALE_WIDTH = 320  # Tekshirish uchun frame kengligi (pixel)
+MOTION_PIXEL_THRESHOLD = 25   # Piksel o'zgarish chegarasi (0-255, "diff" usuli)
+MOTION_MOG2_VAR_THRESHOLD = 16  # "mog2" usulida Mahalanobis masofasi kvadrati chegarasi (OpenCV default)
+MOTION_MIN_AREA = 0.0005      # Harakat deb hisoblash uchun o'zgargan piksellar ulushi
+MOTION_BACKGROUND_ALPHA = 0.05  # "diff" usulida fonni yangilash tezligi
+MOTION_REFRESH_FRAMES = 30    # Shuncha statik framedan keyin detection majburan bajariladi
+
+# Pipeline rejimi (capture, detection, chizish va yozish alohida oqimlarda)
+PIPELINE_MODE = False  # True bo'lsa, process_video ko'p oqimli ishlaydi
+PIPELINE_QUEUE_SIZE = 8  # Bosqichlar orasidagi navbat hajmi (backpressure)
+
+# Detection keshi (video qayta tahlili uchun: YOLO faqat birinchi marta ishlaydi)
+DETECTION_CACHE = False  # True bo'lsa, detectionlar keshga yoziladi / keshdan o'qiladi
+CACHE_DIR = BASE_DIR / "cache"  # Kesh fayllari papkasi
+
+# Batch inference (offline video uchun)
+BATCH_SIZE = 1  # Bitta forward pass'dagi framelar soni (1 = batch'siz)
+
+# Batch rejimi (ko'p videolarni parallel qayta ishlash)
+BATCH_WORKERS = 4  # Jarayonlar soni (har biri modelni bir marta yuklaydi)
+BATCH_SUMMARY_FILENAME = "batch_summary.csv"
+
+# O'tish hodisalari jurnali (har bir sanalgan o'tish SQLite bazaga yoziladi)
+EVENT_LOG = False  # True bo'lsa, hodisalar EVENT_DB ga yoziladi
+EVENT_DB = OUTPUT_DIR / "crossings.db"
+EVENT_BATCH_SIZE = 500       # Bitta tranzaksiyadagi hodisalar soni
+EVENT_FLUSH_INTERVAL = 1.0   # Batch to'lmasa ham shuncha sekunddan keyin yozish
+EVENT_QUEUE_SIZE = 100000    # Navbat hajmi (to'lsa hodisa tashlanadi, frame sikli kutmaydi)
+
+# Bosqichlar metrikalari (decode/detect/track/count/draw/encode kechikishi)
+METRICS_ENABLED = False   # True bo'lsa, har bir bosqich vaqti o'lchanadi va eksport qilinadi
+METRICS_WINDOW = 1000     # Percentillar (p50/p95/p99) uchun oxirgi o'lchovlar soni
+METRICS_INTERVAL = 10.0   # Fayllarni qayta yozish oralig'i (sekund)
+METRICS_JSON = OUTPUT_DIR / "metrics.json"
+METRICS_PROM = OUTPUT_DIR / "metrics.prom"  # node_exporter textfile collector uchun
+
+# Natija videosini yozish (fon oqimida, FPS = manba FPS / (SKIP_FRAMES + 1))
+VIDEO_WRITER_BACKEND = "opencv"  # "opencv" (cv2.VideoWriter) yoki "ffmpeg" (imageio-ffmpeg pipe)
+VIDEO_FOURCC = "mp4v"            # opencv backend kodeki
+VIDEO_CODEC = "libx264"          # ffmpeg backend kodeki (masalan, libx264, libx265, h264_nvenc)
+VIDEO_CRF = 23                   # ffmpeg sifati (kichik - sifatliroq, kattaroq fayl)
+VIDEO_PRESET = "veryfast"        # ffmpeg tezlik/siqish muvozanati
+VIDEO_WRITER_QUEUE_SIZE = 64     # Navbat hajmi (to'lsa asosiy sikl kutadi)
+
 # Statistika sozlamalari
 SAVE_STATISTICS = True  # Statistikani CSV faylga saqlash
 STATS_FILENAME = "counting_stats.csv"
@@ -68,6 +141,19 @@ DEBUG_MODE = False  # True bo'lsa, ko'proq ma'lumot chiqaradi
 # Kamera sozlamalari (real-time uchun)
 CAMERA_ID = 0  # Default kamera
 CAMERA_RESOLUTION = (1280, 720)
+CAMERA_LATEST_FRAME = True  # Fon oqimida o'qish, faqat eng yangi frameni qayta ishlash
+LATENCY_WINDOW = 1000       # Kechikish statistikasi uchun oxirgi o'lchovlar soni
 
 # Performance sozlamalari
 USE_GPU = True  # GPU mavjud bo'lsa ishlatish
+
+
+def ensure_directories():
+    """
+    Ishchi papkalarni yaratish
+    
+    Import paytida hech narsa yaratilmaydi (config yon ta'sirsiz) - papkalar
+    faqat ularga yoziladigan yo'lda, shu funksiya orqali yaratiladi.
+    """
+    for directory in (MODELS_DIR, INPUT_DIR, OUTPUT_DIR):
+        directory.mkdir(exist_ok=True)
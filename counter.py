@@ -3,12 +3,57 @@ Object Counting System - Asosiy Sanash Logikasi
 Bu modul obyektlarni aniqlash, kuzatish va sanashni amalga oshiradi
 """
 
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
 import cv2
 import numpy as np
-from ultralytics import YOLO
 import config
-from utils import ObjectTracker, draw_counting_line, draw_detection, draw_statistics
-import torch
+from utils import (ObjectTracker, ArrayObjectTracker, KalmanObjectTracker, draw_counting_line,
+                   draw_detection, draw_statistics, draw_roi)
+from pipeline import VideoPipeline, print_queue_report
+from scheduler import FrameScheduler
+from motion import MotionGate
+from roi import crop_roi, offset_detections, roi_rect
+from capture import LatestFrameGrabber, FrameReader
+from detection_cache import DetectionCache
+from events import EventWriter
+from metrics import StageMetrics
+from writer import open_video_writer
+
+
+# Metrikalar o'chirilganda barcha bosqichlar uchun bitta bo'sh context manager
+_NO_TIMING = nullcontext()
+
+
+def extract_detections(boxes, class_ids):
+    """
+    YOLO boxlaridan detectionlarni vektorlashtirilgan holda olish
+    Har bir box uchun alohida .cpu() o'rniga butun tensor bir marta ko'chiriladi
+    
+    Args:
+        boxes: ultralytics Boxes obyekti (data: [x1, y1, x2, y2, (id), conf, cls])
+        class_ids: Sanaladigan klass ID lari (None - barcha klasslar)
+    
+    Returns:
+        list: [(x1, y1, x2, y2, class_id, confidence), ...]
+    """
+    if len(boxes) == 0:
+        return []
+    
+    # Bitta device -> host ko'chirish
+    data = boxes.data.cpu().numpy()
+    
+    # Klass bo'yicha filtr (vektorli mask)
+    if class_ids is not None:
+        mask = np.isin(data[:, -1].astype(np.int64), class_ids)
+        data = data[mask]
+    
+    return [
+        (row[0], row[1], row[2], row[3], int(row[-1]), row[-2])
+        for row in data.tolist()
+    ]
 
 
 class ObjectCounter:
@@ -17,45 +62,171 @@ class ObjectCounter:
     YOLO modelidan foydalanib, obyektlarni aniqlaydi va sanaydi
     """
     
-    def __init__(self, model_path=None, count_classes=None):
+    def __init__(self, model_path=None, count_classes=None, model=None):
         """
         Args:
             model_path: YOLO model fayl yo'li
             count_classes: Sanaladigan klaslar dict {class_id: name}
+            model: Oldindan yuklangan YOLO modeli (bir nechta counter
+                bitta modelni ulashishi uchun). Berilsa, model_path e'tiborsiz
         """
-        # YOLO modelini yuklash
-        if model_path is None:
-            model_path = str(config.MODELS_DIR / config.YOLO_MODEL)
-        
-        print("🔄 YOLO modeli yuklanmoqda...")
-        
-        # GPU/CPU tanlash
-        device = 'cuda' if config.USE_GPU and torch.cuda.is_available() else 'cpu'
-        print(f"📱 Qurilma: {device.upper()}")
+        if model is None:
+            model = self._load_model(model_path)
         
-        self.model = YOLO(model_path)
-        self.model.to(device)
-        
-        print("✅ Model yuklandi!")
+        self.model = model
+        self.model_name = Path(str(model_path or getattr(model, 'ckpt_path', None)
+                                   or config.YOLO_MODEL)).name
         
         # Sanash uchun klasslar
         self.count_classes = count_classes if count_classes else config.COUNT_CLASSES
         
         # Tracker
-        self.tracker = ObjectTracker(
-            max_disappeared=config.MAX_DISAPPEARED,
-            max_distance=config.MAX_DISTANCE
-        )
+        self.tracker = self._create_tracker()
         
         # Sanash statistikasi
         self.counted_ids = set()  # O'tgan obyektlar ID
         self.stats = {name: 0 for name in self.count_classes.values()}
         
-        # Chiziq pozitsiyasi
+        # Chiziq pozitsiyasi (None bo'lsa config.COUNTING_LINE_POSITION)
+        self.line_position = None
         self.line_y = None
         
+        # Detection hududi (None - config.SOURCE_ROI / config.ROI, {} - butun frame)
+        self.roi = None
+        self.source = None
+        
         # Obyektlarning oldingi pozitsiyalari
         self.previous_positions = {}
+        
+        # Oxirgi tahlil qilingan frame raqami (tracker bashorati uchun)
+        self.last_frame_index = None
+        
+        # Oxirgi pipeline ishining navbatlar hisoboti
+        self.pipeline_report = None
+        
+        # Frame tanlash (statik yoki adaptive qadam) va tezlik ko'rsatkichlari
+        self.scheduler = FrameScheduler()
+        self.performance = {}
+        
+        # Kameradan natijagacha kechikish (oxirgi o'lchovlar, sekund)
+        self.capture_latencies = deque(maxlen=config.LATENCY_WINDOW)
+        self.frames_dropped = 0
+        
+        # Statik framelarda detection'ni o'tkazib yuborish (optional)
+        self.motion_gate = MotionGate() if config.MOTION_GATING else None
+        
+        # Detection keshi: yozilayotgan kesh yoki qayta o'ynatiladigan detectionlar
+        self.detection_cache = None
+        self._cached_detections = None
+        self.cache_misses = 0
+        
+        # Har bir o'tish hodisasini bazaga yozish (optional, fon oqimida)
+        self.event_writer = EventWriter() if config.EVENT_LOG else None
+        self.source_fps = None
+        
+        # Bosqichlar kechikishi va eksport (optional, o'chirilganda deyarli tekin)
+        self.metrics = StageMetrics() if config.METRICS_ENABLED else None
+    
+    def timed(self, stage):
+        """Bosqich vaqtini o'lchash (metrikalar o'chirilgan bo'lsa - nullcontext)"""
+        if self.metrics is None:
+            return _NO_TIMING
+        return self.metrics.time(stage)
+    
+    def _create_tracker(self):
+        """Tracker yaratish; obyekt o'chirilganda uning sanash holati ham tozalanadi"""
+        if config.TRACKER_PREDICTIVE:
+            tracker_class = KalmanObjectTracker
+        elif config.TRACKER_BACKEND == "array":
+            tracker_class = ArrayObjectTracker
+        else:
+            tracker_class = ObjectTracker
+        
+        return tracker_class(
+            max_disappeared=config.MAX_DISAPPEARED,
+            max_distance=config.MAX_DISTANCE,
+            assignment=config.TRACKER_ASSIGNMENT,
+            max_objects=config.MAX_TRACKED_OBJECTS,
+            on_deregister=self._forget_object
+        )
+    
+    def _forget_object(self, object_id):
+        """
+        Tracker o'chirgan obyektning holatini tozalash
+        
+        ID qayta ishlatilmaydi, shuning uchun counted_ids dan olib tashlash
+        ikki marta sanashga olib kelmaydi - holat faqat faol obyektlar
+        soniga proporsional bo'lib qoladi (uzoq kamera sessiyalari uchun).
+        """
+        self.previous_positions.pop(object_id, None)
+        self.counted_ids.discard(object_id)
+    
+    def state_size(self):
+        """
+        Sanagich holatining hajmi (xotira monitoringi uchun)
+        
+        Returns:
+            dict: tracked_objects, previous_positions, counted_ids, next_object_id
+        """
+        return {
+            'tracked_objects': len(self.tracker.objects),
+            'previous_positions': len(self.previous_positions),
+            'counted_ids': len(self.counted_ids),
+            'next_object_id': self.tracker.next_object_id,
+        }
+    
+    @staticmethod
+    def _load_model(model_path=None):
+        """
+        YOLO modelini yuklash va qurilmaga ko'chirish (jarayon ichida bir marta)
+        
+        Args:
+            model_path: YOLO model fayl yo'li
+        
+        Returns:
+            YOLO: Yuklangan model
+        """
+        # torch va ultralytics faqat model kerak bo'lganda (sekundlab import vaqti)
+        import torch
+        from model_registry import ModelRegistry, load_model
+        
+        backend = config.INFERENCE_BACKEND
+        
+        # torch bo'lmagan backend uchun eksport qilingan fayl (bir marta yaratiladi)
+        model_path = ModelRegistry().ensure_variant(model_path or config.YOLO_MODEL, backend)
+        
+        print(f"🔄 YOLO modeli yuklanmoqda ({backend}: {Path(model_path).name})...")
+        
+        # GPU/CPU tanlash (ONNX Runtime backendlari CPU da)
+        if backend == 'torch':
+            device = 'cuda' if config.USE_GPU and torch.cuda.is_available() else 'cpu'
+        else:
+            device = 'cpu'
+        print(f"📱 Qurilma: {device.upper()}")
+        
+        # Shu jarayonda allaqachon yuklangan bo'lsa, o'sha model qaytariladi
+        model = load_model(model_path, device)
+        
+        print("✅ Model yuklandi!")
+        
+        return model
+    
+    def get_line_position(self):
+        """Sanash chizig'ining nisbiy pozitsiyasi (0.0 - 1.0)"""
+        if self.line_position is None:
+            return config.COUNTING_LINE_POSITION
+        return self.line_position
+    
+    def get_roi(self):
+        """
+        Joriy manba uchun ROI sozlamasi
+        
+        Returns:
+            dict yoki None: None - butun frame
+        """
+        if self.roi is not None:
+            return self.roi or None
+        return config.SOURCE_ROI.get(str(self.source), config.ROI)
     
     def detect_objects(self, frame):
         """
@@ -67,28 +238,127 @@ class ObjectCounter:
         Returns:
             list: [(x1, y1, x2, y2, class_id, confidence), ...]
         """
-        # YOLO orqali detection
-        results = self.model(frame, conf=config.CONFIDENCE_THRESHOLD, 
-                            iou=config.IOU_THRESHOLD, verbose=False)
+        return self.detect_objects_batch([frame])[0]
+    
+    def detect_objects_batch(self, frames, owners=None, all_classes=False):
+        """
+        Bir nechta frameda obyektlarni bitta forward pass bilan aniqlash
         
-        detections = []
+        Args:
+            frames: Video framelar ro'yxati
+            owners: Har bir frame egasi ObjectCounter (default: self). Motion gate,
+                ROI va chiziq pozitsiyasi shundan olinadi (ko'p oqimli rejim uchun)
+            all_classes: Barcha klasslarni butun framedan aniqlash - motion gate,
+                ROI va klass filtri ishlatilmaydi (detection keshi uchun)
         
-        # Natijalarni qayta ishlash
-        for result in results:
-            boxes = result.boxes
-            
-            for box in boxes:
-                # Koordinatalar va ma'lumotlar
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                confidence = float(box.conf[0])
-                class_id = int(box.cls[0])
-                
-                # Faqat kerakli klasslarni olish
-                if class_id in self.count_classes:
-                    detections.append((x1, y1, x2, y2, class_id, confidence))
+        Returns:
+            list: Har bir frame uchun [(x1, y1, x2, y2, class_id, confidence), ...]
+        """
+        if owners is None:
+            owners = [self] * len(frames)
+        
+        # Harakatsiz framelar modelga berilmaydi va bo'sh natija oladi
+        moving = [
+            all_classes or owner.motion_gate is None or owner.motion_gate.has_motion(frame)
+            for frame, owner in zip(frames, owners)
+        ]
+        
+        detections = [[] for _ in frames]
+        
+        # ROI: modelga faqat kesilgan qism beriladi
+        crops = {}
+        for i, (frame, owner) in enumerate(zip(frames, owners)):
+            if all_classes:
+                crops[i] = (frame, (0, 0))
+            elif moving[i]:
+                crops[i] = crop_roi(frame, owner.get_roi(), owner.get_line_position())
+        
+        if not crops:
+            return detections
+        
+        class_ids = None if all_classes else list(self.count_classes)
+        
+        # Kerakmas klasslarni model ichida (NMS'dan oldin) tashlab yuborish
+        classes = class_ids if config.FILTER_CLASSES_IN_MODEL else None
+        
+        # YOLO orqali detection (butun batch bir marta)
+        results = self.model([crop for crop, _ in crops.values()],
+                             conf=config.CONFIDENCE_THRESHOLD, 
+                             iou=config.IOU_THRESHOLD, classes=classes, verbose=False)
+        
+        for (i, (_, offset)), result in zip(crops.items(), results):
+            detections[i] = offset_detections(
+                extract_detections(result.boxes, class_ids), offset
+            )
         
         return detections
     
+    def _filter_classes(self, detections):
+        """Faqat sanaladigan klasslar detectionlarini qoldirish"""
+        return [det for det in detections if det[4] in self.count_classes]
+    
+    def detect_batch(self, batch):
+        """
+        Framelar batchi uchun detectionlar: keshdan, yoki model orqali
+        (detection keshi yozilayotgan bo'lsa, barcha klasslar keshga qo'shiladi)
+        
+        Args:
+            batch: [(frame_index, frame), ...]
+        
+        Returns:
+            list: Har bir frame uchun [(x1, y1, x2, y2, class_id, confidence), ...]
+        """
+        if self.metrics is None:
+            return self._detect_batch(batch)
+        
+        # Batch vaqti framelarga teng bo'linadi (percentillar frame bo'yicha)
+        start = time.perf_counter()
+        detections_batch = self._detect_batch(batch)
+        per_frame = (time.perf_counter() - start) / len(batch)
+        for _ in batch:
+            self.metrics.observe('detect', per_frame)
+        
+        return detections_batch
+    
+    def _detect_batch(self, batch):
+        """detect_batch() ning o'zi (vaqt o'lchovisiz)"""
+        if self._cached_detections is not None:
+            return self._cached_batch(batch)
+        
+        frames = [frame for _, frame in batch]
+        
+        if self.detection_cache is None:
+            return self.detect_objects_batch(frames)
+        
+        detections_batch = self.detect_objects_batch(frames, all_classes=True)
+        for (frame_index, _), detections in zip(batch, detections_batch):
+            self.detection_cache.add(frame_index, detections)
+        
+        return [self._filter_classes(detections) for detections in detections_batch]
+    
+    def _cached_batch(self, batch):
+        """
+        Keshdagi detectionlar; keshda yo'q framelar (masalan, adaptive qadam
+        boshqa framelarni tanlasa) "detection yo'q" deb olinmaydi - model
+        orqali aniqlanadi
+        """
+        missing = [(i, frame) for i, (frame_index, frame) in enumerate(batch)
+                   if frame_index not in self._cached_detections]
+        
+        detections_batch = [self._cached_detections.get(frame_index)
+                            for frame_index, _ in batch]
+        
+        if missing:
+            if not self.cache_misses:
+                print("⚠️  Ba'zi framelar keshda yo'q - ular model orqali aniqlanadi")
+            self.cache_misses += len(missing)
+            detected = self.detect_objects_batch([frame for _, frame in missing],
+                                                 all_classes=True)
+            for (i, _), detections in zip(missing, detected):
+                detections_batch[i] = detections
+        
+        return [self._filter_classes(detections) for detections in detections_batch]
+    
     def check_line_crossing(self, object_id, current_centroid):
         """
         Obyekt chiziqdan o'tdimi yoki yo'qligini tekshirish
@@ -98,7 +368,8 @@ class ObjectCounter:
             current_centroid: Joriy centroid (cx, cy)
         
         Returns:
-            bool: O'tgan bo'lsa True
+            str yoki False: O'tgan bo'lsa yo'nalish - "down" (yuqoridan pastga)
+                yoki "up", aks holda False
         """
         if self.line_y is None:
             return False
@@ -111,66 +382,147 @@ class ObjectCounter:
             
             # Yuqoridan pastga o'tdi
             if prev_cy < self.line_y <= cy:
-                return True
+                return "down"
             # Pastdan yuqoriga o'tdi
             elif prev_cy > self.line_y >= cy:
-                return True
+                return "up"
         
         # Pozitsiyani yangilash
         self.previous_positions[object_id] = cy
         
         return False
     
-    def process_frame(self, frame):
+    def analyze_frame(self, frame, detections=None, frame_index=None):
         """
-        Bitta frameni qayta ishlash
+        Frameni tahlil qilish: detection, tracking va sanash (chizishsiz)
         
         Args:
             frame: Video frame
+            detections: Oldindan hisoblangan detectionlar (masalan, batch'dan).
+                None bo'lsa, detect_objects() chaqiriladi
+            frame_index: Manbadagi frame raqami. Oldingi tahlildan beri
+                o'tgan framelar sonini bilish uchun (None - joriy qadam)
         
         Returns:
-            frame: Qayta ishlangan frame
+            list: [(object_id, class_name, bbox, confidence), ...]
         """
-        # Sanash chizig'ini chizish
-        frame, self.line_y = draw_counting_line(frame, config.COUNTING_LINE_POSITION)
-        
         # Obyektlarni aniqlash
-        detections = self.detect_objects(frame)
+        if detections is None:
+            with self.timed('detect'):
+                detections = self.detect_objects(frame)
+        
+        return self.analyze_detections(detections, frame.shape[0], frame_index)
+    
+    def analyze_detections(self, detections, frame_height, frame_index=None):
+        """
+        Tayyor detectionlar bo'yicha tracking va sanash (frame kerak emas)
+        
+        Args:
+            detections: [(x1, y1, x2, y2, class_id, confidence), ...]
+            frame_height: Frame balandligi (sanash chizig'i uchun)
+            frame_index: Manbadagi frame raqami (analyze_frame() ga qarang)
+        
+        Returns:
+            list: [(object_id, class_name, bbox, confidence), ...]
+        """
+        # Sanash chizig'i pozitsiyasi
+        self.line_y = int(frame_height * self.get_line_position())
+        
+        # O'tkazib yuborilgan framelar (bashorat qiluvchi tracker uchun)
+        if frame_index is not None and self.last_frame_index is not None:
+            frame_gap = frame_index - self.last_frame_index
+        else:
+            frame_gap = self.scheduler.stride
+        self.last_frame_index = frame_index
         
         # Tracking va yangilash
-        tracked_objects = self.tracker.update(detections)
+        with self.timed('track'):
+            tracked_objects = self.tracker.update(detections, frame_gap=frame_gap)
         
-        # Har bir kuzatilayotgan obyekt uchun
-        for object_id, (centroid, class_id, bbox) in tracked_objects.items():
-            class_name = self.count_classes[class_id]
-            
-            # Chiziqdan o'tishni tekshirish
-            if self.check_line_crossing(object_id, centroid):
-                # Agar bu obyekt avval sanalmagan bo'lsa
-                if object_id not in self.counted_ids:
-                    self.stats[class_name] += 1
-                    self.counted_ids.add(object_id)
-                    
-                    if config.DEBUG_MODE:
-                        print(f"✅ Sanalgan: {class_name} (ID: {object_id})")
-            
-            # Detection ma'lumotlarini topish
+        tracks = []
+        
+        with self.timed('count'):
+            # Tracker bbox sifatida det[:4] ni qaytaradi - ishonch O(1) da topiladi
+            # (bir xil box bir necha marta bo'lsa, birinchisi olinadi)
+            confidences = {}
             for det in detections:
-                if det[:4] == bbox:
-                    confidence = det[5]
-                    break
-            else:
-                confidence = 0.0
+                confidences.setdefault(det[:4], det[5])
             
-            # Chizish
-            draw_detection(frame, bbox, object_id, class_name, confidence)
+            # Har bir kuzatilayotgan obyekt uchun
+            for object_id, (centroid, class_id, bbox) in tracked_objects.items():
+                class_name = self.count_classes[class_id]
+                
+                # Chiziqdan o'tishni tekshirish
+                direction = self.check_line_crossing(object_id, centroid)
+                if direction:
+                    # Agar bu obyekt avval sanalmagan bo'lsa
+                    if object_id not in self.counted_ids:
+                        self.stats[class_name] += 1
+                        self.counted_ids.add(object_id)
+                        
+                        if self.event_writer is not None:
+                            self.event_writer.log(time.time(), frame_index, object_id,
+                                                  class_name, direction, self.source,
+                                                  video_offset=self._video_offset(frame_index))
+                        
+                        if config.DEBUG_MODE:
+                            print(f"✅ Sanalgan: {class_name} (ID: {object_id})")
+                
+                tracks.append((object_id, class_name, bbox, confidences.get(bbox, 0.0)))
+        
+        if self.metrics is not None:
+            self.metrics.frame_done(len(tracked_objects))
+        
+        return tracks
+    
+    def _video_offset(self, frame_index):
+        """Video faylda hodisaning video boshidan vaqti (sekund), jonli manbada None"""
+        if self.source_fps and frame_index is not None:
+            return frame_index / self.source_fps
+        return None
+    
+    def render_frame(self, frame, tracks, stats=None):
+        """
+        Tahlil natijalarini framega chizish
+        
+        Args:
+            frame: Video frame
+            tracks: analyze_frame() natijasi
+            stats: Ko'rsatiladigan statistika (default: joriy self.stats)
         
-        # Statistikani ko'rsatish
-        frame = draw_statistics(frame, self.stats)
+        Returns:
+            frame: Chizilgan frame
+        """
+        with self.timed('draw'):
+            # Sanash chizig'ini va ROI ni chizish
+            frame, _ = draw_counting_line(frame, self.get_line_position())
+            
+            roi = self.get_roi()
+            if roi:
+                draw_roi(frame, roi_rect(roi, frame.shape, self.get_line_position()))
+            
+            for object_id, class_name, bbox, confidence in tracks:
+                draw_detection(frame, bbox, object_id, class_name, confidence)
+            
+            # Statistikani ko'rsatish
+            frame = draw_statistics(frame, self.stats if stats is None else stats)
         
         return frame
     
-    def process_video(self, video_path, output_path=None, display=True):
+    def process_frame(self, frame):
+        """
+        Bitta frameni qayta ishlash
+        
+        Args:
+            frame: Video frame
+        
+        Returns:
+            frame: Qayta ishlangan frame
+        """
+        tracks = self.analyze_frame(frame)
+        return self.render_frame(frame, tracks)
+    
+    def process_video(self, video_path, output_path=None, display=True, pipelined=None):
         """
         Videoni to'liq qayta ishlash
         
@@ -178,11 +530,16 @@ class ObjectCounter:
             video_path: Kirish video fayli
             output_path: Chiqish video fayli (optional)
             display: Ekranda ko'rsatish
+            pipelined: Ko'p oqimli pipeline rejimi (default: config.PIPELINE_MODE)
         
         Returns:
             dict: Yakuniy statistika
         """
         print(f"\n🎥 Video ishlanmoqda: {video_path}")
+        self.source = video_path
+        if self.metrics is not None:
+            self.metrics.source = video_path
+        self.last_frame_index = None
         
         # Video ochish
         cap = cv2.VideoCapture(video_path)
@@ -190,76 +547,250 @@ class ObjectCounter:
         if not cap.isOpened():
             raise ValueError(f"❌ Video ochilmadi: {video_path}")
         
+        # Detection keshi: mavjud bo'lsa YOLO ishlatilmaydi, bo'lmasa yoziladi
+        self.detection_cache = None
+        self.cache_misses = 0
+        cache = None
+        if config.DETECTION_CACHE:
+            # Kesh butun framedan yoziladi - ROI/motion gate bilan sanoq keshsiz
+            # ishdan farq qilardi
+            if self.get_roi() is not None or self.motion_gate is not None:
+                print("⚠️  Detection keshi ROI va motion gate bilan ishlamaydi - "
+                      "kesh o'chirildi")
+            else:
+                cache = DetectionCache(video_path, self.model_name,
+                                       stride=config.SKIP_FRAMES + 1)
+            
+            # Headless: video umuman decode qilinmaydi
+            if cache is not None and cache.exists() and not display and not output_path:
+                cap.release()
+                self._replay_cached(cache)
+                return self.stats
+        
         # Video ma'lumotlari
         fps = int(cap.get(cv2.CAP_PROP_FPS))
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.source_fps = cap.get(cv2.CAP_PROP_FPS) or None
         
         print(f"📊 FPS: {fps}, Razmer: {width}x{height}, Framelar: {total_frames}")
         
-        # Video yozuvchi
+        # Video yozuvchi (fon oqimida; FPS - qayta ishlangan framelar tezligi)
         out = None
         if output_path:
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-            print(f"💾 Natija saqlanadi: {output_path}")
+            out = open_video_writer(output_path, self.source_fps or fps, (width, height),
+                                    step=config.SKIP_FRAMES + 1, metrics=self.metrics)
+            print(f"💾 Natija saqlanadi: {output_path} ({out.backend_name}, {out.fps:.2f} FPS)")
+        
+        if pipelined is None:
+            pipelined = config.PIPELINE_MODE
+        
+        self.scheduler = FrameScheduler(base_stride=config.SKIP_FRAMES + 1)
+        
+        # O'tkazib yuboriladigan framelar decode qilinmaydi (grab/retrieve, seek)
+        reader = FrameReader(cap, self.scheduler)
+        
+        if cache is not None and cache.exists():
+            print(f"⚡ Detectionlar keshdan olinadi: {cache.path}")
+            self._cached_detections = dict(cache.load()[1])
+        elif cache is not None:
+            print(f"📝 Detection keshi yoziladi: {cache.path}")
+            self.detection_cache = cache
+        
+        # Headless: ko'rsatish ham, yozish ham yo'q - frame chizilmaydi va nusxalanmaydi
+        if not display and out is None:
+            print("🕶️  Headless rejim: faqat sanash, chizishsiz")
+        
+        if pipelined:
+            print(f"🧵 Pipeline rejimi (navbat hajmi: {config.PIPELINE_QUEUE_SIZE})")
+            pipeline = VideoPipeline(self, render=display or out is not None)
+            try:
+                pipeline.run(reader, out, display, total_frames)
+            finally:
+                reader.release()
+                if out:
+                    out.release()
+                if display:
+                    cv2.destroyAllWindows()
+                self._cached_detections = None
+            
+            completed = pipeline.completed
+            self.pipeline_report = pipeline.queue_report()
+            print_queue_report(self.pipeline_report)
+        else:
+            try:
+                completed = self._process_video_sequential(reader, out, display, total_frames)
+            finally:
+                self._cached_detections = None
+        
+        # Kesh faqat video oxirigacha qayta ishlangan bo'lsa saqlanadi
+        if self.detection_cache is not None:
+            if completed:
+                self.detection_cache.save(fps=fps, width=width, height=height,
+                                          total_frames=total_frames)
+            self.detection_cache = None
+        
+        self._collect_performance()
+        self.performance['reader'] = reader.report()
+        if out is not None:
+            self.performance['writer'] = out.report()
+        
+        if self.event_writer is not None:
+            self.event_writer.flush()
         
-        frame_count = 0
+        print("\n✅ Video qayta ishlash tugadi!")
+        self._print_summary()
+        
+        return self.stats
+    
+    def _process_video_sequential(self, reader, out, display, total_frames):
+        """
+        Videoni bitta oqimda ketma-ket qayta ishlash
+        
+        Args:
+            reader: FrameReader (faqat qayta ishlanadigan framelarni qaytaradi)
+        
+        Returns:
+            bool: Video oxirigacha qayta ishlangan bo'lsa True ('q' bosilmagan)
+        """
+        batch_size = max(1, config.BATCH_SIZE)
+        batch = []
+        completed = False
+        last_progress = 0
         
         try:
             while True:
-                ret, frame = cap.read()
+                # O'tkazib yuborilgan framelarning grab() vaqti ham shu bosqichda
+                with self.timed('decode'):
+                    ret, frame_index, frame = reader.read()
                 
-                if not ret:
-                    break
+                if ret:
+                    batch.append((frame_index, frame))
                 
-                frame_count += 1
+                # Batch to'lganda (yoki video tugaganda) qayta ishlash
+                if batch and (len(batch) >= batch_size or not ret):
+                    if not self._process_batch(batch, out, display):
+                        break
+                    batch = []
                 
-                # Har bir frameni qayta ishlash (yoki skip qilish)
-                if frame_count % (config.SKIP_FRAMES + 1) == 0:
-                    processed_frame = self.process_frame(frame)
-                    
-                    # Video yozish
-                    if out:
-                        out.write(processed_frame)
-                    
-                    # Ekranda ko'rsatish
-                    if display:
-                        cv2.imshow('Object Counting System', processed_frame)
-                        
-                        # 'q' bosilsa to'xtatish
-                        if cv2.waitKey(1) & 0xFF == ord('q'):
-                            print("\n⏹️  Foydalanuvchi to'xtatdi")
-                            break
+                if not ret:
+                    completed = True
+                    break
                 
                 # Progress
-                if frame_count % 30 == 0:
-                    progress = (frame_count / total_frames) * 100
-                    print(f"⏳ Jarayon: {progress:.1f}% ({frame_count}/{total_frames})")
+                if total_frames and frame_index // 30 > last_progress:
+                    last_progress = frame_index // 30
+                    progress = (frame_index / total_frames) * 100
+                    print(f"⏳ Jarayon: {progress:.1f}% ({frame_index}/{total_frames})"
+                          f" | stride: {self.scheduler.stride}")
         
         finally:
             # Resurslarni bo'shatish
-            cap.release()
+            reader.release()
             if out:
                 out.release()
-            cv2.destroyAllWindows()
+            if display:
+                cv2.destroyAllWindows()
         
-        print("\n✅ Video qayta ishlash tugadi!")
-        print("\n📈 YAKUNIY STATISTIKA:")
-        for class_name, count in self.stats.items():
-            print(f"   {class_name}: {count}")
+        return completed
+    
+    def _replay_cached(self, cache):
+        """
+        Keshlangan detectionlarni video va YOLO'siz tracker va sanagichga berish
         
-        return self.stats
+        Args:
+            cache: Mavjud DetectionCache
+        """
+        meta, entries = cache.load()
+        height = meta['height']
+        self.source_fps = meta['fps'] or None
+        
+        print(f"⚡ Detection keshidan qayta o'ynatish: {cache.path} "
+              f"({len(entries)} frame, YOLO'siz)")
+        
+        self.scheduler = FrameScheduler(base_stride=config.SKIP_FRAMES + 1)
+        
+        for frame_index, detections in entries:
+            self.scheduler.should_process(frame_index)
+            
+            start = time.perf_counter()
+            tracks = self.analyze_detections(self._filter_classes(detections),
+                                             height, frame_index)
+            self.scheduler.update(time.perf_counter() - start, tracks, self.line_y, height)
+        
+        self._collect_performance()
+        
+        if self.event_writer is not None:
+            self.event_writer.flush()
+        
+        print("\n✅ Keshdan qayta o'ynatish tugadi!")
+        self._print_summary()
+    
+    def _process_batch(self, batch, out, display):
+        """
+        Framelar batchini qayta ishlash
+        Detection bitta forward pass'da, tracking va sanash esa ketma-ket
+        
+        Args:
+            batch: [(frame_index, frame), ...] - qayta ishlanadigan framelar (tartib bo'yicha)
+            out: AsyncVideoWriter yoki None
+            display: Ekranda ko'rsatish
+        
+        Returns:
+            bool: Davom etish kerakmi ('q' bosilsa False)
+        """
+        start = time.perf_counter()
+        detections_batch = self.detect_batch(batch)
+        detect_time = (time.perf_counter() - start) / len(batch)
+        
+        render = display or out is not None
+        
+        for (frame_index, frame), detections in zip(batch, detections_batch):
+            frame_start = time.perf_counter()
+            tracks = self.analyze_frame(frame, detections, frame_index)
+            
+            # Qadamni o'lchangan vaqt va sahna holatiga moslash
+            frame_time = detect_time + time.perf_counter() - frame_start
+            self.scheduler.update(frame_time, tracks, self.line_y, frame.shape[0])
+            
+            # Headless rejimda chizish umuman bajarilmaydi
+            if not render:
+                continue
+            
+            processed_frame = self.render_frame(frame, tracks)
+            
+            # Video yozish (kodlash fon oqimida; bu yerda navbat kutilishi o'lchanadi)
+            if out:
+                with self.timed('write'):
+                    out.write(processed_frame, frame_index)
+            
+            # Ekranda ko'rsatish
+            if display:
+                with self.timed('display'):
+                    cv2.imshow('Object Counting System', processed_frame)
+                    key = cv2.waitKey(1) & 0xFF
+                
+                # 'q' bosilsa to'xtatish
+                if key == ord('q'):
+                    print("\n⏹️  Foydalanuvchi to'xtatdi")
+                    return False
+        
+        return True
     
-    def process_camera(self, camera_id=0):
+    def process_camera(self, camera_id=0, display=True):
         """
         Real-time kamera oqimini qayta ishlash
         
         Args:
             camera_id: Kamera ID (default 0)
+            display: Ekranda ko'rsatish (False - headless, faqat sanash; Ctrl+C bilan to'xtatiladi)
         """
         print(f"\n📹 Kamera ishga tushmoqda (ID: {camera_id})...")
+        self.source = camera_id
+        self.source_fps = None
+        if self.metrics is not None:
+            self.metrics.source = camera_id
         
         cap = cv2.VideoCapture(camera_id)
         
@@ -270,39 +801,165 @@ class ObjectCounter:
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_RESOLUTION[0])
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_RESOLUTION[1])
         
+        # Fon oqimi eski framelarni tashlab, faqat eng yangisini beradi
+        grabber = None
+        if config.CAMERA_LATEST_FRAME:
+            grabber = LatestFrameGrabber(cap)
+            cap = grabber
+        
         print("✅ Kamera tayyor!")
-        print("💡 Chiqish uchun 'q' tugmasini bosing")
+        if display:
+            print("💡 Chiqish uchun 'q' tugmasini bosing")
+        else:
+            print("🕶️  Headless rejim: faqat sanash (to'xtatish: Ctrl+C)")
+        
+        # Statik rejimda har bir frame, adaptive rejimda budjetga qarab
+        self.scheduler = FrameScheduler(base_stride=1)
+        self.last_frame_index = None
+        self.capture_latencies.clear()
+        frame_count = 0
         
         try:
             while True:
-                ret, frame = cap.read()
+                with self.timed('decode'):
+                    ret, frame = cap.read()
                 
                 if not ret:
                     print("❌ Frame o'qilmadi")
                     break
                 
-                # Frame qayta ishlash
-                processed_frame = self.process_frame(frame)
+                captured_at = grabber.frame_timestamp if grabber else time.perf_counter()
+                
+                frame_count += 1
+                if not self.scheduler.should_process(frame_count):
+                    continue
+                
+                # Frame qayta ishlash (fon oqimi tashlagan framelar ham hisobga olinadi)
+                start = time.perf_counter()
+                frame_index = grabber.frame_number if grabber else frame_count
+                if grabber is not None and self.metrics is not None:
+                    self.metrics.frames_dropped = grabber.frames_dropped
+                tracks = self.analyze_frame(frame, frame_index=frame_index)
+                
+                # Kameradan sanash natijasigacha kechikish
+                self.capture_latencies.append(time.perf_counter() - captured_at)
+                
+                if not display:
+                    self.scheduler.update(time.perf_counter() - start, tracks,
+                                          self.line_y, frame.shape[0])
+                    continue
+                
+                processed_frame = self.render_frame(frame, tracks)
+                self.scheduler.update(time.perf_counter() - start, tracks,
+                                      self.line_y, frame.shape[0])
                 
                 # Ko'rsatish
-                cv2.imshow('Object Counting System - Camera', processed_frame)
+                with self.timed('display'):
+                    cv2.imshow('Object Counting System - Camera', processed_frame)
+                    key = cv2.waitKey(1) & 0xFF
                 
                 # 'q' bosilsa to'xtatish
-                if cv2.waitKey(1) & 0xFF == ord('q'):
+                if key == ord('q'):
                     break
         
         finally:
             cap.release()
-            cv2.destroyAllWindows()
+            if display:
+                cv2.destroyAllWindows()
+        
+        self.frames_dropped = grabber.frames_dropped if grabber else 0
+        self._collect_performance()
+        
+        if self.event_writer is not None:
+            self.event_writer.flush()
         
         print("\n✅ Kamera to'xtatildi!")
+        self._print_summary()
+    
+    def _collect_performance(self):
+        """Scheduler va motion gate ko'rsatkichlarini self.performance ga yig'ish"""
+        self.performance = self.scheduler.report()
+        
+        if self.motion_gate is not None:
+            self.performance['gated_ratio'] = round(self.motion_gate.gated_ratio, 3)
+        
+        if self.cache_misses:
+            self.performance['cache_misses'] = self.cache_misses
+        
+        if self.capture_latencies:
+            latencies = np.array(self.capture_latencies) * 1000
+            self.performance['capture_latency_ms'] = {
+                'p50': round(float(np.percentile(latencies, 50)), 2),
+                'p95': round(float(np.percentile(latencies, 95)), 2),
+                'max': round(float(latencies.max()), 2),
+            }
+            self.performance['dropped_frames'] = self.frames_dropped
+        
+        self.performance['state'] = self.state_size()
+        
+        if self.metrics is not None:
+            self.metrics.frames_dropped = self.frames_dropped
+            self.metrics.export()
+            self.performance['stages'] = self.metrics.snapshot()['stages']
+    
+    def _print_summary(self):
+        """Yakuniy statistika va tezlik ko'rsatkichlarini chiqarish"""
         print("\n📈 YAKUNIY STATISTIKA:")
         for class_name, count in self.stats.items():
             print(f"   {class_name}: {count}")
+        
+        if self.performance:
+            perf = self.performance
+            print(f"\n⚙️  Stride: {perf['stride']}, kechikish: {perf['latency_ms']} ms, "
+                  f"FPS: {perf['input_fps']} (kirish) / {perf['processed_fps']} (qayta ishlangan)")
+            
+            if 'reader' in perf:
+                reader = perf['reader']
+                print(f"🎞️  Decode: {reader['frames_retrieved']} ta frame to'liq o'qildi, "
+                      f"{reader['frames_grabbed'] - reader['frames_retrieved']} ta faqat grab(), "
+                      f"seek: {reader['seeks']}")
+            
+            if 'writer' in perf:
+                writer = perf['writer']
+                print(f"💾 Yozuvchi: {writer['backend']}, {writer['fps']} FPS, "
+                      f"{writer['frames_written']} frame "
+                      f"(takrorlangan: {writer['frames_duplicated']}, "
+                      f"navbat max: {writer['max_queue_depth']})")
+            
+            if 'gated_ratio' in perf:
+                print(f"🌙 Harakatsiz (YOLO'siz) framelar: {perf['gated_ratio'] * 100:.1f}%")
+            
+            if 'capture_latency_ms' in perf:
+                latency = perf['capture_latency_ms']
+                print(f"⏱️  Kameradan natijagacha: p50 {latency['p50']} ms, "
+                      f"p95 {latency['p95']} ms, max {latency['max']} ms, "
+                      f"tashlangan framelar: {perf['dropped_frames']}")
+            
+            if 'state' in perf:
+                state = perf['state']
+                print(f"🧠 Holat: {state['tracked_objects']} ta faol obyekt, "
+                      f"{state['previous_positions']} ta pozitsiya, "
+                      f"{state['counted_ids']} ta sanalgan ID "
+                      f"(jami ID berilgan: {state['next_object_id']})")
+            
+            if perf.get('stages'):
+                print("⏱️  Bosqichlar (ms): " + ", ".join(
+                    f"{stage} p50 {s['p50']} / p95 {s['p95']} / p99 {s['p99']}"
+                    for stage, s in perf['stages'].items()))
     
     def reset_counter(self):
-        """Sanagichni qayta tiklash"""
+        """Sanagichni (va tracker holatini) qayta tiklash"""
+        self.tracker = self._create_tracker()
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
         self.counted_ids.clear()
         self.stats = {name: 0 for name in self.count_classes.values()}
         self.previous_positions.clear()
+        self.last_frame_index = None
         print("🔄 Sanagich qayta tiklandi")
+    
+    def close(self):
+        """Fon resurslarini yopish (navbatdagi o'tish hodisalari yoziladi)"""
+        if self.event_writer is not None:
+            self.event_writer.close()
+            self.event_writer = None
@@ -0,0 +1,151 @@
+"""
+Object Counting System - Detection Keshi
+Har bir qayta ishlangan frame detectionlarini diskka saqlash va keyingi
+ishga tushirishlarda YOLO'siz qayta o'ynatish (replay).
+
+Kesh kaliti: video mazmuni xeshi, model nomi va backendi, confidence va IoU
+thresholdlari, frame qadami va rejalashtirish rejimi (fixed/adaptive -
+ular turli framelarni qayta ishlaydi). Detectionlar barcha klasslar uchun,
+butun framedan saqlanadi, shuning uchun COUNTING_LINE_POSITION,
+MAX_DISTANCE yoki COUNT_CLASSES o'zgarganda kesh qayta ishlatiladi.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import config
+
+
+# Kesh formati versiyasi (format o'zgarsa eski fayllar ishlatilmaydi)
+CACHE_VERSION = 1
+
+# Video xeshi uchun o'qish bloki
+_HASH_CHUNK = 1 << 20
+
+
+def video_hash(video_path):
+    """
+    Video fayl mazmuni xeshi (fayl nomi yoki joyiga bog'liq emas)
+    
+    Args:
+        video_path: Video fayl yo'li
+    
+    Returns:
+        str: SHA-1 hex
+    """
+    digest = hashlib.sha1()
+    with open(video_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DetectionCache:
+    """
+    Bitta video va detection sozlamalari uchun kesh fayli
+    
+    Fayl - siqilgan .npz: `frames` (qayta ishlangan frame raqamlari),
+    `offsets` (har bir frame detectionlarining `boxes` dagi boshlanishi)
+    va `boxes` (float32 [x1, y1, x2, y2, class_id, confidence]) massivlari
+    hamda JSON ko'rinishidagi `meta`.
+    """
+    
+    def __init__(self, video_path, model_name, confidence=None, iou=None, stride=1,
+                 adaptive=None, cache_dir=None):
+        """
+        Args:
+            video_path: Video fayl yo'li
+            model_name: Model fayli nomi (masalan, 'yolo11m.pt')
+            confidence: Ishonch threshold (default: config.CONFIDENCE_THRESHOLD)
+            iou: IoU threshold (default: config.IOU_THRESHOLD)
+            stride: Frame qadami (SKIP_FRAMES + 1)
+            adaptive: Adaptive qadam rejimi (default: config.ADAPTIVE_SKIP)
+            cache_dir: Kesh papkasi (default: config.CACHE_DIR)
+        """
+        self.key_fields = {
+            'version': CACHE_VERSION,
+            'video': video_hash(video_path),
+            'model': Path(str(model_name)).name,
+            'backend': config.INFERENCE_BACKEND,
+            'confidence': float(config.CONFIDENCE_THRESHOLD if confidence is None else confidence),
+            'iou': float(config.IOU_THRESHOLD if iou is None else iou),
+            'stride': int(stride),
+            'adaptive': bool(config.ADAPTIVE_SKIP if adaptive is None else adaptive),
+        }
+        key = hashlib.sha1(json.dumps(self.key_fields, sort_keys=True).encode()).hexdigest()
+        
+        self.path = Path(cache_dir or config.CACHE_DIR) / f"{key[:20]}.npz"
+        self._frames = []
+        self._boxes = []
+    
+    def exists(self):
+        """Kesh fayli mavjudmi"""
+        return self.path.exists()
+    
+    def add(self, frame_index, detections):
+        """
+        Bitta frame detectionlarini yozish uchun qo'shish
+        
+        Args:
+            frame_index: Manbadagi frame raqami
+            detections: [(x1, y1, x2, y2, class_id, confidence), ...]
+        """
+        self._frames.append(frame_index)
+        self._boxes.append(np.asarray(detections, dtype=np.float32).reshape(-1, 6))
+    
+    def save(self, **meta):
+        """
+        Yig'ilgan detectionlarni diskka yozish (atomar: vaqtinchalik fayl orqali)
+        
+        Args:
+            **meta: Qo'shimcha ma'lumot (width, height, fps, total_frames)
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        counts = [len(boxes) for boxes in self._boxes]
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        boxes = (np.concatenate(self._boxes) if self._boxes
+                 else np.zeros((0, 6), dtype=np.float32))
+        
+        meta = dict(meta, **self.key_fields)
+        
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                frames=np.asarray(self._frames, dtype=np.int64),
+                offsets=offsets,
+                boxes=boxes,
+                meta=np.array(json.dumps(meta)),
+            )
+        os.replace(tmp_path, self.path)
+        
+        print(f"💾 Detection keshi saqlandi: {self.path} "
+              f"({len(self._frames)} frame, {len(boxes)} detection)")
+    
+    def load(self):
+        """
+        Kesh faylini o'qish
+        
+        Returns:
+            tuple: (meta dict, [(frame_index, detections), ...]) -
+                detections: [(x1, y1, x2, y2, class_id, confidence), ...]
+        """
+        with np.load(self.path) as data:
+            meta = json.loads(str(data['meta']))
+            frames = data['frames'].tolist()
+            offsets = data['offsets'].tolist()
+            boxes = data['boxes'].tolist()
+        
+        entries = []
+        for i, frame_index in enumerate(frames):
+            entries.append((frame_index, [
+                (x1, y1, x2, y2, int(class_id), confidence)
+                for x1, y1, x2, y2, class_id, confidence in boxes[offsets[i]:offsets[i + 1]]
+            ]))
+        
+        return meta, entries
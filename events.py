@@ -0,0 +1,261 @@
+"""
+Object Counting System - Chiziqdan O'tish Hodisalari
+Har bir sanalgan o'tish (vaqt, frame, obyekt ID, klass, yo'nalish, manba)
+indekslangan SQLite bazaga yoziladi. `timestamp` - har doim Unix vaqti
+(manbalar aralash bo'lsa ham vaqt oynalari to'g'ri); video fayllar uchun
+video boshidan sekund alohida `video_offset` ustunida. Yozish fon oqimida, batch bilan
+bajariladi - frame sikli faqat navbatga qo'shadi.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import config
+
+
+# Oqim tugaganini bildiruvchi belgi
+_END = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crossings (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    frame_index INTEGER,
+    object_id INTEGER NOT NULL,
+    class_name TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    source TEXT,
+    video_offset REAL
+);
+CREATE INDEX IF NOT EXISTS crossings_time ON crossings (timestamp);
+CREATE INDEX IF NOT EXISTS crossings_source_time ON crossings (source, timestamp);
+"""
+
+_INSERT = ("INSERT INTO crossings (timestamp, frame_index, object_id, class_name, "
+           "direction, source, video_offset) VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+def _connect(path):
+    """Bazaga ulanish va jadvalni yaratish (bir nechta jarayon uchun WAL rejimi)"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(_SCHEMA)
+    
+    # Eski bazalar: video_offset ustunini qo'shish
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(crossings)")}
+    if 'video_offset' not in columns:
+        with connection:
+            connection.execute("ALTER TABLE crossings ADD COLUMN video_offset REAL")
+    
+    return connection
+
+
+class EventWriter:
+    """
+    Hodisalarni fon oqimida batch bilan yozuvchi
+    
+    log() hech qachon bloklamaydi: hodisa navbatga qo'shiladi, fon oqimi
+    esa `batch_size` ta hodisa yig'ilganda yoki `flush_interval` sekund
+    o'tganda ularni bitta tranzaksiyada (executemany) yozadi. Navbat
+    to'lsa, hodisa tashlanadi va `dropped` oshadi.
+    """
+    
+    def __init__(self, path=None, batch_size=None, flush_interval=None, queue_size=None):
+        """
+        Args:
+            path: SQLite fayl yo'li (default: config.EVENT_DB)
+            batch_size: Bitta tranzaksiyadagi hodisalar soni (default: config.EVENT_BATCH_SIZE)
+            flush_interval: Maksimal kutish, sekund (default: config.EVENT_FLUSH_INTERVAL)
+            queue_size: Navbat hajmi (default: config.EVENT_QUEUE_SIZE)
+        """
+        self.path = path or config.EVENT_DB
+        self.batch_size = batch_size or config.EVENT_BATCH_SIZE
+        self.flush_interval = flush_interval or config.EVENT_FLUSH_INTERVAL
+        self.queue = queue.Queue(maxsize=queue_size or config.EVENT_QUEUE_SIZE)
+        
+        self.written = 0
+        self.dropped = 0
+        self._error = None
+        
+        # Baza asosiy oqimda ochiladi - xato bo'lsa darhol ko'rinadi
+        self._connection = _connect(self.path)
+        
+        self._thread = threading.Thread(target=self._run, name='event-writer', daemon=True)
+        self._thread.start()
+    
+    def log(self, timestamp, frame_index, object_id, class_name, direction, source=None,
+            video_offset=None):
+        """
+        Bitta o'tish hodisasini navbatga qo'shish
+        
+        Args:
+            timestamp: Hodisa vaqti (Unix vaqti, sekund)
+            frame_index: Manbadagi frame raqami
+            object_id: Obyekt ID
+            class_name: Klass nomi
+            direction: "down" (yuqoridan pastga) yoki "up"
+            source: Manba (video yo'li, kamera ID yoki URL)
+            video_offset: Video fayl boshidan sekund (jonli manbada None)
+        """
+        event = (timestamp, frame_index, object_id, class_name, direction,
+                 None if source is None else str(source), video_offset)
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+    
+    def _run(self):
+        """Fon oqimi: navbatdan olib, batch bilan yozish"""
+        try:
+            finished = False
+            
+            while not finished:
+                event = self.queue.get()
+                if event is _END:
+                    break
+                
+                batch = [event]
+                deadline = time.monotonic() + self.flush_interval
+                
+                # Batch to'lguncha yoki muddat tugaguncha yig'ish
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        event = self.queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if event is _END:
+                        finished = True
+                        break
+                    batch.append(event)
+                
+                self._write(batch)
+                
+                for _ in batch:
+                    self.queue.task_done()
+        except Exception as e:
+            self._error = e
+    
+    def _write(self, batch):
+        """Batch'ni bitta tranzaksiyada yozish"""
+        with self._connection:
+            self._connection.executemany(_INSERT, batch)
+        self.written += len(batch)
+    
+    def flush(self):
+        """Navbatdagi barcha hodisalar yozilguncha kutish"""
+        if self._thread.is_alive():
+            self.queue.join()
+        
+        if self._error is not None:
+            raise self._error
+    
+    def close(self):
+        """Navbatdagi barcha hodisalarni yozib, oqimni to'xtatish"""
+        if self._thread.is_alive():
+            self.queue.put(_END)
+            self._thread.join()
+        
+        self._connection.close()
+        
+        if self._error is not None:
+            raise self._error
+        
+        if self.dropped:
+            print(f"⚠️  {self.dropped} ta o'tish hodisasi yozilmadi (navbat to'ldi)")
+
+
+class EventStore:
+    """
+    O'tish hodisalari bazasidan so'rovlar
+    """
+    
+    def __init__(self, path=None):
+        """
+        Args:
+            path: SQLite fayl yo'li (default: config.EVENT_DB)
+        """
+        self.path = path or config.EVENT_DB
+        self._connection = _connect(self.path)
+    
+    @staticmethod
+    def _where(start, end, source):
+        """Vaqt oralig'i va manba bo'yicha shart"""
+        clauses, params = [], []
+        
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(str(source))
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def counts(self, window=60, start=None, end=None, source=None):
+        """
+        Vaqt oynalari bo'yicha har bir klass sanog'i
+        
+        Args:
+            window: Oyna uzunligi (sekund)
+            start, end: Vaqt oralig'i [start, end) (None - chegarasiz)
+            source: Faqat shu manba (None - barchasi)
+        
+        Returns:
+            dict: {window_start: {class_name: count}} - vaqt bo'yicha tartiblangan
+        """
+        where, params = self._where(start, end, source)
+        rows = self._connection.execute(
+            f"SELECT CAST(timestamp / ? AS INTEGER) * ? AS bucket, class_name, COUNT(*) "
+            f"FROM crossings {where} GROUP BY bucket, class_name ORDER BY bucket",
+            [window, window, *params]
+        )
+        
+        result = {}
+        for bucket, class_name, count in rows:
+            result.setdefault(bucket, {})[class_name] = count
+        return result
+    
+    def totals(self, start=None, end=None, source=None):
+        """
+        Vaqt oralig'idagi har bir klass bo'yicha jami sanoq
+        
+        Returns:
+            dict: {class_name: count}
+        """
+        where, params = self._where(start, end, source)
+        rows = self._connection.execute(
+            f"SELECT class_name, COUNT(*) FROM crossings {where} GROUP BY class_name",
+            params
+        )
+        return dict(rows)
+    
+    def events(self, start=None, end=None, source=None, limit=None):
+        """
+        Hodisalar ro'yxati (vaqt bo'yicha)
+        
+        Returns:
+            list: [(timestamp, frame_index, object_id, class_name, direction, source,
+                video_offset), ...]
+        """
+        where, params = self._where(start, end, source)
+        sql = (f"SELECT timestamp, frame_index, object_id, class_name, direction, source, "
+               f"video_offset FROM crossings {where} ORDER BY timestamp")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._connection.execute(sql, params).fetchall()
+    
+    def close(self):
+        self._connection.close()
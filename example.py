@@ -128,6 +128,10 @@ def example_4_multiple_videos():
         print(f"\n{video}:")
         for class_name, count in stats.items():
             print(f"  {class_name}: {count}")
+    
+    # Ko'p yadroli mashinada parallel variant:
+    #   from batch_runner import run_batch
+    #   run_batch("input_videos/", str(config.MODELS_DIR / config.YOLO_MODEL), workers=4)
 
 
 def example_5_statistics():
@@ -0,0 +1,234 @@
+"""
+Object Counting System - Bosqichlar Metrikalari
+Har bir bosqich (decode, detect, track, count, draw, write, encode, display)
+vaqtini o'lchash, oxirgi o'lchovlar bo'yicha p50/p95/p99, FPS, tashlangan
+framelar va faol obyektlar soni. Davriy ravishda JSON va Prometheus text
+formatidagi fayllarga yoziladi (node_exporter textfile collector uchun).
+
+O'chirilgan bo'lsa ObjectCounter.metrics = None va har bir bosqich
+faqat umumiy nullcontext orqali o'tadi.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import config
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Prometheus metrikalari prefiksi
+_PREFIX = "object_counter"
+
+
+class _StageTimer:
+    """Bitta oqimdagi bitta bosqich vaqtini o'lchovchi context manager (qayta ishlatiladi)"""
+    
+    __slots__ = ('metrics', 'stage', 'start')
+    
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+        self.start = 0.0
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class StageMetrics:
+    """
+    Bosqichlar kechikishi va oqim ko'rsatkichlari
+    
+    Har bir bosqich uchun oxirgi `window` ta o'lchov (rolling) va jami
+    yig'indi/soni saqlanadi. `frame_done()` har bir qayta ishlangan frame
+    oxirida chaqiriladi; oxirgi eksportdan `interval` sekund o'tgan bo'lsa,
+    fayllar qayta yoziladi.
+    
+    Bosqichlar turli oqimlarda o'lchanadi (pipeline bosqichlari, video
+    yozuvchi), shuning uchun o'lchovlar qulf ostida qo'shiladi va
+    eksportdan oldin qulf ostida nusxalanadi.
+    """
+    
+    def __init__(self, source=None, window=None, interval=None, json_path=None,
+                 prom_path=None):
+        """
+        Args:
+            source: Manba nomi (Prometheus `source` labeli)
+            window: Percentillar uchun oxirgi o'lchovlar soni (default: config.METRICS_WINDOW)
+            interval: Fayllarni yozish oralig'i, sekund (default: config.METRICS_INTERVAL)
+            json_path: JSON fayl (default: config.METRICS_JSON, None - yozilmaydi)
+            prom_path: Prometheus fayl (default: config.METRICS_PROM, None - yozilmaydi)
+        """
+        self.source = source
+        self.window = window or config.METRICS_WINDOW
+        self.interval = config.METRICS_INTERVAL if interval is None else interval
+        self.json_path = json_path or config.METRICS_JSON
+        self.prom_path = prom_path or config.METRICS_PROM
+        
+        self._lock = threading.Lock()
+        self._timers = {}
+        self._samples = {}
+        self._sums = {}
+        self._counts = {}
+        
+        self._frame_times = deque(maxlen=self.window)
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.active_tracks = 0
+        self._last_export = time.monotonic()
+    
+    def time(self, stage):
+        """
+        Bosqich vaqtini o'lchash uchun context manager
+        
+        Args:
+            stage: Bosqich nomi (masalan, 'detect')
+        """
+        # Har bir oqimning o'z timer'i (boshlanish vaqti oqimlar orasida ulashilmaydi)
+        key = (threading.get_ident(), stage)
+        timer = self._timers.get(key)
+        if timer is None:
+            timer = self._timers[key] = _StageTimer(self, stage)
+        return timer
+    
+    def observe(self, stage, seconds):
+        """Bosqich o'lchovini qo'shish (istalgan oqimdan)"""
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._sums[stage] = 0.0
+                self._counts[stage] = 0
+            
+            samples.append(seconds)
+            self._sums[stage] += seconds
+            self._counts[stage] += 1
+    
+    def _stage_copies(self):
+        """
+        Bosqichlar o'lchovlarining qulf ostidagi nusxasi
+        
+        Returns:
+            list: [(bosqich, np.ndarray sekundlar, yig'indi, soni), ...]
+        """
+        with self._lock:
+            return [(stage, np.array(samples), self._sums[stage], self._counts[stage])
+                    for stage, samples in self._samples.items()]
+    
+    def frame_done(self, active_tracks):
+        """
+        Frame qayta ishlanganini qayd etish (kerak bo'lsa fayllarni yozish)
+        
+        Args:
+            active_tracks: Tracker'dagi faol obyektlar soni
+        """
+        now = time.monotonic()
+        self._frame_times.append(now)
+        self.frames_processed += 1
+        self.active_tracks = active_tracks
+        
+        if now - self._last_export >= self.interval:
+            self.export()
+    
+    @property
+    def fps(self):
+        """Oxirgi `window` frame bo'yicha qayta ishlash tezligi"""
+        if len(self._frame_times) < 2:
+            return 0.0
+        elapsed = self._frame_times[-1] - self._frame_times[0]
+        return (len(self._frame_times) - 1) / elapsed if elapsed > 0 else 0.0
+    
+    def snapshot(self):
+        """
+        Joriy ko'rsatkichlar
+        
+        Returns:
+            dict: fps, frames_processed, frames_dropped, active_tracks va
+                stages: {bosqich: {'p50', 'p95', 'p99', 'mean', 'count'}} (ms)
+        """
+        stages = {}
+        for stage, values, _, count in self._stage_copies():
+            if not len(values):
+                continue
+            values = values * 1000
+            percentiles = np.percentile(values, [q * 100 for q in QUANTILES])
+            stages[stage] = {
+                **{f"p{int(q * 100)}": round(float(p), 3) for q, p in zip(QUANTILES, percentiles)},
+                'mean': round(float(values.mean()), 3),
+                'count': count,
+            }
+        
+        return {
+            'source': None if self.source is None else str(self.source),
+            'timestamp': time.time(),
+            'fps': round(self.fps, 2),
+            'frames_processed': self.frames_processed,
+            'frames_dropped': self.frames_dropped,
+            'active_tracks': self.active_tracks,
+            'stages': stages,
+        }
+    
+    def prometheus_text(self):
+        """
+        Prometheus text exposition formatidagi ko'rsatkichlar
+        
+        Returns:
+            str: summary (bosqichlar kechikishi), gauge va counter metrikalari
+        """
+        source = '' if self.source is None else str(self.source).replace('"', '\\"')
+        label = f'source="{source}"'
+        lines = [
+            f"# HELP {_PREFIX}_stage_latency_seconds Bosqich kechikishi (oxirgi {self.window} o'lchov)",
+            f"# TYPE {_PREFIX}_stage_latency_seconds summary",
+        ]
+        
+        for stage, values, total, count in self._stage_copies():
+            if not len(values):
+                continue
+            stage_label = f'{label},stage="{stage}"'
+            for q, p in zip(QUANTILES, np.percentile(values, [q * 100 for q in QUANTILES])):
+                lines.append(f'{_PREFIX}_stage_latency_seconds{{{stage_label},quantile="{q}"}} {p:.6f}')
+            lines.append(f'{_PREFIX}_stage_latency_seconds_sum{{{stage_label}}} {total:.6f}')
+            lines.append(f'{_PREFIX}_stage_latency_seconds_count{{{stage_label}}} {count}')
+        
+        lines += [
+            f"# TYPE {_PREFIX}_fps gauge",
+            f"{_PREFIX}_fps{{{label}}} {self.fps:.3f}",
+            f"# TYPE {_PREFIX}_frames_processed_total counter",
+            f"{_PREFIX}_frames_processed_total{{{label}}} {self.frames_processed}",
+            f"# TYPE {_PREFIX}_frames_dropped_total counter",
+            f"{_PREFIX}_frames_dropped_total{{{label}}} {self.frames_dropped}",
+            f"# TYPE {_PREFIX}_active_tracks gauge",
+            f"{_PREFIX}_active_tracks{{{label}}} {self.active_tracks}",
+        ]
+        
+        return "\n".join(lines) + "\n"
+    
+    def export(self):
+        """JSON va Prometheus fayllarini atomar yozish"""
+        self._last_export = time.monotonic()
+        
+        if self.json_path:
+            _write_atomic(self.json_path, json.dumps(self.snapshot(), indent=2))
+        if self.prom_path:
+            _write_atomic(self.prom_path, self.prometheus_text())
+
+
+def _write_atomic(path, text):
+    """Faylni vaqtinchalik fayl orqali yozish (o'quvchi yarim faylni ko'rmaydi)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
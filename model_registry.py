@@ -0,0 +1,318 @@
+"""
+Object Counting System - Model Registry
+MODELS_DIR dagi modellar indeksi (nomi, yo'li, checksum, eksport qilingan
+variantlari) va bir jarayon ichida qayta ishlatiladigan yuklangan ("issiq")
+modellar.
+
+Model nomini yo'lga aylantirish indeks bo'yicha O(1) - ~/.cache bo'ylab
+qidirilmaydi. config.MODEL_OFFLINE = True bo'lsa, tarmoqqa umuman
+murojaat qilinmaydi: model MODELS_DIR da (yoki indeksda) bo'lishi shart.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import config
+
+
+# Checksum uchun o'qish bloki
+_HASH_CHUNK = 1 << 20
+
+# Inference backendlari: nomi -> eksport qilingan fayl suffiksi (None - asl .pt)
+BACKENDS = {
+    'torch': None,
+    'onnx': '.onnx',
+    'onnx-int8': '.int8.onnx',
+}
+
+# Yuklangan modellar: (model yo'li, qurilma) -> YOLO
+_loaded_models = {}
+_load_lock = threading.Lock()
+
+
+def file_checksum(path):
+    """
+    Fayl SHA-256 checksumi
+    
+    Args:
+        path: Fayl yo'li
+    
+    Returns:
+        str: SHA-256 hex
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Modellar indeksi (JSON fayl)
+    
+    Har bir yozuv: {"path", "checksum", "size", "variants": {nomi: yo'l}}.
+    Nisbiy yo'llar indeks joylashgan papkaga nisbatan saqlanadi, shuning
+    uchun models/ papkasini boshqa mashinaga ko'chirish mumkin.
+    """
+    
+    def __init__(self, models_dir=None, index_path=None):
+        """
+        Args:
+            models_dir: Modellar papkasi (default: config.MODELS_DIR)
+            index_path: Indeks fayli (default: config.MODEL_REGISTRY)
+        """
+        self.models_dir = Path(models_dir or config.MODELS_DIR)
+        self.index_path = Path(index_path or config.MODEL_REGISTRY)
+        self.entries = self._read()
+    
+    def _read(self):
+        """Indeksni o'qish (fayl bo'lmasa - bo'sh)"""
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path) as f:
+            return json.load(f).get('models', {})
+    
+    def _write(self):
+        """Indeksni atomar yozish (vaqtinchalik fayl orqali)"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'models': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+    
+    def _absolute(self, path):
+        """Indeksdagi yo'lni to'liq yo'lga aylantirish"""
+        path = Path(path)
+        return path if path.is_absolute() else self.index_path.parent / path
+    
+    def _relative(self, path):
+        """Indeks papkasi ichidagi yo'lni nisbiy qilib saqlash"""
+        path = Path(path).resolve()
+        try:
+            return str(path.relative_to(self.index_path.parent.resolve()))
+        except ValueError:
+            return str(path)
+    
+    def register(self, name, path, checksum=None):
+        """
+        Modelni indeksga qo'shish (yoki yangilash)
+        
+        Args:
+            name: Model nomi (masalan, 'yolo11m.pt')
+            path: Model fayli yo'li
+            checksum: SHA-256 (None - hisoblanadi)
+        
+        Returns:
+            Path: Model fayli yo'li
+        """
+        path = Path(path)
+        checksum = checksum or file_checksum(path)
+        entry = self.entries.get(name, {})
+        
+        # Model fayli o'zgargan bo'lsa, eski eksportlar endi unga mos emas
+        if entry.get('checksum') != checksum:
+            entry['variants'] = {}
+        
+        entry.update({
+            'path': self._relative(path),
+            'checksum': checksum,
+            'size': path.stat().st_size,
+        })
+        entry.setdefault('variants', {})
+        self.entries[name] = entry
+        self._write()
+        return path
+    
+    def add_variant(self, name, variant, path):
+        """
+        Eksport qilingan variantni qayd etish (masalan, 'onnx', 'onnx-int8')
+        
+        Args:
+            name: Asosiy model nomi (indeksda bo'lishi kerak)
+            variant: Variant nomi
+            path: Variant fayli yo'li
+        """
+        if name not in self.entries:
+            raise ValueError(f"❌ Model indeksda yo'q: {name}")
+        self.entries[name].setdefault('variants', {})[variant] = self._relative(path)
+        self._write()
+    
+    def variant(self, name, variant):
+        """
+        Variant fayli yo'li
+        
+        Returns:
+            Path yoki None: Indeksda bo'lmasa yoki fayl o'chirilgan bo'lsa None
+        """
+        path = self.entries.get(name, {}).get('variants', {}).get(variant)
+        if path is None:
+            return None
+        path = self._absolute(path)
+        return path if path.exists() else None
+    
+    def ensure_variant(self, name, backend):
+        """
+        Backend uchun model faylini topish, kerak bo'lsa bir marta eksport qilish
+        
+        Eksport .pt yonida (MODELS_DIR da) saqlanadi va indeksga variant
+        sifatida yoziladi - keyingi ishga tushirishlarda qayta eksport qilinmaydi.
+        
+        Args:
+            name: Asosiy (.pt) model nomi yoki yo'li (yoki allaqachon
+                eksport qilingan variant fayli - o'zi qaytariladi)
+            backend: BACKENDS kalitlaridan biri
+        
+        Returns:
+            Path: Backend ishlatadigan model fayli
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"❌ Noma'lum inference backend: {backend}")
+        
+        suffix = BACKENDS[backend]
+        if suffix is not None and str(name).endswith(suffix) and Path(name).is_file():
+            return Path(name)
+        
+        source = self.ensure(name)
+        if BACKENDS[backend] is None:
+            return source
+        
+        key = Path(name).name
+        path = self.variant(key, backend)
+        if path is not None:
+            return path
+        
+        target = source.with_name(source.stem + BACKENDS[backend])
+        
+        if backend == 'onnx':
+            from ultralytics import YOLO
+            
+            print(f"📦 ONNX ga eksport qilinmoqda: {source.name}")
+            # dynamic=True: batch va ROI kesimlari turli o'lchamda bo'lishi mumkin
+            exported = Path(YOLO(str(source)).export(format='onnx', dynamic=True))
+            if exported.resolve() != target.resolve():
+                shutil.move(str(exported), target)
+        else:
+            try:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+            except ImportError:
+                raise ImportError("❌ int8 kvantlash uchun onnxruntime kerak: "
+                                  "pip install onnxruntime")
+            
+            fp32 = self.ensure_variant(name, 'onnx')
+            print(f"🗜️  int8 dinamik kvantlash: {fp32.name}")
+            quantize_dynamic(str(fp32), str(target), weight_type=QuantType.QUInt8)
+        
+        self.add_variant(key, backend, target)
+        print(f"✅ Eksport saqlandi: {target}")
+        return target
+    
+    def resolve(self, name):
+        """
+        Model nomi yoki yo'lini mavjud faylga aylantirish (tarmoqsiz)
+        
+        Args:
+            name: Model nomi, MODELS_DIR dagi fayl nomi yoki to'liq yo'l
+        
+        Returns:
+            Path yoki None: Topilmasa None
+        """
+        key = Path(name).name
+        explicit = Path(name) if key != str(name) else None
+        
+        if key in self.entries:
+            path = self._absolute(self.entries[key]['path'])
+            if path.exists() and (explicit is None or path.resolve() == explicit.resolve()):
+                return path
+        
+        # Indeksda yo'q (yoki ko'chirilgan): fayl bir marta tekshiriladi va qayd etiladi
+        path = explicit or self.models_dir / key
+        if path.is_file():
+            return self.register(key, path)
+        
+        return None
+    
+    def verify(self, name):
+        """
+        Model fayli checksumi indeksdagiga mosmi
+        
+        Returns:
+            bool: Mos bo'lsa True
+        """
+        path = self.resolve(name)
+        return (path is not None
+                and file_checksum(path) == self.entries[Path(name).name]['checksum'])
+    
+    def ensure(self, name, offline=None):
+        """
+        Modelni topish, kerak bo'lsa yuklab olib MODELS_DIR ga saqlash
+        
+        Args:
+            name: Model nomi (masalan, 'yolo11m.pt')
+            offline: Tarmoqqa murojaat qilmaslik (default: config.MODEL_OFFLINE)
+        
+        Returns:
+            Path: Model fayli yo'li
+        """
+        path = self.resolve(name)
+        if path is not None:
+            return path
+        
+        if config.MODEL_OFFLINE if offline is None else offline:
+            raise ValueError(f"❌ Model topilmadi (offline rejim): {name} "
+                             f"({self.models_dir} ga joylashtiring)")
+        
+        from ultralytics import YOLO
+        
+        print(f"📥 Model topilmadi. Yuklab olinmoqda: {name}")
+        print("⏳ Bu biroz vaqt olishi mumkin...")
+        
+        # Ultralytics yuklab olgan faylning aniq yo'li ckpt_path da
+        downloaded = Path(YOLO(name).ckpt_path)
+        
+        self.models_dir.mkdir(parents=True, exist_ok=True)
+        target = self.models_dir / Path(name).name
+        if downloaded.resolve() != target.resolve():
+            shutil.copy(downloaded, target)
+        
+        print(f"✅ Model saqlandi: {target}")
+        return self.register(Path(name).name, target)
+
+
+def load_model(model_path, device):
+    """
+    YOLO modelini yuklash yoki shu jarayonda allaqachon yuklanganini qaytarish
+    
+    Bir jarayondagi barcha ObjectCounter lar bitta model obyektini ulashadi:
+    fayl qayta o'qilmaydi va qurilmaga qayta ko'chirilmaydi.
+    
+    Args:
+        model_path: Model fayli yo'li
+        device: 'cuda' yoki 'cpu'
+    
+    Returns:
+        YOLO: Yuklangan model
+    """
+    key = (str(Path(model_path).resolve()), device)
+    
+    with _load_lock:
+        if key not in _loaded_models:
+            from ultralytics import YOLO
+            
+            # Eksport qilingan (ONNX) modellar AutoBackend orqali ishlaydi, .to() yo'q
+            model = YOLO(str(model_path), task='detect')
+            if Path(model_path).suffix == '.pt':
+                model.to(device)
+            _loaded_models[key] = model
+        
+        return _loaded_models[key]
+
+
+def clear_loaded_models():
+    """Yuklangan modellarni unutish (xotirani bo'shatish uchun)"""
+    with _load_lock:
+        _loaded_models.clear()
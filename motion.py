@@ -0,0 +1,134 @@
+"""
+Object Counting System - Harakat Filtri (Motion Gating)
+Statik framelarda YOLO'ni ishga tushirmaslik uchun arzon harakat detektori
+"""
+
+import cv2
+import numpy as np
+import config
+
+
+class MotionGate:
+    """
+    Kichraytirilgan kulrang frame ustida harakatni aniqlash
+    
+    Ikki usul:
+        "diff" - sekin yangilanadigan o'rtacha fon bilan farq (frame differencing)
+        "mog2" - OpenCV fon ayirish (BackgroundSubtractorMOG2)
+    
+    O'zgargan piksellar ulushi MOTION_MIN_AREA dan kam bo'lsa, frame statik
+    hisoblanadi va detection o'tkazib yuboriladi. Xavfsizlik uchun ketma-ket
+    MOTION_REFRESH_FRAMES ta statik framedan keyin detection majburan bajariladi.
+    """
+    
+    def __init__(self, method=None, width=None, pixel_threshold=None,
+                 min_area=None, refresh_frames=None, var_threshold=None):
+        """
+        Args:
+            method: "diff" yoki "mog2" (default: config.MOTION_METHOD)
+            width: Tekshirish uchun frame kengligi (default: config.MOTION_DOWNSCALE_WIDTH)
+            pixel_threshold: Piksel o'zgarish chegarasi 0-255 (diff usuli uchun)
+            min_area: Harakat deb hisoblash uchun o'zgargan piksellar ulushi
+            refresh_frames: Majburiy detection oralig'i (statik framelar soni)
+            var_threshold: MOG2 varThreshold - piksel farqining kvadrati / fon
+                dispersiyasi chegarasi (default: config.MOTION_MOG2_VAR_THRESHOLD)
+        """
+        self.method = method or config.MOTION_METHOD
+        if self.method not in ("diff", "mog2"):
+            raise ValueError(f"❌ Noma'lum motion usuli: {self.method}")
+        
+        self.width = width or config.MOTION_DOWNSCALE_WIDTH
+        self.pixel_threshold = pixel_threshold or config.MOTION_PIXEL_THRESHOLD
+        self.min_area = config.MOTION_MIN_AREA if min_area is None else min_area
+        self.refresh_frames = (config.MOTION_REFRESH_FRAMES if refresh_frames is None
+                               else refresh_frames)
+        self.var_threshold = (config.MOTION_MOG2_VAR_THRESHOLD if var_threshold is None
+                              else var_threshold)
+        
+        self._background = None
+        self._subtractor = None
+        if self.method == "mog2":
+            self._subtractor = cv2.createBackgroundSubtractorMOG2(
+                history=200, varThreshold=self.var_threshold, detectShadows=False
+            )
+        
+        # Statistika
+        self.frames_checked = 0
+        self.frames_gated = 0
+        self._static_streak = 0
+    
+    def _prepare(self, frame):
+        """Frameni kichraytirish, kulrangga o'tkazish va silliqlash"""
+        height, width = frame.shape[:2]
+        scale = self.width / width
+        small = cv2.resize(frame, (self.width, max(1, int(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+    
+    def motion_ratio(self, frame):
+        """
+        O'zgargan piksellar ulushi
+        
+        Args:
+            frame: BGR video frame
+        
+        Returns:
+            float: 0.0 - 1.0 (birinchi frame uchun 1.0)
+        """
+        gray = self._prepare(frame)
+        
+        if self._subtractor is not None:
+            mask = self._subtractor.apply(gray)
+            
+            # Birinchi frame: fon modeli hali o'rganmagan, harakat bor deb hisoblash
+            if self._background is None:
+                self._background = gray
+                return 1.0
+            
+            return np.count_nonzero(mask) / mask.size
+        
+        if self._background is None or self._background.shape != gray.shape:
+            self._background = gray.astype(np.float32)
+            return 1.0
+        
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        
+        # Fonni sekin yangilash (yorug'lik o'zgarishiga moslashish)
+        cv2.accumulateWeighted(gray, self._background, config.MOTION_BACKGROUND_ALPHA)
+        
+        return np.count_nonzero(diff > self.pixel_threshold) / diff.size
+    
+    def has_motion(self, frame):
+        """
+        Frameda harakat bormi (detection kerakmi)
+        
+        Args:
+            frame: BGR video frame
+        
+        Returns:
+            bool: Detection bajarilishi kerak bo'lsa True
+        """
+        self.frames_checked += 1
+        
+        moving = self.motion_ratio(frame) >= self.min_area
+        
+        if not moving and self._static_streak < self.refresh_frames:
+            self._static_streak += 1
+            self.frames_gated += 1
+            return False
+        
+        self._static_streak = 0
+        return True
+    
+    @property
+    def gated_ratio(self):
+        """Detection o'tkazib yuborilgan framelar ulushi"""
+        if self.frames_checked == 0:
+            return 0.0
+        return self.frames_gated / self.frames_checked
+    
+    def reset(self):
+        """Holat va statistikani tozalash"""
+        self.__init__(self.method, self.width, self.pixel_threshold,
+                      self.min_area, self.refresh_frames, self.var_threshold)
@@ -0,0 +1,238 @@
+"""
+Object Counting System - Ko'p Oqimli Rejim
+Bitta jarayonda bir nechta kamera/RTSP/fayl manbalarini qayta ishlash.
+YOLO modeli barcha oqimlar uchun bitta, har bir oqimning esa o'z tracker'i,
+sanash chizig'i va statistikasi bor.
+"""
+
+import time
+
+import cv2
+import config
+from counter import ObjectCounter
+from synthetic import SyntheticVideoSource
+from capture import LatestFrameGrabber
+from metrics import StageMetrics
+
+
+def _stream_path(path, index):
+    """Oqim uchun alohida fayl yo'li (metrics.json -> metrics.stream0.json)"""
+    return path.with_name(f"{path.stem}.stream{index}{path.suffix}")
+
+
+def open_source(spec):
+    """
+    Manba spetsifikatsiyasidan video manbasini ochish
+    
+    Args:
+        spec: Kamera ID ("0"), RTSP/HTTP URL, video fayl yo'li yoki
+            "synthetic[:obyektlar_soni]" (test uchun sun'iy manba)
+    
+    Returns:
+        cv2.VideoCapture, LatestFrameGrabber yoki SyntheticVideoSource
+    """
+    spec = str(spec)
+    
+    if spec.startswith('synthetic'):
+        _, _, num_objects = spec.partition(':')
+        return SyntheticVideoSource(
+            num_objects=int(num_objects) if num_objects else 10,
+            num_frames=None
+        )
+    
+    if spec.isdigit():
+        cap = cv2.VideoCapture(int(spec))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_RESOLUTION[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_RESOLUTION[1])
+    else:
+        cap = cv2.VideoCapture(spec)
+    
+    # Jonli manbalar (kamera, RTSP/HTTP) uchun faqat eng yangi frame
+    is_live = spec.isdigit() or '://' in spec
+    if is_live and config.CAMERA_LATEST_FRAME and cap.isOpened():
+        return LatestFrameGrabber(cap)
+    
+    return cap
+
+
+class VideoStream:
+    """
+    Bitta oqim holati: manba va shu oqimning sanash holati
+    """
+    
+    def __init__(self, name, spec, cap, counter):
+        """
+        Args:
+            name: Oqim nomi (oyna va hisobot uchun)
+            spec: Manba spetsifikatsiyasi
+            cap: Ochilgan video manbasi
+            counter: Shu oqim uchun ObjectCounter (umumiy model bilan)
+        """
+        self.name = name
+        self.spec = spec
+        self.cap = cap
+        self.counter = counter
+        self.frames = 0
+        self.active = True
+
+
+class MultiStreamCounter:
+    """
+    Bir nechta oqimni bitta umumiy YOLO modeli bilan sanash
+    
+    Har bir iteratsiyada har bir faol oqimdan bittadan frame o'qiladi,
+    ular bitta batch qilib modelga beriladi, keyin natijalar har bir
+    oqimning o'z tracker'i va hisoblagichiga uzatiladi. Xotira oqimlar
+    soniga faqat tracker holati bilan bog'liq - model og'irliklari bitta.
+    """
+    
+    def __init__(self, sources, model_path=None, count_classes=None, line_positions=None,
+                 model=None):
+        """
+        Args:
+            sources: Manbalar ro'yxati (open_source() formatida)
+            model_path: YOLO model fayl yo'li
+            count_classes: Sanaladigan klaslar dict {class_id: name}
+            line_positions: Har bir oqim uchun sanash chizig'i pozitsiyasi (optional)
+            model: Oldindan yuklangan model (berilmasa model_path dan yuklanadi)
+        """
+        if not sources:
+            raise ValueError("❌ Kamida bitta manba kerak")
+        
+        self.streams = []
+        
+        for i, spec in enumerate(sources):
+            cap = open_source(spec)
+            
+            if not cap.isOpened():
+                self.release()
+                raise ValueError(f"❌ Manba ochilmadi: {spec}")
+            
+            # Birinchi counter modelni yuklaydi, qolganlari uni ulashadi
+            counter = ObjectCounter(model_path=model_path, count_classes=count_classes,
+                                    model=model)
+            model = counter.model
+            
+            counter.source = str(spec)
+            if counter.metrics is not None:
+                # Har bir oqim o'z fayllariga: metrics.stream0.json, metrics.stream1.prom, ...
+                counter.metrics = StageMetrics(
+                    source=str(spec),
+                    json_path=_stream_path(config.METRICS_JSON, i),
+                    prom_path=_stream_path(config.METRICS_PROM, i),
+                )
+            if line_positions is not None:
+                counter.line_position = line_positions[i]
+            
+            self.streams.append(VideoStream(f"stream{i}", str(spec), cap, counter))
+        
+        self.detector = self.streams[0].counter
+    
+    def step(self, display=False):
+        """
+        Barcha faol oqimlardan bittadan frame o'qib, qayta ishlash
+        
+        Args:
+            display: Natijalarni oynalarda ko'rsatish
+        
+        Returns:
+            bool: Kamida bitta oqim faol bo'lsa True
+        """
+        batch = []
+        
+        for stream in self.streams:
+            if not stream.active:
+                continue
+            
+            with stream.counter.timed('decode'):
+                ret, frame = stream.cap.read()
+            
+            if not ret:
+                print(f"⚠️  {stream.name} tugadi: {stream.spec}")
+                stream.active = False
+                continue
+            
+            stream.frames += 1
+            batch.append((stream, frame))
+        
+        if not batch:
+            return False
+        
+        # Barcha oqimlar framelari bitta forward pass'da (har biri o'z motion gate'i va ROI'si bilan)
+        frames = [frame for _, frame in batch]
+        owners = [stream.counter for stream, _ in batch]
+        start = time.perf_counter()
+        detections_batch = self.detector.detect_objects_batch(frames, owners)
+        detect_time = (time.perf_counter() - start) / len(batch)
+        
+        for counter in owners:
+            if counter.metrics is not None:
+                counter.metrics.observe('detect', detect_time)
+        
+        for (stream, frame), detections in zip(batch, detections_batch):
+            frame_index = getattr(stream.cap, 'frame_number', stream.frames)
+            tracks = stream.counter.analyze_frame(frame, detections, frame_index)
+            
+            if display:
+                frame = stream.counter.render_frame(frame, tracks)
+                with stream.counter.timed('display'):
+                    cv2.imshow(f"Object Counting System - {stream.name}", frame)
+        
+        return True
+    
+    def run(self, display=True, max_iterations=None):
+        """
+        Oqimlarni to'xtatilguncha (yoki tugaguncha) qayta ishlash
+        
+        Args:
+            display: Ekranda ko'rsatish
+            max_iterations: Maksimal iteratsiyalar soni (None - cheksiz)
+        
+        Returns:
+            dict: {stream_name: stats}
+        """
+        print(f"\n📡 {len(self.streams)} ta oqim, bitta umumiy model")
+        if display:
+            print("💡 Chiqish uchun 'q' tugmasini bosing")
+        
+        iterations = 0
+        start = time.perf_counter()
+        
+        try:
+            while max_iterations is None or iterations < max_iterations:
+                if not self.step(display):
+                    break
+                
+                iterations += 1
+                
+                if display and cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                
+                if iterations % 100 == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"⏳ {iterations} iteratsiya, {iterations / elapsed:.1f} it/s")
+        
+        finally:
+            self.release()
+            if display:
+                cv2.destroyAllWindows()
+        
+        print("\n📈 YAKUNIY STATISTIKA:")
+        for stream in self.streams:
+            print(f"   {stream.name} ({stream.spec}), {stream.frames} frame:")
+            for class_name, count in stream.counter.stats.items():
+                print(f"      {class_name}: {count}")
+        
+        return self.get_stats()
+    
+    def get_stats(self):
+        """Har bir oqim statistikasi"""
+        return {stream.name: dict(stream.counter.stats) for stream in self.streams}
+    
+    def release(self):
+        """Barcha manbalarni (va counterlarning fon resurslarini) yopish"""
+        for stream in self.streams:
+            stream.cap.release()
+            if stream.counter.metrics is not None:
+                stream.counter.metrics.export()
+            stream.counter.close()
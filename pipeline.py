@@ -0,0 +1,292 @@
+"""
+Object Counting System - Pipeline Rejimi
+Videoni bosqichlarga bo'lib, alohida oqimlarda qayta ishlash:
+capture → detection+tracking → chizish → yozish/ko'rsatish
+"""
+
+import queue
+import threading
+import time
+
+import cv2
+import config
+
+
+# Oqim tugaganini bildiruvchi belgi
+_END = object()
+
+
+class VideoPipeline:
+    """
+    Ko'p oqimli video qayta ishlash pipeline'i
+    
+    Har bir bosqich o'z oqimida ishlaydi va keyingisi bilan chegaralangan
+    navbat (bounded queue) orqali bog'lanadi. Navbat to'lsa, oldingi bosqich
+    kutadi (backpressure), shuning uchun xotira o'smaydi. Har bir bosqich
+    bitta oqimda ishlagani uchun framelar tartibi va sanash natijasi
+    ketma-ket rejim bilan bir xil bo'ladi.
+    """
+    
+    # Navbat nomi: shu navbatdan o'qiydigan bosqich
+    QUEUES = {
+        'decoded': 'detect',
+        'analyzed': 'render',
+        'rendered': 'encode',
+    }
+    
+    def __init__(self, counter, queue_size=None, render=True):
+        """
+        Args:
+            counter: ObjectCounter obyekti
+            queue_size: Har bir navbatning maksimal hajmi
+            render: Framelarni chizish (False - headless, framelar tahlildan keyin tashlanadi)
+        """
+        self.counter = counter
+        self.render = render
+        self.queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+        self.queues = {
+            name: queue.Queue(maxsize=self.queue_size) for name in self.QUEUES
+        }
+        
+        self._stop = threading.Event()
+        self._errors = []
+        
+        # Capture bosqichi video oxiriga yetdimi va detect bosqichi barcha
+        # framelarni navbatdan olib, qayta ishladimi (to'xtatilmasdan)
+        self._capture_eof = False
+        self.completed = False
+        
+        # Navbat chuqurligi statistikasi
+        self._depth_sum = {name: 0 for name in self.QUEUES}
+        self._depth_max = {name: 0 for name in self.QUEUES}
+        self._samples = 0
+    
+    def _put(self, name, item):
+        """Navbatga qo'shish (to'xtatilsa False qaytaradi)"""
+        while not self._stop.is_set():
+            try:
+                self.queues[name].put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _get(self, name):
+        """Navbatdan olish (to'xtatilsa _END qaytaradi)"""
+        while True:
+            try:
+                return self.queues[name].get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _END
+    
+    def _run_stage(self, target, *args):
+        """Bosqichni ishga tushirish va xatolarni ushlash"""
+        try:
+            target(*args)
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+    
+    def _capture_stage(self, reader):
+        """1-bosqich: qayta ishlanadigan framelarni o'qish (decode)"""
+        try:
+            while not self._stop.is_set():
+                with self.counter.timed('decode'):
+                    ret, frame_index, frame = reader.read()
+                
+                if not ret:
+                    self._capture_eof = True
+                    break
+                
+                if not self._put('decoded', (frame_index, frame)):
+                    break
+        finally:
+            self._put('decoded', _END)
+    
+    def _detect_stage(self, batch_size):
+        """2-bosqich: detection (batch bilan), tracking va sanash"""
+        try:
+            finished = False
+            
+            while not finished:
+                item = self._get('decoded')
+                if item is _END:
+                    break
+                
+                # Batch yig'ish: batch to'lguncha yoki video tugaguncha
+                batch = [item]
+                while len(batch) < batch_size:
+                    item = self._get('decoded')
+                    if item is _END:
+                        finished = True
+                        break
+                    batch.append(item)
+                
+                start = time.perf_counter()
+                detections_batch = self.counter.detect_batch(batch)
+                detect_time = (time.perf_counter() - start) / len(batch)
+                
+                for (frame_index, frame), detections in zip(batch, detections_batch):
+                    frame_start = time.perf_counter()
+                    tracks = self.counter.analyze_frame(frame, detections, frame_index)
+                    
+                    # Adaptive qadam uchun o'lchov (capture bosqichi shu qadamni o'qiydi)
+                    frame_time = detect_time + time.perf_counter() - frame_start
+                    self.counter.scheduler.update(frame_time, tracks,
+                                                  self.counter.line_y, frame.shape[0])
+                    
+                    if not self.render:
+                        # Headless: frame keyingi bosqichlarga uzatilmaydi
+                        item = (frame_index, None, None, None)
+                    else:
+                        # Statistikaning shu paytdagi nusxasi chizish uchun
+                        item = (frame_index, frame, tracks, dict(self.counter.stats))
+                    
+                    if not self._put('analyzed', item):
+                        return
+            
+            # Navbatdagi framelar ham qayta ishlandi - kesh to'liq
+            self.completed = self._capture_eof
+        finally:
+            self._put('analyzed', _END)
+    
+    def _render_stage(self):
+        """3-bosqich: natijalarni framega chizish"""
+        try:
+            while True:
+                item = self._get('analyzed')
+                if item is _END:
+                    break
+                
+                frame_index, frame, tracks, stats = item
+                if self.render:
+                    frame = self.counter.render_frame(frame, tracks, stats)
+                
+                if not self._put('rendered', (frame_index, frame)):
+                    break
+        finally:
+            self._put('rendered', _END)
+    
+    def _sample_depths(self):
+        """Navbatlar chuqurligini o'lchash"""
+        self._samples += 1
+        for name, q in self.queues.items():
+            depth = q.qsize()
+            self._depth_sum[name] += depth
+            self._depth_max[name] = max(self._depth_max[name], depth)
+    
+    def queue_report(self):
+        """
+        Navbatlar chuqurligi hisoboti
+        
+        O'rtacha chuqurligi eng katta navbatni o'qiydigan bosqich - bottleneck.
+        Barcha navbatlar deyarli bo'sh bo'lsa, framelarni o'qish (decode) sekin.
+        
+        Returns:
+            dict: {queue_name: {'stage', 'avg', 'max'}, ..., 'bottleneck': stage}
+        """
+        samples = max(self._samples, 1)
+        report = {}
+        for name, stage in self.QUEUES.items():
+            report[name] = {
+                'stage': stage,
+                'avg': self._depth_sum[name] / samples,
+                'max': self._depth_max[name],
+            }
+        
+        busiest = max(self.QUEUES, key=lambda name: report[name]['avg'])
+        if report[busiest]['avg'] < 1:
+            report['bottleneck'] = 'decode'
+        else:
+            report['bottleneck'] = self.QUEUES[busiest]
+        
+        return report
+    
+    def run(self, reader, out=None, display=True, total_frames=0):
+        """
+        Pipeline'ni ishga tushirish
+        
+        Yozish va ekranda ko'rsatish (oxirgi bosqich) asosiy oqimda bajariladi,
+        chunki cv2.imshow faqat asosiy oqimda ishonchli ishlaydi.
+        
+        Args:
+            reader: FrameReader (scheduler tanlagan framelarni qaytaradi)
+            out: AsyncVideoWriter (optional)
+            display: Ekranda ko'rsatish
+            total_frames: Umumiy framelar soni (progress uchun)
+        
+        Returns:
+            int: Qayta ishlangan framelar soni
+        """
+        batch_size = max(1, config.BATCH_SIZE)
+        
+        threads = [
+            threading.Thread(target=self._run_stage, args=(self._capture_stage, reader),
+                             name='pipeline-capture', daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._detect_stage, batch_size),
+                             name='pipeline-detect', daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._render_stage,),
+                             name='pipeline-render', daemon=True),
+        ]
+        
+        for thread in threads:
+            thread.start()
+        
+        processed = 0
+        last_progress = 0
+        
+        try:
+            while True:
+                item = self._get('rendered')
+                if item is _END:
+                    break
+                
+                frame_index, frame = item
+                processed += 1
+                self._sample_depths()
+                
+                # Video yozish
+                if out:
+                    with self.counter.timed('write'):
+                        out.write(frame, frame_index)
+                
+                # Ekranda ko'rsatish
+                if display:
+                    with self.counter.timed('display'):
+                        cv2.imshow('Object Counting System', frame)
+                        key = cv2.waitKey(1) & 0xFF
+                    
+                    # 'q' bosilsa to'xtatish
+                    if key == ord('q'):
+                        print("\n⏹️  Foydalanuvchi to'xtatdi")
+                        break
+                
+                # Progress
+                if total_frames and frame_index // 30 > last_progress:
+                    last_progress = frame_index // 30
+                    depths = ", ".join(
+                        f"{name}={q.qsize()}" for name, q in self.queues.items()
+                    )
+                    progress = (frame_index / total_frames) * 100
+                    print(f"⏳ Jarayon: {progress:.1f}% ({frame_index}/{total_frames}) "
+                          f"| Navbatlar: {depths}")
+        
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        
+        if self._errors:
+            raise self._errors[0]
+        
+        return processed
+
+
+def print_queue_report(report):
+    """Navbatlar hisobotini chiqarish"""
+    print("\n📊 PIPELINE NAVBATLARI (o'rtacha / maksimal chuqurlik):")
+    for name, stage in VideoPipeline.QUEUES.items():
+        info = report[name]
+        print(f"   {name} → {stage}: {info['avg']:.1f} / {info['max']}")
+    print(f"   🐢 Bottleneck: {report['bottleneck']}")
@@ -0,0 +1,99 @@
+"""
+Object Counting System - Region of Interest (ROI)
+Detection faqat sanash chizig'i atrofidagi polosa (yoki poligon) ichida
+bajariladi, natija koordinatalari esa to'liq frame'ga qaytariladi
+"""
+
+import cv2
+import numpy as np
+
+
+def roi_rect(roi, frame_shape, line_position):
+    """
+    ROI ning to'liq frame'dagi to'rtburchagi
+    
+    Args:
+        roi: {"mode": "band", "height": 0.3} yoki
+             {"mode": "polygon", "points": [(x, y), ...]} (0.0 - 1.0 nisbiy koordinatalar)
+        frame_shape: frame.shape
+        line_position: Sanash chizig'i pozitsiyasi (0.0 - 1.0)
+    
+    Returns:
+        tuple: (x1, y1, x2, y2) pixel koordinatalarda
+    """
+    height, width = frame_shape[:2]
+    mode = roi.get("mode", "band")
+    
+    if mode == "band":
+        half = roi.get("height", 0.3) * height / 2.0
+        line_y = line_position * height
+        y1 = int(max(0, line_y - half))
+        y2 = int(min(height, line_y + half))
+        return 0, y1, width, max(y2, y1 + 1)
+    
+    if mode == "polygon":
+        points = _polygon_pixels(roi, width, height)
+        x, y, w, h = cv2.boundingRect(points)
+        return x, y, min(width, x + w), min(height, y + h)
+    
+    raise ValueError(f"❌ Noma'lum ROI rejimi: {mode}")
+
+
+def _polygon_pixels(roi, width, height):
+    """Nisbiy poligon nuqtalarini pixel koordinatalarga o'tkazish"""
+    points = np.asarray(roi["points"], dtype=np.float32)
+    points = points * np.array([width, height], dtype=np.float32)
+    return points.round().astype(np.int32)
+
+
+def crop_roi(frame, roi, line_position):
+    """
+    Frame'dan ROI qismini kesib olish
+    
+    Polosa rejimida nusxa olinmaydi (view). Poligon rejimida poligondan
+    tashqari piksellar qora rangga bo'yaladi.
+    
+    Args:
+        frame: Video frame
+        roi: ROI sozlamasi (roi_rect() ga qarang) yoki None
+        line_position: Sanash chizig'i pozitsiyasi (0.0 - 1.0)
+    
+    Returns:
+        tuple: (crop, (offset_x, offset_y))
+    """
+    if not roi:
+        return frame, (0, 0)
+    
+    x1, y1, x2, y2 = roi_rect(roi, frame.shape, line_position)
+    crop = frame[y1:y2, x1:x2]
+    
+    if roi.get("mode") == "polygon":
+        height, width = frame.shape[:2]
+        points = _polygon_pixels(roi, width, height) - np.array([x1, y1], dtype=np.int32)
+        mask = np.zeros(crop.shape[:2], dtype=np.uint8)
+        cv2.fillPoly(mask, [points], 255)
+        crop = cv2.bitwise_and(crop, crop, mask=mask)
+    
+    return crop, (x1, y1)
+
+
+def offset_detections(detections, offset):
+    """
+    ROI koordinatalaridagi detectionlarni to'liq frame'ga qaytarish
+    
+    Args:
+        detections: [(x1, y1, x2, y2, class_id, confidence), ...]
+        offset: (offset_x, offset_y)
+    
+    Returns:
+        list: To'liq frame koordinatalaridagi detectionlar
+    """
+    dx, dy = offset
+    
+    if dx == 0 and dy == 0:
+        return detections
+    
+    return [
+        (x1 + dx, y1 + dy, x2 + dx, y2 + dy, class_id, confidence)
+        for x1, y1, x2, y2, class_id, confidence in detections
+    ]
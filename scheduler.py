@@ -0,0 +1,160 @@
+"""
+Object Counting System - Frame Scheduler
+Qaysi framelar qayta ishlanishini hal qiladi: statik SKIP_FRAMES yoki
+latency budjetiga moslashuvchi (adaptive) qadam
+"""
+
+import math
+import time
+
+import config
+
+
+class FrameScheduler:
+    """
+    Frame qayta ishlash qadamini (stride) boshqarish
+    
+    Statik rejimda har `base_stride`-inchi frame qayta ishlanadi (eski
+    `frame_count % (SKIP_FRAMES + 1)` xatti-harakati). Adaptive rejimda
+    har bir qayta ishlangan frame vaqti o'lchanadi va qadam shunday
+    tanlanadiki, kirish oqimi TARGET_FPS tezlikda ushlab turilsin:
+        
+        stride >= ceil(frame_vaqti * TARGET_FPS)
+    
+    Budjet ichida qadam sahnaga qarab o'zgaradi: chiziq yaqinida obyektlar
+    bo'lsa - eng kichik ruxsat etilgan qadam, sahna bo'sh bo'lsa - eng katta.
+    """
+    
+    def __init__(self, base_stride=1, adaptive=None, target_fps=None,
+                 min_stride=None, max_stride=None, near_line_margin=None):
+        """
+        Args:
+            base_stride: Statik rejimdagi qadam (SKIP_FRAMES + 1)
+            adaptive: Adaptive rejim (default: config.ADAPTIVE_SKIP)
+            target_fps: Ushlab turiladigan kirish FPS (default: config.TARGET_FPS)
+            min_stride: Eng kichik qadam (default: config.MIN_STRIDE)
+            max_stride: Eng katta qadam (default: config.MAX_STRIDE)
+            near_line_margin: Chiziqqa "yaqin" masofa, frame balandligiga nisbatan
+        """
+        self.base_stride = max(1, base_stride)
+        self.adaptive = config.ADAPTIVE_SKIP if adaptive is None else adaptive
+        self.target_fps = target_fps or config.TARGET_FPS
+        self.min_stride = max(1, min_stride or config.MIN_STRIDE)
+        self.max_stride = max(self.min_stride, max_stride or config.MAX_STRIDE)
+        self.near_line_margin = (config.NEAR_LINE_MARGIN if near_line_margin is None
+                                 else near_line_margin)
+        
+        self.stride = self.base_stride
+        self.next_frame = self.stride
+        
+        # O'lchovlar
+        self.frame_time_ema = None
+        self.frames_seen = 0
+        self.frames_processed = 0
+        self.start_time = None
+    
+    def should_process(self, frame_index):
+        """
+        Shu frame qayta ishlanishi kerakmi
+        
+        Args:
+            frame_index: Frame tartib raqami (1 dan boshlab)
+        
+        Returns:
+            bool: Qayta ishlash kerak bo'lsa True
+        """
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+        
+        self.frames_seen = frame_index
+        
+        if not self.adaptive:
+            return frame_index % self.stride == 0
+        
+        if frame_index >= self.next_frame:
+            self.next_frame = frame_index + self.stride
+            return True
+        
+        return False
+    
+    def next_frame_index(self, frame_index):
+        """
+        Berilgan framedan keyin qayta ishlanadigan birinchi frame raqami
+        (should_process() holatini o'zgartirmaydi - seek uchun)
+        
+        Args:
+            frame_index: Oxirgi o'qilgan frame raqami
+        
+        Returns:
+            int: Keyingi tanlanadigan frame raqami
+        """
+        if not self.adaptive:
+            return (frame_index // self.stride + 1) * self.stride
+        
+        return max(self.next_frame, frame_index + 1)
+    
+    def update(self, frame_time, tracks=(), line_y=None, frame_height=None):
+        """
+        Qayta ishlangan frame natijasi bilan qadamni yangilash
+        
+        Args:
+            frame_time: Frameni qayta ishlash vaqti (sekund)
+            tracks: analyze_frame() natijasi [(object_id, class_name, bbox, conf), ...]
+            line_y: Sanash chizig'i Y koordinatasi
+            frame_height: Frame balandligi
+        """
+        self.frames_processed += 1
+        
+        # Eksponensial o'rtacha (shovqinni kamaytirish uchun)
+        alpha = config.ADAPTIVE_SMOOTHING
+        if self.frame_time_ema is None:
+            self.frame_time_ema = frame_time
+        else:
+            self.frame_time_ema = alpha * frame_time + (1 - alpha) * self.frame_time_ema
+        
+        if not self.adaptive:
+            return
+        
+        # Budjetni ushlab turish uchun eng kichik qadam
+        required = max(self.min_stride, math.ceil(self.frame_time_ema * self.target_fps))
+        
+        if not tracks:
+            # Bo'sh sahna - siyrak tekshirish
+            stride = self.max_stride
+        elif self._near_line(tracks, line_y, frame_height):
+            # Chiziq yaqinida obyekt bor - budjet ruxsat bergancha zich
+            stride = required
+        else:
+            stride = self.base_stride
+        
+        self.stride = min(self.max_stride, max(required, stride))
+    
+    def _near_line(self, tracks, line_y, frame_height):
+        """Kamida bitta obyekt chiziqqa yaqinmi"""
+        if line_y is None or frame_height is None:
+            return False
+        
+        margin = self.near_line_margin * frame_height
+        
+        for _, _, bbox, _ in tracks:
+            cy = (bbox[1] + bbox[3]) / 2.0
+            if abs(cy - line_y) <= margin:
+                return True
+        
+        return False
+    
+    def report(self):
+        """
+        Joriy qadam va erishilgan tezlik
+        
+        Returns:
+            dict: stride, latency_ms, input_fps, processed_fps
+        """
+        elapsed = time.perf_counter() - self.start_time if self.start_time else 0.0
+        
+        return {
+            'stride': self.stride,
+            'latency_ms': round((self.frame_time_ema or 0.0) * 1000, 2),
+            'input_fps': round(self.frames_seen / elapsed, 2) if elapsed else 0.0,
+            'processed_fps': round(self.frames_processed / elapsed, 2) if elapsed else 0.0,
+        }
@@ -0,0 +1,241 @@
+"""
+Object Counting System - Sun'iy Video Manbasi
+Kamera yoki video fayl o'rniga ishlatiladigan, harakatlanuvchi
+to'rtburchaklardan iborat sun'iy oqim (test va benchmark uchun)
+"""
+
+import cv2
+import numpy as np
+
+
+class SyntheticVideoSource:
+    """
+    cv2.VideoCapture bilan bir xil interfeysli sun'iy video manbasi
+    
+    Obyektlar vertikal harakatlanadi (sanash chizig'ini kesib o'tadi) va
+    kadrdan chiqqach qarama-qarshi tomondan qayta paydo bo'ladi. Har bir
+    o'qilgan frame uchun haqiqiy boxlar `last_detections` da saqlanadi.
+    """
+    
+    def __init__(self, width=1280, height=720, num_objects=10, num_frames=300,
+                 fps=30, speed=(2.0, 8.0), class_ids=(0, 2), seed=0):
+        """
+        Args:
+            width, height: Frame o'lchami
+            num_objects: Bir vaqtdagi obyektlar soni
+            num_frames: Framelar soni (None - cheksiz)
+            fps: Nominal FPS
+            speed: Vertikal tezlik oralig'i (pixel/frame)
+            class_ids: Obyektlarga beriladigan klass ID lari
+            seed: Tasodifiy generator urug'i
+        """
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+        self.fps = fps
+        self.frame_index = 0
+        self.last_detections = []
+        self._visible = np.zeros(0, dtype=np.int64)
+        
+        self._rng = np.random.default_rng(seed)
+        self._opened = True
+        
+        n = num_objects
+        self.sizes = self._rng.uniform(20, 60, size=(n, 2))
+        self.positions = np.column_stack([
+            self._rng.uniform(0, width - self.sizes[:, 0]),
+            self._rng.uniform(0, height - self.sizes[:, 1]),
+        ])
+        direction = self._rng.choice([-1.0, 1.0], size=n)
+        self.velocities = direction * self._rng.uniform(speed[0], speed[1], size=n)
+        self.class_ids = self._rng.choice(class_ids, size=n)
+        self.colors = self._rng.integers(80, 255, size=(n, 3))
+        
+        self._background = np.full((height, width, 3), 40, dtype=np.uint8)
+    
+    def isOpened(self):
+        return self._opened
+    
+    def _step(self):
+        """Obyektlarni bitta frame oldinga surish"""
+        self.positions[:, 1] += self.velocities
+        
+        # Kadrdan chiqqanlarni qarama-qarshi tomondan qaytarish
+        heights = self.sizes[:, 1]
+        below = self.positions[:, 1] > self.height
+        above = self.positions[:, 1] + heights < 0
+        self.positions[below, 1] = -heights[below]
+        self.positions[above, 1] = self.height
+    
+    def _current_boxes(self):
+        """Kadrga tushgan obyektlar indekslari va boxlari"""
+        x1 = self.positions[:, 0]
+        y1 = self.positions[:, 1]
+        x2 = x1 + self.sizes[:, 0]
+        y2 = y1 + self.sizes[:, 1]
+        
+        visible = np.flatnonzero((y2 > 0) & (y1 < self.height))
+        
+        boxes = [
+            (float(x1[i]), float(max(y1[i], 0)), float(x2[i]),
+             float(min(y2[i], self.height)), int(self.class_ids[i]), 1.0)
+            for i in visible
+        ]
+        
+        return visible, boxes
+    
+    def grab(self):
+        """Keyingi frameni tayyorlash (rasmni chizmasdan)"""
+        if not self._opened:
+            return False
+        
+        if self.num_frames is not None and self.frame_index >= self.num_frames:
+            return False
+        
+        if self.frame_index > 0:
+            self._step()
+        
+        self.frame_index += 1
+        self._visible, self.last_detections = self._current_boxes()
+        
+        return True
+    
+    def retrieve(self):
+        """Oxirgi grab() qilingan frameni chizish"""
+        frame = self._background.copy()
+        
+        for (x1, y1, x2, y2, _, _), i in zip(self.last_detections, self._visible):
+            color = tuple(int(c) for c in self.colors[i])
+            cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, -1)
+        
+        return True, frame
+    
+    def read(self):
+        """Keyingi frameni o'qish (cv2.VideoCapture.read bilan bir xil)"""
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+    
+    def get(self, prop):
+        """Video xususiyatlari (cv2.CAP_PROP_*)"""
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.num_frames or 0)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frame_index)
+        return 0.0
+    
+    def set(self, prop, value):
+        return False
+    
+    def release(self):
+        self._opened = False
+
+
+def write_synthetic_video(path, num_frames=300, num_objects=10, width=1280, height=720,
+                          fps=30, seed=0, fourcc='mp4v'):
+    """
+    SyntheticVideoSource framelarini video faylga yozish (decode narxini o'lchash uchun)
+    
+    Args:
+        path: Chiqish fayli (.mp4 yoki .avi)
+        num_frames, num_objects, width, height, fps, seed: SyntheticVideoSource ga qarang
+        fourcc: Kodek (masalan, 'mp4v' yoki H.264 uchun 'avc1')
+    
+    Returns:
+        str: Yozilgan fayl yo'li
+    """
+    source = SyntheticVideoSource(width=width, height=height, num_objects=num_objects,
+                                  num_frames=num_frames, fps=fps, seed=seed)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    
+    if not writer.isOpened():
+        raise ValueError(f"❌ Video yozuvchi ochilmadi (kodek: {fourcc})")
+    
+    try:
+        while True:
+            ret, frame = source.read()
+            if not ret:
+                break
+            writer.write(frame)
+    finally:
+        writer.release()
+    
+    return str(path)
+
+
+class _HostArray:
+    """torch tensorning .cpu().numpy() interfeysi (NumPy massiv uchun)"""
+    
+    def __init__(self, array):
+        self.array = array
+    
+    def cpu(self):
+        return self
+    
+    def numpy(self):
+        return self.array
+
+
+class _StubBoxes:
+    """ultralytics Boxes o'rnini bosuvchi (data: [x1, y1, x2, y2, conf, cls])"""
+    
+    def __init__(self, data):
+        self.data = _HostArray(data)
+    
+    def __len__(self):
+        return len(self.data.array)
+
+
+class _StubResult:
+    def __init__(self, data):
+        self.boxes = _StubBoxes(data)
+
+
+class StubDetector:
+    """
+    YOLO modeli o'rnini bosuvchi detector (model og'irliklari va tarmoqsiz)
+    
+    Sun'iy manbadagi to'rtburchaklarni fondan ajratib, konturlar orqali
+    topadi. ObjectCounter(model=StubDetector()) bilan ishlatiladi: chaqiruv
+    interfeysi va natija formati YOLO bilan bir xil, shuning uchun batch,
+    ROI va klass filtri o'zgarishsiz ishlaydi.
+    """
+    
+    def __init__(self, class_ids=(0, 2), threshold=60, min_area=50):
+        """
+        Args:
+            class_ids: Beriladigan klasslar - (keng obyekt, baland obyekt)
+            threshold: Fondan ajratish chegarasi (kulrang, 0-255)
+            min_area: Eng kichik box yuzasi (pixel)
+        """
+        self.class_ids = class_ids
+        self.threshold = threshold
+        self.min_area = min_area
+    
+    def _detect(self, frame, classes):
+        """Bitta frame uchun [x1, y1, x2, y2, conf, cls] massivi"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        _, mask = cv2.threshold(gray, self.threshold, 255, cv2.THRESH_BINARY)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        rows = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if w * h < self.min_area:
+                continue
+            class_id = self.class_ids[0] if w >= h else self.class_ids[-1]
+            if classes is None or class_id in classes:
+                rows.append((x, y, x + w, y + h, 1.0, class_id))
+        
+        return np.asarray(rows, dtype=np.float32).reshape(-1, 6)
+    
+    def __call__(self, frames, conf=None, iou=None, classes=None, verbose=False):
+        if not isinstance(frames, (list, tuple)):
+            frames = [frames]
+        return [_StubResult(self._detect(frame, classes)) for frame in frames]
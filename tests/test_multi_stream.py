@@ -0,0 +1,79 @@
+"""
+Object Counting System - Ko'p Oqimli Rejim Testi
+Ikkita sun'iy oqim bitta stub detector bilan: model ulashiladi, har bir
+oqimning tracker'i va statistikasi alohida.
+
+Ishlatish:
+    python -m pytest tests/test_multi_stream.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from multi_stream import MultiStreamCounter
+from synthetic import StubDetector
+
+
+ITERATIONS = 150
+
+
+class CountingDetector(StubDetector):
+    """StubDetector + chaqiruvlar va batch hajmlarini yozib borish"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_sizes = []
+    
+    def __call__(self, frames, **kwargs):
+        self.batch_sizes.append(len(frames))
+        return super().__call__(frames, **kwargs)
+
+
+@pytest.fixture
+def multi_counter(monkeypatch):
+    """Ikkita sun'iy oqim (5 va 20 obyekt), fayl va bazaga yozishsiz"""
+    monkeypatch.setattr(config, 'SAVE_STATISTICS', False)
+    monkeypatch.setattr(config, 'EVENT_LOG', False)
+    monkeypatch.setattr(config, 'METRICS_ENABLED', False)
+    monkeypatch.setattr(config, 'MOTION_GATING', False)
+    monkeypatch.setattr(config, 'ROI', None)
+    
+    model = CountingDetector(class_ids=tuple(config.COUNT_CLASSES)[:2])
+    multi_counter = MultiStreamCounter(['synthetic:5', 'synthetic:20'], model=model)
+    yield multi_counter
+    multi_counter.release()
+
+
+def test_model_is_shared(multi_counter):
+    model = multi_counter.streams[0].counter.model
+    
+    assert isinstance(model, CountingDetector)
+    assert all(stream.counter.model is model for stream in multi_counter.streams)
+    
+    multi_counter.run(display=False, max_iterations=ITERATIONS)
+    
+    # Har bir iteratsiyada ikkala oqim bitta forward pass'da
+    assert model.batch_sizes == [2] * ITERATIONS
+
+
+def test_streams_keep_own_stats(multi_counter):
+    first, second = multi_counter.streams
+    
+    assert first.counter is not second.counter
+    assert first.counter.tracker is not second.counter.tracker
+    assert first.counter.stats is not second.counter.stats
+    
+    stats = multi_counter.run(display=False, max_iterations=ITERATIONS)
+    
+    assert set(stats) == {'stream0', 'stream1'}
+    assert first.frames == second.frames == ITERATIONS
+    
+    # Zichroq oqim ko'proq sanaydi; bitta oqimning o'tishlari boshqasiga tushmaydi
+    total = {name: sum(counts.values()) for name, counts in stats.items()}
+    assert 0 < total['stream0'] < total['stream1']
+    assert first.counter.tracker.next_object_id < second.counter.tracker.next_object_id
@@ -6,10 +6,22 @@ Video ishlash, chizish va boshqa utility funksiyalar
 import cv2
 import numpy as np
 from datetime import datetime
-import pandas as pd
+from functools import lru_cache
 from pathlib import Path
 import config
 
+# scipy, filterpy va pandas faqat kerakli yo'lda import qilinadi (tez ishga tushish uchun)
+
+
+# Hungarian usulida ruxsat etilmagan juftliklar narxi
+_GATED_COST = 1e9
+
+# ArrayObjectTracker: shundan kam juftlikda to'liq masofalar matritsasi arzonroq
+_DENSE_PAIRS = 4096
+
+# ArrayObjectTracker: birinchi bosqich radiusi (max_distance ulushi)
+_NEAR_FRACTION = 0.25
+
 
 class ObjectTracker:
     """
@@ -17,36 +29,157 @@ class ObjectTracker:
     Bu klass har bir obyektga unique ID beradi va ularni kuzatib boradi
     """
     
-    def __init__(self, max_disappeared=50, max_distance=50):
+    def __init__(self, max_disappeared=50, max_distance=50, assignment="greedy",
+                 max_objects=None, on_deregister=None):
         """
         Args:
             max_disappeared: Obyekt yo'qolganidan keyin necha frame kutish
             max_distance: Tracking uchun maksimal masofa
+            assignment: Moslashtirish usuli - "greedy" (eng yaqin juftlik)
+                yoki "hungarian" (global optimal, linear_sum_assignment)
+            max_objects: Bir vaqtda kuzatiladigan obyektlar chegarasi (None - cheksiz).
+                To'lganda eng uzoq ko'rinmagan obyekt chiqarib yuboriladi; shu
+                update() da ko'rilgan obyektlar chiqarilmaydi - joy bo'lmasa
+                ortiqcha detectionlar tashlab yuboriladi
+            on_deregister: Obyekt o'chirilganda chaqiriladigan funksiya (object_id)
         """
+        if assignment not in ("greedy", "hungarian"):
+            raise ValueError(f"❌ Noma'lum assignment usuli: {assignment}")
+        
         self.next_object_id = 0
         self.objects = {}  # ID: centroid
         self.disappeared = {}  # ID: disappeared frames soni
         self.max_disappeared = max_disappeared
         self.max_distance = max_distance
+        self.assignment = assignment
+        self.max_objects = max_objects
+        self.on_deregister = on_deregister
+        self._cap_warned = False
     
     def register(self, centroid):
-        """Yangi obyektni ro'yxatdan o'tkazish"""
+        """
+        Yangi obyektni ro'yxatdan o'tkazish
+        
+        Returns:
+            int yoki None: Yangi ID; chegara to'lgan va barcha obyektlar shu
+                update() da ko'rilgan bo'lsa (disappeared == 0) None
+        """
+        if self.max_objects is not None and len(self.objects) >= self.max_objects:
+            self._warn_cap()
+            # Eng uzoq vaqt ko'rinmagan obyektni chiqarib yuborish
+            oldest = max(self.disappeared, key=self.disappeared.get)
+            if self.disappeared[oldest] == 0:
+                return None
+            self.deregister(oldest)
+        
         self.objects[self.next_object_id] = centroid
         self.disappeared[self.next_object_id] = 0
         self.next_object_id += 1
         return self.next_object_id - 1
     
+    def _warn_cap(self):
+        """Chegara birinchi marta to'lganda bir martalik ogohlantirish"""
+        if not self._cap_warned:
+            self._cap_warned = True
+            print(f"⚠️  Kuzatish chegarasi to'ldi ({self.max_objects} ta obyekt): "
+                  f"eng eski obyektlar chiqarilmoqda, ortiqcha detectionlar tashlanadi")
+    
     def deregister(self, object_id):
         """Obyektni ro'yxatdan o'chirish"""
         del self.objects[object_id]
         del self.disappeared[object_id]
+        
+        if self.on_deregister is not None:
+            self.on_deregister(object_id)
+    
+    @staticmethod
+    def _distance_matrix(object_centroids, input_centroids):
+        """
+        Obyektlar va detectionlar orasidagi Evklid masofalari
+        
+        Returns:
+            np.ndarray: (obyektlar soni, detectionlar soni) matritsa
+        """
+        objects = np.asarray(object_centroids, dtype=np.float64)
+        inputs = np.asarray(input_centroids, dtype=np.float64)
+        
+        # Har bir o'q alohida - (N, M, 2) oraliq massiv yaratilmaydi
+        dx = objects[:, 0, None] - inputs[None, :, 0]
+        dy = objects[:, 1, None] - inputs[None, :, 1]
+        dx *= dx
+        dy *= dy
+        dx += dy
+        return np.sqrt(dx, out=dx)
+    
+    def _match(self, distances):
+        """
+        Obyektlarni detectionlarga moslashtirish
+        max_distance dan uzoq juftliklar moslashtirishdan oldin chiqarib tashlanadi
+        
+        Args:
+            distances: _distance_matrix() natijasi
+        
+        Returns:
+            list: [(row, col), ...] - moslashgan juftliklar
+        """
+        if self.assignment == "hungarian":
+            from scipy.optimize import linear_sum_assignment
+            
+            gate = distances <= self.max_distance
+            
+            # Faqat kamida bitta nomzodi bor qator/ustunlar bilan ishlash
+            rows_idx = np.flatnonzero(gate.any(axis=1))
+            cols_idx = np.flatnonzero(gate.any(axis=0))
+            
+            if len(rows_idx) == 0 or len(cols_idx) == 0:
+                return []
+            
+            sub = distances[np.ix_(rows_idx, cols_idx)]
+            sub_gate = gate[np.ix_(rows_idx, cols_idx)]
+            cost = np.where(sub_gate, sub, _GATED_COST)
+            
+            rows, cols = linear_sum_assignment(cost)
+            keep = sub_gate[rows, cols]
+            
+            return list(zip(rows_idx[rows[keep]].tolist(), cols_idx[cols[keep]].tolist()))
+        
+        # Greedy: ruxsat etilgan barcha juftliklar eng yaqinidan boshlab - obyektning
+        # eng yaqin detectioni band bo'lsa, keyingisi olinadi (zich sahnada ID almashmaydi)
+        rows, cols = np.nonzero(distances <= self.max_distance)
+        order = np.lexsort((cols, rows, distances[rows, cols]))
+        
+        return self._greedy_pairs(rows[order], cols[order])
     
-    def update(self, detections):
+    @staticmethod
+    def _greedy_pairs(rows, cols):
+        """
+        Masofa bo'yicha saralangan (row, col) nomzodlaridan band bo'lmaganlarini olish
+        
+        Returns:
+            list: [(row, col), ...] - moslashgan juftliklar
+        """
+        used_rows = set()
+        used_cols = set()
+        matches = []
+        
+        for (row, col) in zip(rows.tolist(), cols.tolist()):
+            if row in used_rows or col in used_cols:
+                continue
+            
+            matches.append((row, col))
+            used_rows.add(row)
+            used_cols.add(col)
+        
+        return matches
+    
+    def update(self, detections, frame_gap=1):
         """
         Obyektlarni yangilash va kuzatish
         
         Args:
             detections: [(x1, y1, x2, y2, class_id, confidence), ...]
+            frame_gap: Oldingi update() dan beri o'tgan framelar soni
+                (bashorat qiluvchi trackerlar uchun; bu yerda ishlatilmaydi)
         
         Returns:
             dict: {object_id: (centroid, class_id, bbox)}
@@ -77,6 +210,8 @@ class ObjectTracker:
             result = {}
             for i, centroid in enumerate(input_centroids):
                 obj_id = self.register(centroid)
+                if obj_id is None:
+                    break
                 det, class_id = input_data[i]
                 result[obj_id] = (centroid, class_id, det[:4])
             return result
@@ -85,35 +220,14 @@ class ObjectTracker:
         object_ids = list(self.objects.keys())
         object_centroids = list(self.objects.values())
         
-        # Masofalarni hisoblash
-        distances = []
-        for obj_centroid in object_centroids:
-            row = []
-            for input_centroid in input_centroids:
-                dist = np.sqrt(
-                    (obj_centroid[0] - input_centroid[0]) ** 2 +
-                    (obj_centroid[1] - input_centroid[1]) ** 2
-                )
-                row.append(dist)
-            distances.append(row)
-        
-        distances = np.array(distances)
-        
-        # Eng yaqin juftliklarni topish
-        rows = distances.min(axis=1).argsort()
-        cols = distances.argmin(axis=1)[rows]
+        # Masofalar matritsasi (NumPy broadcasting)
+        distances = self._distance_matrix(object_centroids, input_centroids)
         
         used_rows = set()
         used_cols = set()
         result = {}
         
-        for (row, col) in zip(rows, cols):
-            if row in used_rows or col in used_cols:
-                continue
-            
-            if distances[row, col] > self.max_distance:
-                continue
-            
+        for (row, col) in self._match(distances):
             object_id = object_ids[row]
             self.objects[object_id] = input_centroids[col]
             self.disappeared[object_id] = 0
@@ -126,7 +240,7 @@ class ObjectTracker:
         
         # Unused rows - disappeared obyektlar
         unused_rows = set(range(distances.shape[0])) - used_rows
-        for row in unused_rows:
+        for row in sorted(unused_rows):
             object_id = object_ids[row]
             self.disappeared[object_id] += 1
             
@@ -135,14 +249,414 @@ class ObjectTracker:
         
         # Unused cols - yangi obyektlar
         unused_cols = set(range(distances.shape[1])) - used_cols
-        for col in unused_cols:
+        for col in sorted(unused_cols):
             obj_id = self.register(input_centroids[col])
+            if obj_id is None:
+                break
             det, class_id = input_data[col]
             result[obj_id] = (input_centroids[col], class_id, det[:4])
         
         return result
 
 
+class ArrayObjectTracker(ObjectTracker):
+    """
+    ObjectTracker ning NumPy massivlariga asoslangan varianti (struct-of-arrays)
+    
+    ID, centroid, box, klass va yo'qolish yoshi oldindan ajratilgan
+    massivlarda saqlanadi; bo'shagan slotlar qayta ishlatiladi. update()
+    har bir obyekt uchun dict yozuvlari o'rniga bir nechta vektor
+    amallaridan iborat. update() shartnomasi va natijalari ObjectTracker
+    bilan bir xil (ObjectCounter uchun to'g'ridan-to'g'ri almashtirish).
+    """
+    
+    def __init__(self, max_disappeared=50, max_distance=50, assignment="greedy",
+                 max_objects=None, on_deregister=None, capacity=64):
+        """
+        Args:
+            max_disappeared, max_distance, assignment, max_objects, on_deregister:
+                ObjectTracker bilan bir xil
+            capacity: Boshlang'ich slotlar soni (to'lganda ikki barobar oshiriladi)
+        """
+        if assignment not in ("greedy", "hungarian"):
+            raise ValueError(f"❌ Noma'lum assignment usuli: {assignment}")
+        
+        self.next_object_id = 0
+        self.max_disappeared = max_disappeared
+        self.max_distance = max_distance
+        self.assignment = assignment
+        self.max_objects = max_objects
+        self.on_deregister = on_deregister
+        self._cap_warned = False
+        
+        self._ids = np.full(capacity, -1, dtype=np.int64)  # -1 - bo'sh slot
+        self._centroids = np.zeros((capacity, 2), dtype=np.int64)
+        self._boxes = np.zeros((capacity, 4), dtype=np.float64)
+        self._class_ids = np.zeros(capacity, dtype=np.int64)
+        self._ages = np.zeros(capacity, dtype=np.int64)  # disappeared frames soni
+        self._free = list(range(capacity - 1, -1, -1))
+    
+    def __len__(self):
+        return len(self._ids) - len(self._free)
+    
+    @property
+    def objects(self):
+        """{ID: centroid} (ObjectTracker bilan moslik uchun)"""
+        slots = self._active_slots()
+        return dict(zip(self._ids[slots].tolist(), map(tuple, self._centroids[slots].tolist())))
+    
+    @property
+    def disappeared(self):
+        """{ID: disappeared frames soni} (ObjectTracker bilan moslik uchun)"""
+        slots = self._active_slots()
+        return dict(zip(self._ids[slots].tolist(), self._ages[slots].tolist()))
+    
+    def _active_slots(self):
+        """Band slotlar, ID bo'yicha tartiblangan (ObjectTracker dict tartibi)"""
+        slots = np.flatnonzero(self._ids >= 0)
+        return slots[np.argsort(self._ids[slots], kind='stable')]
+    
+    def _grow(self):
+        """Slotlar sonini ikki barobar oshirish"""
+        capacity = len(self._ids)
+        
+        self._ids = np.concatenate([self._ids, np.full(capacity, -1, dtype=np.int64)])
+        self._centroids = np.concatenate([self._centroids, np.zeros_like(self._centroids)])
+        self._boxes = np.concatenate([self._boxes, np.zeros_like(self._boxes)])
+        self._class_ids = np.concatenate([self._class_ids, np.zeros_like(self._class_ids)])
+        self._ages = np.concatenate([self._ages, np.zeros_like(self._ages)])
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+    
+    def register(self, centroid, bbox=(0, 0, 0, 0), class_id=0):
+        """
+        Yangi obyektni ro'yxatdan o'tkazish
+        
+        Returns:
+            int yoki None: Yangi ID (chegara to'lganda ObjectTracker.register() ga qarang)
+        """
+        if self.max_objects is not None and len(self) >= self.max_objects:
+            self._warn_cap()
+            # Eng uzoq vaqt ko'rinmagan obyektni chiqarib yuborish
+            slots = self._active_slots()
+            oldest = slots[np.argmax(self._ages[slots])]
+            if self._ages[oldest] == 0:
+                return None
+            self._release(oldest)
+        
+        if not self._free:
+            self._grow()
+        
+        slot = self._free.pop()
+        self._ids[slot] = self.next_object_id
+        self._centroids[slot] = centroid
+        self._boxes[slot] = bbox
+        self._class_ids[slot] = class_id
+        self._ages[slot] = 0
+        
+        self.next_object_id += 1
+        return self.next_object_id - 1
+    
+    def deregister(self, object_id):
+        """Obyektni ro'yxatdan o'chirish"""
+        slots = np.flatnonzero(self._ids == object_id)
+        if len(slots) == 0:
+            raise KeyError(object_id)
+        self._release(slots[0])
+    
+    def _release(self, slot):
+        """Slotni bo'shatish"""
+        object_id = int(self._ids[slot])
+        self._ids[slot] = -1
+        self._free.append(int(slot))
+        
+        if self.on_deregister is not None:
+            self.on_deregister(object_id)
+    
+    def _age(self, slots):
+        """Ko'rinmagan obyektlar yoshini oshirish va muddati o'tganlarini o'chirish"""
+        self._ages[slots] += 1
+        
+        for slot in slots[self._ages[slots] > self.max_disappeared]:
+            self._release(slot)
+    
+    def _nearby_pairs(self, object_centroids, input_centroids, radius):
+        """
+        `radius` ichidagi barcha (obyekt, detection) juftliklari
+        
+        To'liq (N, M) masofalar matritsasi o'rniga detectionlar `radius`
+        o'lchamli katakchalarga ajratiladi va har bir obyekt uchun faqat
+        qo'shni 3x3 katakchadagilar tekshiriladi.
+        
+        Returns:
+            tuple: (rows, cols, distances) massivlari
+        """
+        cell = max(float(radius), 1.0)
+        object_cells = np.floor_divide(object_centroids, cell).astype(np.int64)
+        input_cells = np.floor_divide(input_centroids, cell).astype(np.int64)
+        
+        # Katakcha kaliti: qator * kenglik + ustun (qo'shni ustunlar ketma-ket kalitlar)
+        origin = np.minimum(object_cells.min(axis=0), input_cells.min(axis=0)) - 1
+        object_cells -= origin
+        input_cells -= origin
+        width = int(max(object_cells[:, 0].max(), input_cells[:, 0].max())) + 2
+        
+        keys = input_cells[:, 1] * width + input_cells[:, 0]
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        
+        rows, cols = [], []
+        for dy in (-1, 0, 1):
+            row_keys = (object_cells[:, 1] + dy) * width + object_cells[:, 0]
+            lo = np.searchsorted(keys, row_keys - 1, side='left')
+            hi = np.searchsorted(keys, row_keys + 1, side='right')
+            counts = hi - lo
+            
+            # Har bir obyekt uchun lo..hi oralig'idagi nomzodlar (tekis ro'yxat)
+            band_rows = np.repeat(np.arange(len(object_centroids)), counts)
+            starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+            rows.append(band_rows)
+            cols.append(order[starts + np.arange(len(band_rows))])
+        
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        
+        delta = (object_centroids[rows] - input_centroids[cols]).astype(np.float64)
+        distances = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+        
+        keep = distances <= radius
+        return rows[keep], cols[keep], distances[keep]
+    
+    def _match_nearby(self, object_centroids, input_centroids):
+        """
+        Greedy moslashtirish faqat max_distance ichidagi juftliklar bo'yicha
+        
+        Ikki bosqichda: avval kichik radius (max_distance * _NEAR_FRACTION)
+        ichidagi juftliklar, keyin faqat bo'sh qolgan obyekt va detectionlar
+        orasida max_distance gacha. Greedy juftliklarni masofa tartibida
+        olgani uchun natija _match() ning greedy rejimi bilan bir xil, lekin
+        zich sahnada nomzodlar soni obyektlar soniga chiziqli bog'liq.
+        
+        Returns:
+            list: [(row, col), ...] - moslashgan juftliklar
+        """
+        rows, cols, distances = self._nearby_pairs(object_centroids, input_centroids,
+                                                   self.max_distance * _NEAR_FRACTION)
+        
+        # Masofa, keyin qator va ustun tartibida (_match() bilan bir xil)
+        order = np.lexsort((cols, rows, distances))
+        matches = self._greedy_pairs(rows[order], cols[order])
+        
+        # Bo'sh qolganlar orasida kichik radiusdagi juftlik yo'q (greedy olgan bo'lardi)
+        free_rows = np.ones(len(object_centroids), dtype=bool)
+        free_cols = np.ones(len(input_centroids), dtype=bool)
+        free_rows[[row for row, _ in matches]] = False
+        free_cols[[col for _, col in matches]] = False
+        free_rows = np.flatnonzero(free_rows)
+        free_cols = np.flatnonzero(free_cols)
+        
+        if len(free_rows) == 0 or len(free_cols) == 0:
+            return matches
+        
+        rows, cols, distances = self._nearby_pairs(object_centroids[free_rows],
+                                                   input_centroids[free_cols],
+                                                   self.max_distance)
+        order = np.lexsort((cols, rows, distances))
+        
+        return matches + self._greedy_pairs(free_rows[rows[order]], free_cols[cols[order]])
+    
+    def update(self, detections, frame_gap=1):
+        """
+        Obyektlarni yangilash va kuzatish
+        
+        Args:
+            detections: [(x1, y1, x2, y2, class_id, confidence), ...]
+            frame_gap: Oldingi update() dan beri o'tgan framelar soni
+                (bashorat qiluvchi trackerlar uchun; bu yerda ishlatilmaydi)
+        
+        Returns:
+            dict: {object_id: (centroid, class_id, bbox)}
+        """
+        active = self._active_slots()
+        
+        # Agar detection bo'lmasa
+        if len(detections) == 0:
+            self._age(active)
+            return {}
+        
+        boxes = np.array([det[:4] for det in detections], dtype=np.float64)
+        class_ids = [det[4] for det in detections]
+        input_centroids = ((boxes[:, :2] + boxes[:, 2:]) / 2.0).astype(np.int64)
+        centroid_tuples = list(map(tuple, input_centroids.tolist()))
+        
+        result = {}
+        
+        if len(active) == 0:
+            matches = []
+        elif self.assignment == "greedy" and len(active) * len(detections) > _DENSE_PAIRS:
+            matches = self._match_nearby(self._centroids[active], input_centroids)
+        else:
+            matches = self._match(self._distance_matrix(self._centroids[active], input_centroids))
+        
+        matched_rows = np.array([row for row, _ in matches], dtype=np.int64)
+        matched_cols = np.array([col for _, col in matches], dtype=np.int64)
+        
+        # Moslashgan obyektlar - bitta vektor amali bilan yangilash
+        if len(matches):
+            slots = active[matched_rows]
+            self._centroids[slots] = input_centroids[matched_cols]
+            self._boxes[slots] = boxes[matched_cols]
+            self._class_ids[slots] = np.asarray(class_ids)[matched_cols]
+            self._ages[slots] = 0
+            
+            for object_id, col in zip(self._ids[slots].tolist(), matched_cols.tolist()):
+                result[object_id] = (centroid_tuples[col], class_ids[col], detections[col][:4])
+        
+        # Moslashmagan obyektlar - disappeared
+        unmatched = np.ones(len(active), dtype=bool)
+        unmatched[matched_rows] = False
+        self._age(active[unmatched])
+        
+        # Moslashmagan detectionlar - yangi obyektlar
+        new_cols = np.ones(len(detections), dtype=bool)
+        new_cols[matched_cols] = False
+        
+        for col in np.flatnonzero(new_cols).tolist():
+            obj_id = self.register(input_centroids[col], boxes[col], class_ids[col])
+            if obj_id is None:
+                break
+            result[obj_id] = (centroid_tuples[col], class_ids[col], detections[col][:4])
+        
+        return result
+
+
+class KalmanObjectTracker(ObjectTracker):
+    """
+    Harakatni bashorat qiluvchi (Kalman) tracker
+    
+    Har bir obyekt uchun doimiy tezlik modeli (x, y, vx, vy) saqlanadi.
+    Moslashtirishdan oldin har bir obyekt joriy framega ekstrapolyatsiya
+    qilinadi, shuning uchun framelar o'tkazib yuborilganda (SKIP_FRAMES)
+    tez obyektlar ham o'z ID sini saqlaydi. Tezligi hali noma'lum yangi
+    obyektlar uchun ruxsat etilgan masofa noaniqlikka qarab kengayadi.
+    """
+    
+    def __init__(self, max_disappeared=50, max_distance=50, assignment="greedy",
+                 max_objects=None, on_deregister=None, velocity_std=None,
+                 process_noise=None, measurement_noise=None):
+        """
+        Args:
+            max_disappeared, max_distance, assignment, max_objects, on_deregister:
+                ObjectTracker bilan bir xil (max_distance - bashoratdan chetlanish)
+            velocity_std: Yangi obyekt tezligining boshlang'ich noaniqligi (pixel/frame)
+            process_noise: Tezlanish shovqini (pixel/frame^2)
+            measurement_noise: Detection markazining xatosi (pixel)
+        """
+        super().__init__(max_disappeared, max_distance, assignment,
+                         max_objects, on_deregister)
+        
+        self.velocity_std = velocity_std or config.KALMAN_VELOCITY_STD
+        self.process_noise = process_noise or config.KALMAN_PROCESS_NOISE
+        self.measurement_noise = measurement_noise or config.KALMAN_MEASUREMENT_NOISE
+        
+        self.filters = {}  # ID: KalmanFilter
+        self.hits = {}  # ID: moslashgan detectionlar soni
+        self._gate_scale = np.ones(0)
+        self._transitions = {}  # frame_gap: (F, Q)
+    
+    def _create_filter(self, centroid):
+        """Yangi obyekt uchun Kalman filtri (tezlik noma'lum)"""
+        from filterpy.kalman import KalmanFilter
+        
+        kf = KalmanFilter(dim_x=4, dim_z=2)
+        kf.x = np.array([centroid[0], centroid[1], 0.0, 0.0])
+        kf.H = np.array([[1.0, 0.0, 0.0, 0.0],
+                         [0.0, 1.0, 0.0, 0.0]])
+        kf.R = np.eye(2) * self.measurement_noise ** 2
+        kf.P = np.diag([self.measurement_noise ** 2] * 2 + [self.velocity_std ** 2] * 2)
+        return kf
+    
+    def _transition(self, frame_gap):
+        """frame_gap frame uchun o'tish matritsasi va jarayon shovqini (keshlanadi)"""
+        if frame_gap not in self._transitions:
+            from filterpy.common import Q_discrete_white_noise
+            
+            F = np.eye(4)
+            F[0, 2] = F[1, 3] = frame_gap
+            Q = Q_discrete_white_noise(dim=2, dt=frame_gap, var=self.process_noise ** 2,
+                                       block_size=2, order_by_dim=False)
+            self._transitions[frame_gap] = (F, Q)
+        
+        return self._transitions[frame_gap]
+    
+    def register(self, centroid):
+        """Yangi obyektni ro'yxatdan o'tkazish"""
+        object_id = super().register(centroid)
+        if object_id is None:
+            return None
+        self.filters[object_id] = self._create_filter(centroid)
+        self.hits[object_id] = 1
+        return object_id
+    
+    def deregister(self, object_id):
+        """Obyektni ro'yxatdan o'chirish"""
+        del self.filters[object_id]
+        del self.hits[object_id]
+        super().deregister(object_id)
+    
+    def _predict(self, frame_gap):
+        """Barcha obyektlarni joriy framega ekstrapolyatsiya qilish"""
+        F, Q = self._transition(frame_gap)
+        gates = np.empty(len(self.filters))
+        
+        for i, (object_id, kf) in enumerate(self.filters.items()):
+            kf.predict(F=F, Q=Q)
+            self.objects[object_id] = (kf.x[0], kf.x[1])
+            
+            if self.hits[object_id] > 1:
+                gates[i] = self.max_distance
+                continue
+            
+            # Tezligi hali noma'lum (bir marta ko'rilgan) obyekt - noaniqlikka
+            # qarab kengroq oraliq, lekin frame_gap qadamdagi eng katta siljishdan oshmaydi
+            position_std = np.sqrt(max(kf.P[0, 0], kf.P[1, 1]))
+            gates[i] = min(max(self.max_distance, config.KALMAN_GATE_SIGMA * position_std),
+                           self.max_distance * frame_gap)
+        
+        self._gate_scale = self.max_distance / gates
+    
+    def _distance_matrix(self, object_centroids, input_centroids):
+        """
+        Bashorat qilingan pozitsiyalargacha masofalar, har bir obyekt
+        oralig'iga normallashtirilgan (max_distance bilan solishtiriladi)
+        """
+        distances = ObjectTracker._distance_matrix(object_centroids, input_centroids)
+        return distances * self._gate_scale[:, None]
+    
+    def update(self, detections, frame_gap=1):
+        """
+        Obyektlarni bashorat qilish, yangilash va kuzatish
+        
+        Args:
+            detections: [(x1, y1, x2, y2, class_id, confidence), ...]
+            frame_gap: Oldingi update() dan beri o'tgan framelar soni
+        
+        Returns:
+            dict: {object_id: (centroid, class_id, bbox)}
+        """
+        self._predict(max(1, frame_gap))
+        
+        previous_ids = set(self.filters)
+        result = super().update(detections)
+        
+        # Moslashgan obyektlar filtrini o'lchov bilan tuzatish
+        for object_id, (centroid, _, _) in result.items():
+            if object_id in previous_ids:
+                self.filters[object_id].update(np.asarray(centroid, dtype=np.float64))
+                self.hits[object_id] += 1
+        
+        return result
+
+
 def draw_counting_line(frame, position=0.5):
     """
     Sanash chizig'ini chizish
@@ -167,6 +681,20 @@ def draw_counting_line(frame, position=0.5):
     return frame, line_y
 
 
+def draw_roi(frame, rect):
+    """
+    Detection hududini (ROI) chizish
+    
+    Args:
+        frame: Video frame
+        rect: (x1, y1, x2, y2)
+    """
+    x1, y1, x2, y2 = rect
+    cv2.rectangle(frame, (x1, y1), (x2 - 1, y2 - 1), config.ROI_COLOR, 1)
+    
+    return frame
+
+
 def draw_detection(frame, bbox, object_id, class_name, confidence):
     """
     Obyekt atrofiga box va ma'lumotlarni chizish
@@ -205,33 +733,78 @@ def draw_statistics(frame, stats):
     """
     Statistikani ekranga chizish
     
+    Faqat panel hududi qoraytiriladi (butun frame nusxalanmaydi), matn
+    qatorlari esa bir marta rasterlanib keshlanadi - qator faqat undagi
+    son o'zgarganda qayta chiziladi.
+    
     Args:
         frame: Video frame
         stats: Statistika dict
     """
     height, width = frame.shape[:2]
     
-    # Background panel
-    panel_height = 150
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (10, 10), (400, panel_height), (0, 0, 0), -1)
-    cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+    # Background panel (faqat panel hududini qoraytirish)
+    x1, y1, x2, y2 = _STATS_PANEL
+    panel = frame[y1:min(y2 + 1, height), x1:min(x2 + 1, width)]
+    cv2.convertScaleAbs(panel, panel, alpha=1.0 - _STATS_PANEL_OPACITY)
     
     # Title
-    cv2.putText(frame, "STATISTIKA", (20, 35),
-                config.FONT, 0.8, (0, 255, 255), 2)
+    _blit_text(frame, "STATISTIKA", (20, 35), 0.8, (0, 255, 255), 2)
     
     # Statistikani ko'rsatish
     y_offset = 65
     for class_name, count in stats.items():
         text = f"{class_name}: {count}"
-        cv2.putText(frame, text, (20, y_offset),
-                    config.FONT, 0.6, (255, 255, 255), 1)
+        _blit_text(frame, text, (20, y_offset), 0.6, (255, 255, 255), 1)
         y_offset += 25
     
     return frame
 
 
+# Statistika paneli: (x1, y1, x2, y2) va qoraytirish darajasi
+_STATS_PANEL = (10, 10, 400, 150)
+_STATS_PANEL_OPACITY = 0.6
+
+
+@lru_cache(maxsize=1024)
+def _rasterize_text(text, scale, thickness):
+    """
+    Matnni bir marta rasterlash (keshlanadi)
+    
+    Returns:
+        tuple: (dy, dx, alpha) - origin'ga nisbatan piksel koordinatalari
+            va har bir pikselning qoplanishi (0.0 - 1.0)
+    """
+    (text_w, text_h), baseline = cv2.getTextSize(text, config.FONT, scale, thickness)
+    pad = thickness + 2
+    canvas = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad), dtype=np.uint8)
+    origin = (pad, text_h + pad)
+    
+    cv2.putText(canvas, text, origin, config.FONT, scale, 255, thickness)
+    
+    dy, dx = np.nonzero(canvas)
+    alpha = (canvas[dy, dx].astype(np.float32) / 255.0)[:, None]
+    
+    return dy - origin[1], dx - origin[0], alpha
+
+
+def _blit_text(frame, text, origin, scale, color, thickness):
+    """Keshlangan matnni framega chizish (cv2.putText bilan bir xil natija)"""
+    dy, dx, alpha = _rasterize_text(text, scale, thickness)
+    height, width = frame.shape[:2]
+    
+    ys = dy + origin[1]
+    xs = dx + origin[0]
+    
+    inside = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+    if not inside.all():
+        ys, xs, alpha = ys[inside], xs[inside], alpha[inside]
+    
+    pixels = frame[ys, xs].astype(np.float32)
+    pixels += (np.asarray(color, dtype=np.float32) - pixels) * alpha
+    frame[ys, xs] = pixels.round().astype(np.uint8)
+
+
 def save_statistics_to_csv(stats, filename):
     """
     Statistikani CSV faylga saqlash
@@ -240,6 +813,8 @@ def save_statistics_to_csv(stats, filename):
         stats: Statistika dictionary
         filename: Fayl nomi
     """
+    import pandas as pd
+    
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     data = {
@@ -248,6 +823,7 @@ def save_statistics_to_csv(stats, filename):
     }
     
     df = pd.DataFrame(data)
+    config.ensure_directories()
     filepath = config.OUTPUT_DIR / filename
     
     # Agar fayl mavjud bo'lsa, qo'shish, aks holda yangi yaratish
@@ -259,32 +835,6 @@ def save_statistics_to_csv(stats, filename):
     print(f"✅ Statistika saqlandi: {filepath}")
 
 
-def get_video_writer(input_video_path, output_video_path):
-    """
-    Video yozuvchi yaratish
-    
-    Args:
-        input_video_path: Kirish video fayli
-        output_video_path: Chiqish video fayli
-    
-    Returns:
-        tuple: (VideoWriter, fps, frame_count)
-    """
-    cap = cv2.VideoCapture(input_video_path)
-    
-    fps = int(cap.get(cv2.CAP_PROP_FPS))
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_video_path, fourcc, fps, (width, height))
-    
-    cap.release()
-    
-    return out, fps, frame_count
-
-
 def format_time(seconds):
     """
     Sekundlarni soat:daqiqa:soniya formatiga o'tkazish
@@ -0,0 +1,237 @@
+"""
+Object Counting System - Video Yozuvchi
+Natija videosini fon oqimida kodlash (asosiy sikl kodlashni kutmaydi) va
+chiqish FPS ini qayta ishlangan framelar tezligiga moslash.
+
+Backendlar:
+    opencv - cv2.VideoWriter (fourcc: VIDEO_FOURCC)
+    ffmpeg - imageio-ffmpeg orqali ffmpeg jarayoniga pipe (kodek, CRF, preset)
+"""
+
+import queue
+import threading
+import time
+
+import cv2
+import config
+
+
+# Navbatni yopish belgisi
+_END = object()
+
+
+class _OpenCVBackend:
+    """cv2.VideoWriter"""
+    
+    name = 'opencv'
+    
+    def __init__(self, path, fps, frame_size, fourcc=None):
+        fourcc = fourcc or config.VIDEO_FOURCC
+        self.writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc),
+                                      fps, frame_size)
+        if not self.writer.isOpened():
+            raise ValueError(f"❌ Video yozuvchi ochilmadi: {path} (kodek: {fourcc})")
+    
+    def write(self, frame):
+        self.writer.write(frame)
+    
+    def release(self):
+        self.writer.release()
+
+
+class _FFmpegBackend:
+    """ffmpeg jarayoniga xom BGR framelarni pipe orqali berish (imageio-ffmpeg)"""
+    
+    name = 'ffmpeg'
+    
+    def __init__(self, path, fps, frame_size, codec=None, crf=None, preset=None):
+        try:
+            import imageio_ffmpeg
+        except ImportError:
+            raise ImportError("❌ ffmpeg backend uchun imageio-ffmpeg kerak: "
+                              "pip install imageio-ffmpeg")
+        
+        codec = codec or config.VIDEO_CODEC
+        crf = config.VIDEO_CRF if crf is None else crf
+        preset = preset or config.VIDEO_PRESET
+        
+        # yuv420p juft o'lcham talab qiladi: toq o'lchamli frame o'ng/pastdan
+        # 1 pixelga to'ldiriladi (masshtablanmaydi - piksellar o'z joyida)
+        width, height = frame_size
+        self._pad = (height % 2, width % 2)
+        
+        # quality=None: sifat faqat CRF/preset orqali; macro_block_size=1 -
+        # imageio-ffmpeg frameni o'zi qayta o'lchamaydi
+        self.writer = imageio_ffmpeg.write_frames(
+            str(path), (width + self._pad[1], height + self._pad[0]), fps=fps, codec=codec,
+            pix_fmt_in='bgr24', quality=None, macro_block_size=1,
+            output_params=['-crf', str(crf), '-preset', preset],
+        )
+        self.writer.send(None)  # ffmpeg jarayonini ishga tushirish
+    
+    def write(self, frame):
+        if any(self._pad):
+            frame = cv2.copyMakeBorder(frame, 0, self._pad[0], 0, self._pad[1],
+                                       cv2.BORDER_REPLICATE)
+        self.writer.send(frame)
+    
+    def release(self):
+        self.writer.close()
+
+
+BACKENDS = {
+    'opencv': _OpenCVBackend,
+    'ffmpeg': _FFmpegBackend,
+}
+
+
+class AsyncVideoWriter:
+    """
+    Framelarni chegaralangan navbat orqali fon oqimida kodlash
+    
+    Navbat to'lsa write() kutadi (framelar tashlanmaydi - natija fayli
+    to'liq bo'lishi kerak). Kodlash xatosi keyingi write()/release() da
+    ko'tariladi.
+    
+    `step` berilsa, frame manbadagi raqami bo'yicha joylashtiriladi: chiqish
+    videosining har bir frame'i manbaning `step` ta frame'iga teng. Adaptive
+    qadamda o'tkazib yuborilgan joylar oxirgi frame bilan to'ldiriladi,
+    shuning uchun natija videosi manba bilan bir xil davomiylikda.
+    """
+    
+    def __init__(self, backend, fps, step=1, queue_size=None, metrics=None):
+        """
+        Args:
+            backend: Ochilgan backend (_OpenCVBackend yoki _FFmpegBackend)
+            fps: Chiqish videosi FPS i
+            step: Bitta chiqish frame'iga to'g'ri keladigan manba framelari
+            queue_size: Navbat hajmi (default: config.VIDEO_WRITER_QUEUE_SIZE)
+            metrics: StageMetrics ('encode' bosqichi fon oqimida o'lchanadi)
+        """
+        self.backend = backend
+        self.fps = fps
+        self.step = max(1, step)
+        self.metrics = metrics
+        
+        self._queue = queue.Queue(maxsize=queue_size or config.VIDEO_WRITER_QUEUE_SIZE)
+        self._error = None
+        self._last_slot = -1
+        self._released = False
+        
+        # Statistika
+        self.frames_written = 0
+        self.frames_duplicated = 0
+        self.frames_skipped = 0
+        self.max_queue_depth = 0
+        
+        self._thread = threading.Thread(target=self._run, name='video-writer', daemon=True)
+        self._thread.start()
+    
+    @property
+    def backend_name(self):
+        return self.backend.name
+    
+    def _run(self):
+        """Fon oqimi: navbatdagi framelarni kodlash"""
+        while True:
+            frame = self._queue.get()
+            if frame is _END:
+                return
+            
+            # Xatodan keyin navbat bo'shatiladi (write() bloklanib qolmasin)
+            if self._error is not None:
+                continue
+            
+            try:
+                start = time.perf_counter()
+                self.backend.write(frame)
+                if self.metrics is not None:
+                    self.metrics.observe('encode', time.perf_counter() - start)
+                self.frames_written += 1
+            except Exception as e:
+                self._error = e
+    
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"❌ Video yozishda xato: {self._error}") from self._error
+    
+    def write(self, frame, frame_index=None):
+        """
+        Frameni yozish navbatiga qo'shish
+        
+        Args:
+            frame: BGR frame
+            frame_index: Manbadagi frame raqami (1 dan). None bo'lsa - ketma-ket
+        """
+        self._raise_error()
+        
+        if frame_index is None:
+            repeats = 1
+            self._last_slot += 1
+        else:
+            slot = (frame_index - 1) // self.step
+            repeats = slot - self._last_slot
+            
+            # Qadam `step` dan kichik bo'lganda bir joyga ikkinchi frame to'g'ri keladi
+            if repeats <= 0:
+                self.frames_skipped += 1
+                return
+            
+            self._last_slot = slot
+            self.frames_duplicated += repeats - 1
+        
+        for _ in range(repeats):
+            self._queue.put(frame)
+        
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+    
+    def report(self):
+        """
+        Yozish statistikasi
+        
+        Returns:
+            dict: backend, fps, frames_written, frames_duplicated, frames_skipped, max_queue_depth
+        """
+        return {
+            'backend': self.backend_name,
+            'fps': round(self.fps, 3),
+            'frames_written': self.frames_written,
+            'frames_duplicated': self.frames_duplicated,
+            'frames_skipped': self.frames_skipped,
+            'max_queue_depth': self.max_queue_depth,
+        }
+    
+    def release(self):
+        """Navbatdagi barcha framelarni yozib, faylni yopish"""
+        if self._released:
+            return
+        self._released = True
+        
+        self._queue.put(_END)
+        self._thread.join()
+        self.backend.release()
+        self._raise_error()
+
+
+def open_video_writer(output_path, fps, frame_size, step=1, backend=None, metrics=None):
+    """
+    Natija videosi uchun fon oqimli yozuvchi ochish
+    
+    Args:
+        output_path: Chiqish fayli
+        fps: Manba FPS i
+        frame_size: (width, height)
+        step: Qayta ishlash qadami (SKIP_FRAMES + 1) - chiqish FPS i fps / step
+        backend: 'opencv' yoki 'ffmpeg' (default: config.VIDEO_WRITER_BACKEND)
+        metrics: StageMetrics (optional)
+    
+    Returns:
+        AsyncVideoWriter: Yozuvchi
+    """
+    backend = backend or config.VIDEO_WRITER_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"❌ Noma'lum video yozuvchi backend: {backend}")
+    
+    output_fps = fps / max(1, step)
+    return AsyncVideoWriter(BACKENDS[backend](output_path, output_fps, frame_size),
+                            output_fps, step=step, metrics=metrics)